@@ -55,6 +55,8 @@ class MockTopusBot(BotInterface):
             # Generate mockups for each template
             mockups = []
             for template_name in target_templates:
+                # Each render takes a while; keep the task leased between them
+                self.heartbeat(task)
                 if template_name in self.mockup_templates:
                     mockup = self._generate_mockup(
                         source_file_url,
@@ -88,6 +90,18 @@ class MockTopusBot(BotInterface):
                 }
             )
             
+        except requests.RequestException as e:
+            # Photopea/CDN hiccups are transient; the queue retries with backoff
+            self.logger.warning(f"Transient error processing mockup task: {e}")
+            return TaskResult(
+                task_id=task.task_id,
+                pipeline_id=task.pipeline_id,
+                bot_id=self.config.bot_id,
+                status='retry',
+                output_data={'input': task.input_data},
+                error_message=str(e),
+                confidence=0.0
+            )
         except Exception as e:
             self.logger.error(f"Error processing mockup task: {e}")
             return TaskResult(
@@ -0,0 +1,128 @@
+"""Measure Airtable batch write throughput (rows/sec) against a local stand-in server."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Optional
+
+CURRENT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = CURRENT_DIR.parent
+
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.append(str(REPO_ROOT / "src"))
+
+from config import settings  # noqa: E402
+from services.airtable_service import AirtableService  # noqa: E402
+
+
+class StandInAirtable(BaseHTTPRequestHandler):
+    """Answers batch create/update/upsert like Airtable, after a fixed latency."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.1
+    store: dict = {}
+    ids = itertools.count()
+    lock = threading.Lock()
+
+    def _reply(self, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read(self) -> dict:
+        return json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def do_POST(self):
+        body = self._read()
+        time.sleep(self.latency)
+        created = []
+        with self.lock:
+            for record in body["records"]:
+                record_id = f"rec{next(self.ids):09d}"
+                self.store[record_id] = dict(record["fields"])
+                created.append({"id": record_id, "createdTime": "2024-01-01T00:00:00.000Z", "fields": self.store[record_id]})
+        self._reply({"records": created})
+
+    def do_PATCH(self):
+        body = self._read()
+        time.sleep(self.latency)
+        merge_on = (body.get("performUpsert") or {}).get("fieldsToMergeOn")
+        written = []
+        with self.lock:
+            for record in body["records"]:
+                record_id = record.get("id")
+                if merge_on:
+                    key = [record["fields"].get(name) for name in merge_on]
+                    record_id = next(
+                        (rid for rid, fields in self.store.items() if [fields.get(name) for name in merge_on] == key),
+                        None,
+                    ) or f"rec{next(self.ids):09d}"
+                self.store.setdefault(record_id, {}).update(record["fields"])
+                written.append({"id": record_id, "createdTime": "2024-01-01T00:00:00.000Z", "fields": self.store[record_id]})
+        self._reply({"records": written})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs pipelined Airtable batch writes")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.1, help="Stand-in server latency per request (s)")
+    parser.add_argument("--rate", type=float, default=50, help="Airtable requests/s allowed by the rate limiter")
+    parser.add_argument("--concurrency", type=int, default=settings.airtable_batch_concurrency)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace, base_url: str) -> None:
+    settings.integration_rate_limits = f"airtable={args.rate}"
+    service = AirtableService("benchmark-key")
+    service.base_url = base_url
+
+    print(f"{'operation':<10} {'mode':<12} {'rows':>7} {'rows/s':>9} {'seconds':>9}")
+    for concurrency, mode in ((1, "sequential"), (args.concurrency, "pipelined")):
+        settings.airtable_batch_concurrency = concurrency
+        rows = [{"Name": f"{mode}-{i}", "Value": i} for i in range(args.rows)]
+
+        start = time.perf_counter()
+        created = await service.batch_create_records("appBench", "tblBench", rows)
+        create_elapsed = time.perf_counter() - start
+
+        updates = [{"id": record.id, "fields": {"Value": -1}} for record in created]
+        start = time.perf_counter()
+        await service.batch_update_records("appBench", "tblBench", updates)
+        update_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await service.batch_upsert_records("appBench", "tblBench", rows, merge_on=["Name"])
+        upsert_elapsed = time.perf_counter() - start
+
+        for operation, elapsed in (("create", create_elapsed), ("update", update_elapsed), ("upsert", upsert_elapsed)):
+            print(f"{operation:<10} {mode:<12} {args.rows:>7} {args.rows / elapsed:>9.0f} {elapsed:>9.2f}")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    args = parse_args(argv)
+    StandInAirtable.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInAirtable)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(run(args, f"http://127.0.0.1:{server.server_address[1]}/v0"))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Compare a new httpx client per request with the shared pooled clients."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Optional
+
+CURRENT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = CURRENT_DIR.parent
+
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.append(str(REPO_ROOT / "src"))
+
+import httpx  # noqa: E402
+
+from config import settings  # noqa: E402,F401  (config must load before utils)
+from utils.http_clients import create_client  # noqa: E402
+
+# Small Airtable-style list response
+PAYLOAD = json.dumps({"records": [{"id": f"rec{i:05d}", "fields": {"Name": f"Row {i}"}} for i in range(20)]}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON endpoint standing in for an integration API."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs pooled httpx clients")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tls", action="store_true", help="Serve over TLS with a throwaway self-signed cert")
+    return parser.parse_args(argv)
+
+
+def make_certificate(directory: Path) -> Path:
+    cert = directory / "cert.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            "-keyout", str(cert), "-out", str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert
+
+
+def start_server(cert: Optional[Path]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    if cert:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_per_request(url: str, total: int, concurrency: int, verify) -> float:
+    """The old pattern: ``async with httpx.AsyncClient()`` inside every call."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            async with httpx.AsyncClient(verify=verify) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+                response.json()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def run_pooled(url: str, total: int, concurrency: int, verify) -> float:
+    """One long-lived client configured like ``utils.http_clients.get_http_client``."""
+    semaphore = asyncio.Semaphore(concurrency)
+    client = create_client(verify=verify)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(url)
+            response.raise_for_status()
+            response.json()
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return time.perf_counter() - start
+    finally:
+        await client.aclose()
+
+
+async def run(args: argparse.Namespace, url: str, verify) -> None:
+    print(f"{'mode':<12} {'requests':>9} {'req/s':>10} {'ms/req':>9}")
+    for mode, runner in (("per-request", run_per_request), ("pooled", run_pooled)):
+        elapsed = await runner(url, args.requests, args.concurrency, verify)
+        print(f"{mode:<12} {args.requests:>9} {args.requests / elapsed:>10.0f} {elapsed / args.requests * 1000:>9.2f}")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        cert = make_certificate(Path(tmp)) if args.tls else None
+        server = start_server(cert)
+        scheme = "https" if cert else "http"
+        url = f"{scheme}://127.0.0.1:{server.server_address[1]}/v0/appBench/tblBench"
+        verify = ssl.create_default_context(cafile=str(cert)) if cert else True
+        try:
+            asyncio.run(run(args, url, verify))
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
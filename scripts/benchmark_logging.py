@@ -0,0 +1,99 @@
+"""Measure the per-call overhead of BrebotLogger in each sink mode."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+CURRENT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = CURRENT_DIR.parent
+
+# LOG_ASYNC / LOG_FORMAT combinations compared by default
+MODES = {
+    "sync-text": {"LOG_ASYNC": "false", "LOG_FORMAT": "text"},
+    "async-text": {"LOG_ASYNC": "true", "LOG_FORMAT": "text"},
+    "async-json": {"LOG_ASYNC": "true", "LOG_FORMAT": "json"},
+}
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark BrebotLogger.log_agent_action overhead")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--modes", nargs="*", default=list(MODES), choices=list(MODES))
+    parser.add_argument(
+        "--stdout-delay-ms",
+        type=float,
+        default=0.0,
+        help="Simulate a slow console/log collector: pause this long per 4KB of stdout read",
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def run_worker(calls: int) -> None:
+    """Runs inside a child process whose environment selects the sink mode."""
+    if str(REPO_ROOT / "src") not in sys.path:
+        sys.path.append(str(REPO_ROOT / "src"))
+
+    from config import settings  # noqa: E402,F401  (config must load before utils)
+    from utils.logger import brebot_logger  # noqa: E402
+
+    details = {"activity_id": "0" * 32, "platform": "airtable", "success": True, "data_size": 1024}
+
+    start = time.perf_counter()
+    for index in range(calls):
+        brebot_logger.log_agent_action("BenchmarkAgent", "airtable_read", details={**details, "index": index})
+    elapsed = time.perf_counter() - start
+
+    drain_start = time.perf_counter()
+    brebot_logger.shutdown()
+    drain = time.perf_counter() - drain_start
+
+    # Parsed by the parent process
+    sys.__stderr__.write(f"{elapsed} {drain}\n")
+
+
+def slow_reader(stream, delay: float) -> None:
+    while stream.read(4096):
+        time.sleep(delay)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.worker:
+        run_worker(args.calls)
+        return
+
+    print(f"{'mode':<12} {'us/call':>10} {'calls/s':>12} {'drain (s)':>10}")
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as log_dir:
+            env = {**os.environ, **MODES[mode], "LOG_FILE": str(Path(log_dir) / "brebot.log")}
+            process = subprocess.Popen(
+                [sys.executable, __file__, "--worker", mode, "--calls", str(args.calls)],
+                env=env,
+                stdout=subprocess.PIPE if args.stdout_delay_ms else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if args.stdout_delay_ms:
+                threading.Thread(
+                    target=slow_reader, args=(process.stdout, args.stdout_delay_ms / 1000), daemon=True
+                ).start()
+            stderr = process.stderr.read()
+            process.wait()
+        if process.returncode != 0:
+            raise SystemExit(f"{mode} run failed:\n{stderr}")
+        elapsed, drain = map(float, stderr.strip().splitlines()[-1].split())
+        print(f"{mode:<12} {elapsed / args.calls * 1e6:>10.1f} {args.calls / elapsed:>12.0f} {drain:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Compare legacy per-key task listing with the indexed, pipelined TaskService listing."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+CURRENT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = CURRENT_DIR.parent
+
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.append(str(REPO_ROOT / "src"))
+
+import redis  # noqa: E402
+import redis.asyncio as aioredis  # noqa: E402
+
+from config import settings  # noqa: E402
+from services.task_service import TaskService  # noqa: E402
+
+BENCH_PREFIX = "brebot-bench:"
+STATUSES = ["not_started", "in_progress", "blocked", "completed"]
+PROJECTS = [f"project-{i}" for i in range(20)]
+BOTS = [f"bot-{i}" for i in range(10)]
+
+
+class BenchTaskService(TaskService):
+    """TaskService writing under a throwaway key prefix."""
+
+    REDIS_TASK_PREFIX = f"{BENCH_PREFIX}task:"
+    REDIS_TASK_INDEX = f"{BENCH_PREFIX}task_index"
+    REDIS_INDEX_PREFIX = f"{BENCH_PREFIX}tasks:"
+    REDIS_SCHEMA_KEY = f"{BENCH_PREFIX}tasks:schema"
+
+    def __init__(self, client: aioredis.Redis):
+        self.redis = client
+        self.tasks_table = None
+        self.events_table = None
+        self.sync_queue = None
+        self._fallback_tasks = {}
+        self._schema_checked = True
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark TaskService listing on Redis")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--redis-url", default=settings.redis_url)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def make_tasks(count: int) -> list:
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        tasks.append({
+            "id": f"task_bench_{i:06d}",
+            "title": f"Benchmark task {i}",
+            "description": "x" * 200,
+            "project": rng.choice(PROJECTS),
+            "due_date": (created + timedelta(days=rng.randint(1, 60))).date().isoformat(),
+            "assigned_bot": rng.choice(BOTS),
+            "priority": "medium",
+            "status": rng.choice(STATUSES),
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+            "comments": [],
+            "result": None,
+        })
+    return tasks
+
+
+def seed_legacy(client: redis.Redis, tasks: list) -> None:
+    """The pre-index layout: one JSON string per task plus a SET of ids."""
+    pipe = client.pipeline(transaction=False)
+    for task in tasks:
+        pipe.set(f"{BENCH_PREFIX}legacy:{task['id']}", json.dumps(task))
+        pipe.sadd(f"{BENCH_PREFIX}legacy_index", task["id"])
+    pipe.execute()
+
+
+def legacy_list(client: redis.Redis, status: Optional[str] = None) -> list:
+    """SMEMBERS followed by one GET per task, filtering in Python."""
+    tasks = []
+    for task_id in client.smembers(f"{BENCH_PREFIX}legacy_index"):
+        raw = client.get(f"{BENCH_PREFIX}legacy:{task_id}")
+        if raw:
+            task = json.loads(raw)
+            if status is None or task["status"] == status:
+                tasks.append(task)
+    return tasks
+
+
+async def timed(repeat: int, func: Callable[[], Awaitable[Any]]) -> tuple:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+async def run(args: argparse.Namespace) -> None:
+    client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+    service = BenchTaskService(aioredis.Redis.from_url(args.redis_url, decode_responses=True))
+    tasks = make_tasks(args.tasks)
+    try:
+        seed_legacy(client, tasks)
+        for task in tasks:
+            await service._store_task(task)
+
+        async def legacy_all():
+            return legacy_list(client)
+
+        async def legacy_status():
+            return legacy_list(client, status="blocked")
+
+        cases = [
+            ("legacy: all tasks", legacy_all),
+            ("legacy: status=blocked", legacy_status),
+            ("indexed: all tasks", lambda: service.list()),
+            ("indexed: first page", lambda: service.list(limit=args.page_size)),
+            ("indexed: status=blocked", lambda: service.list({"status": "blocked"})),
+            ("indexed: status+bot page", lambda: service.list({"status": "blocked", "assigned_bot": "bot-3"}, limit=args.page_size)),
+            ("indexed: due in 7 days", lambda: service.list({"due_after": "2024-01-05", "due_before": "2024-01-12"}, limit=args.page_size)),
+        ]
+
+        print(f"{'query':<28} {'tasks':>7} {'ms':>9}")
+        for name, func in cases:
+            elapsed, result = await timed(args.repeat, func)
+            returned = len(result["tasks"]) if isinstance(result, dict) else len(result)
+            print(f"{name:<28} {returned:>7} {elapsed * 1000:>9.1f}")
+    finally:
+        keys = list(client.scan_iter(f"{BENCH_PREFIX}*", count=1000))
+        for start in range(0, len(keys), 1000):
+            client.delete(*keys[start:start + 1000])
+        await service.redis.aclose()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,27 @@ Standard interface that all Brebot agents implement
 
 import json
 import time
+import random
+import signal
+import asyncio
 import logging
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import requests
 import redis
 from pathlib import Path
 
+try:
+    # Brebot's tracer, importable when src/ is on the path (the web app, tools)
+    from utils import tracing
+except ImportError:
+    tracing = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +43,13 @@ class BotConfig:
     airtable_base_id: str
     health_check_interval: int = 30
     max_retries: int = 3
-    retry_delay: int = 5
+    retry_delay: int = 5  # base delay before the first retry; doubles per attempt
+    retry_max_delay: int = 300
+    poll_timeout: int = 5  # seconds a blocking dequeue waits before re-checking shutdown
+    lease_timeout: int = 300  # seconds a dequeued task stays leased without a heartbeat
+    reap_interval: int = 30  # seconds between sweeps for expired leases
+    concurrency: int = 1  # tasks processed at once (threads, or coroutines for async bots)
+    shutdown_timeout: int = 60  # seconds to let in-flight tasks finish on shutdown
 
 @dataclass
 class Task:
@@ -43,6 +61,8 @@ class Task:
     priority: str = "normal"
     created_at: datetime = None
     retry_count: int = 0
+    trace_id: Optional[str] = None  # request trace that enqueued the task
+    parent_span_id: Optional[str] = None
     
     def __post_init__(self):
         if self.created_at is None:
@@ -66,33 +86,141 @@ class TaskResult:
             self.metadata = {}
 
 class MessageQueue:
-    """Redis-based message queue for bot communication"""
+    """Redis-based message queue for bot communication
+    
+    Each bot type has its own sorted set (``bot_tasks:<bot_type>``) scored so
+    that higher priorities pop first and equal priorities pop in FIFO order.
+    Workers dequeue with a Lua script that pops the task (ZPOPMAX) and
+    leases it in the same atomic step, so a worker dying between the two
+    can't lose it. Every push onto a ready queue also pushes a token onto
+    ``bot_task_wake:<bot_type>``; idle workers block on that list (BLPOP)
+    instead of polling and run the script again once woken.
+    
+    Delivery is at-least-once: a dequeued task is leased (``bot_processing``
+    holds its deadline, ``bot_inflight`` its payload) until it is completed
+    or failed. Workers extend the lease with heartbeats; ``requeue_expired``
+    puts tasks whose lease lapsed (crashed or stuck worker) back on their
+    queue with ``retry_count`` incremented, or on the dead-letter list once
+    they exceed the retry limit.
+    
+    Tasks can also be scheduled for later: ``bot_delayed`` is a sorted set
+    scored by due time, and ``promote_due_tasks`` moves due entries onto
+    their ready queue. Failed tasks are retried through it with
+    exponential backoff.
+    """
+    
+    # Scores are priority * PRIORITY_BAND - enqueue time in ms, so priority
+    # dominates and older tasks win ties (ms timestamps stay below the band)
+    PRIORITY_BAND = 1e13
+    
+    # KEYS: ready queue, processing zset, inflight hash, wake list
+    # ARGV: lease deadline ('' for no lease), worker id, lease time
+    POP_AND_LEASE_SCRIPT = """
+    local popped = redis.call('ZPOPMAX', KEYS[1])
+    if #popped == 0 then
+        return false
+    end
+    local task_json = popped[1]
+    if ARGV[1] ~= '' then
+        local task_id = cjson.decode(task_json)['task_id']
+        local worker_id = nil
+        if ARGV[2] ~= '' then
+            worker_id = ARGV[2]
+        end
+        redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+        redis.call('HSET', KEYS[3], task_id, cjson.encode({
+            task = task_json, worker_id = worker_id, leased_at = ARGV[3]
+        }))
+    end
+    -- Keep at most one wake token per ready task
+    local remaining = redis.call('ZCARD', KEYS[1])
+    if remaining == 0 then
+        redis.call('DEL', KEYS[4])
+    else
+        redis.call('LTRIM', KEYS[4], 0, remaining - 1)
+    end
+    return task_json
+    """
     
     def __init__(self, redis_url: str):
         self.redis_client = redis.from_url(redis_url)
-        self.task_queue = "bot_tasks"
+        self.task_queue = "bot_tasks"  # legacy shared queue; now the per-type key prefix
+        self.task_types = "bot_task_types"  # set of bot types that have a queue
         self.completed_queue = "bot_completed"
         self.failed_queue = "bot_failed"
+        self.processing_key = "bot_processing"  # zset: task_id -> lease deadline
+        self.inflight_key = "bot_inflight"  # hash: task_id -> leased payload
+        self.lease_expirations_key = "bot_lease_expirations"  # hash: bot_type -> count
+        self.dead_letter_queue = "bot_dead_letter"
+        self.delayed_queue = "bot_delayed"  # zset: task payload -> due time
+        self.wake_prefix = "bot_task_wake"  # list per bot type: one token per ready push
+        self._pop_and_lease = self.redis_client.register_script(self.POP_AND_LEASE_SCRIPT)
+    
+    def queue_key(self, bot_type: str) -> str:
+        """Redis key of the ready queue for one bot type"""
+        return f"{self.task_queue}:{bot_type}"
+    
+    def wake_key(self, bot_type: str) -> str:
+        """Redis key of the list idle workers of one bot type block on"""
+        return f"{self.wake_prefix}:{bot_type}"
     
-    def add_task(self, task: Task) -> bool:
-        """Add a task to the queue"""
+    def _push_ready(self, pipe, task: Task, task_json: str, score: Optional[float] = None) -> None:
+        """Queue a ready task on ``pipe`` and wake one idle worker for it"""
+        pipe.zadd(
+            self.queue_key(task.bot_type),
+            {task_json: score if score is not None else self._queue_score(task.priority)}
+        )
+        pipe.rpush(self.wake_key(task.bot_type), 1)
+        pipe.sadd(self.task_types, task.bot_type)
+    
+    def _serialize_task(self, task: Task) -> str:
+        return json.dumps({
+            'task_id': task.task_id,
+            'pipeline_id': task.pipeline_id,
+            'bot_type': task.bot_type,
+            'input_data': task.input_data,
+            'priority': task.priority,
+            'created_at': task.created_at.isoformat(),
+            'retry_count': task.retry_count,
+            'trace_id': task.trace_id,
+            'parent_span_id': task.parent_span_id
+        })
+    
+    def _deserialize_task(self, task_json) -> Task:
+        task_data = json.loads(task_json)
+        return Task(
+            task_id=task_data['task_id'],
+            pipeline_id=task_data['pipeline_id'],
+            bot_type=task_data['bot_type'],
+            input_data=task_data['input_data'],
+            priority=task_data['priority'],
+            created_at=datetime.fromisoformat(task_data['created_at']),
+            retry_count=task_data['retry_count'],
+            trace_id=task_data.get('trace_id'),
+            parent_span_id=task_data.get('parent_span_id')
+        )
+    
+    def _queue_score(self, priority: str, enqueued_at: Optional[float] = None) -> float:
+        enqueued_ms = int((enqueued_at if enqueued_at is not None else time.time()) * 1000)
+        return self._get_priority_score(priority) * self.PRIORITY_BAND - enqueued_ms
+    
+    def _stamp_trace(self, task: Task) -> None:
+        """Link a task to the producer's active trace, unless it already carries one"""
+        if task.trace_id or tracing is None:
+            return
+        ids = tracing.current_ids()
+        if ids:
+            task.trace_id, task.parent_span_id = ids
+    
+    def add_task(self, task: Task, delay: Optional[float] = None) -> bool:
+        """Add a task to its bot type's queue, or schedule it ``delay`` seconds from now"""
+        self._stamp_trace(task)
+        if delay:
+            return self.schedule_task(task, time.time() + delay)
         try:
-            task_data = {
-                'task_id': task.task_id,
-                'pipeline_id': task.pipeline_id,
-                'bot_type': task.bot_type,
-                'input_data': task.input_data,
-                'priority': task.priority,
-                'created_at': task.created_at.isoformat(),
-                'retry_count': task.retry_count
-            }
-            
-            # Add to queue with priority
-            priority_score = self._get_priority_score(task.priority)
-            self.redis_client.zadd(
-                self.task_queue,
-                {json.dumps(task_data): priority_score}
-            )
+            pipe = self.redis_client.pipeline()
+            self._push_ready(pipe, task, self._serialize_task(task))
+            pipe.execute()
             
             logger.info(f"Added task {task.task_id} to queue")
             return True
@@ -100,37 +228,252 @@ class MessageQueue:
             logger.error(f"Failed to add task to queue: {e}")
             return False
     
-    def get_next_task(self, bot_type: str) -> Optional[Task]:
-        """Get the next task for a specific bot type"""
+    def schedule_task(self, task: Task, run_at: float) -> bool:
+        """Hold a task until the epoch time ``run_at``, then make it ready"""
+        self._stamp_trace(task)
+        try:
+            self.redis_client.zadd(self.delayed_queue, {self._serialize_task(task): run_at})
+            logger.info(f"Scheduled task {task.task_id} for {datetime.fromtimestamp(run_at).isoformat()}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to schedule task: {e}")
+            return False
+    
+    def promote_due_tasks(self, batch_size: int = 100) -> int:
+        """Move delayed tasks whose time has come onto their ready queues"""
+        promoted = 0
+        while True:
+            with self.redis_client.pipeline() as pipe:
+                try:
+                    pipe.watch(self.delayed_queue)
+                    due = pipe.zrangebyscore(self.delayed_queue, '-inf', time.time(), start=0, num=batch_size)
+                    if not due:
+                        return promoted
+                    pipe.multi()
+                    for task_json in due:
+                        task = self._deserialize_task(task_json)
+                        pipe.zrem(self.delayed_queue, task_json)
+                        self._push_ready(pipe, task, task_json)
+                    pipe.execute()
+                except redis.WatchError:
+                    # Another worker promoted (or someone scheduled) concurrently; let the next pass retry
+                    return promoted
+                except Exception as e:
+                    logger.error(f"Failed to promote delayed tasks: {e}")
+                    return promoted
+            promoted += len(due)
+            if len(due) < batch_size:
+                return promoted
+    
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest delayed task is due (None if nothing is scheduled)"""
+        try:
+            earliest = self.redis_client.zrange(self.delayed_queue, 0, 0, withscores=True)
+        except Exception as e:
+            logger.error(f"Failed to read delayed tasks: {e}")
+            return None
+        return max(earliest[0][1] - time.time(), 0.0) if earliest else None
+    
+    @staticmethod
+    def _retries_exhausted(task: Task, max_retries: int) -> bool:
+        """Whether a task that just failed (or lost its lease) has no retries left
+        
+        Shared by ``retry_task`` and the lease reaper so both dead-letter a
+        task after the same number of attempts: ``max_retries`` retries on top
+        of the first run.
+        """
+        return task.retry_count >= max_retries
+    
+    def retry_task(
+        self,
+        task: Task,
+        error_message: str,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float
+    ) -> Optional[float]:
+        """Schedule a failed task again after an exponential backoff
+        
+        Returns the delay, or None when ``max_retries`` is exhausted; the task
+        is then recorded as failed and parked in the dead-letter queue.
+        """
+        if self._retries_exhausted(task, max_retries):
+            self.fail_task(task.task_id, error_message, task=task)
+            return None
+        
+        # Equal jitter: half the backoff is fixed, half random, so retries of
+        # tasks that failed together (e.g. an API outage) spread out
+        backoff = min(max_delay, base_delay * (2 ** task.retry_count))
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        task.retry_count += 1
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.zadd(self.delayed_queue, {self._serialize_task(task): time.time() + delay})
+            self._release(pipe, task.task_id)
+            pipe.execute()
+            logger.info(f"Retrying task {task.task_id} in {delay:.1f}s (attempt {task.retry_count + 1})")
+            return delay
+        except Exception as e:
+            logger.error(f"Failed to schedule retry for {task.task_id}: {e}")
+            return None
+    
+    def get_next_task(
+        self,
+        bot_type: str,
+        timeout: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ) -> Optional[Task]:
+        """Pop the highest-priority task for a bot type
+        
+        With ``timeout`` the call blocks up to that many seconds (0 blocks
+        forever) waiting for a task; without it the call returns at once.
+        With ``lease_seconds`` the task is leased to ``worker_id`` in the same
+        atomic step as the pop and must be completed, failed or heartbeated
+        before the lease runs out.
+        """
         try:
-            # Get highest priority task for this bot type
-            tasks = self.redis_client.zrevrange(self.task_queue, 0, -1)
+            deadline = None if not timeout else time.time() + timeout
+            while True:
+                task_json = self._pop_and_lease(
+                    keys=[self.queue_key(bot_type), self.processing_key, self.inflight_key, self.wake_key(bot_type)],
+                    args=[
+                        '' if lease_seconds is None else repr(time.time() + lease_seconds),
+                        worker_id or '',
+                        datetime.now().isoformat()
+                    ]
+                )
+                if task_json is not None or timeout is None:
+                    break
+                
+                # Nothing ready: sleep until a producer pushes a wake token, then race for the task again
+                if deadline is None:
+                    wait = 0
+                else:
+                    wait = deadline - time.time()
+                    if wait <= 0:
+                        break
+                if not self.redis_client.blpop(self.wake_key(bot_type), timeout=wait):
+                    break
             
-            for task_json in tasks:
-                task_data = json.loads(task_json)
-                if task_data['bot_type'] == bot_type:
-                    # Remove from queue
-                    self.redis_client.zrem(self.task_queue, task_json)
-                    
-                    # Convert back to Task object
-                    task = Task(
-                        task_id=task_data['task_id'],
-                        pipeline_id=task_data['pipeline_id'],
-                        bot_type=task_data['bot_type'],
-                        input_data=task_data['input_data'],
-                        priority=task_data['priority'],
-                        created_at=datetime.fromisoformat(task_data['created_at']),
-                        retry_count=task_data['retry_count']
-                    )
-                    
-                    logger.info(f"Retrieved task {task.task_id} for {bot_type}")
-                    return task
+            if task_json is None:
+                return None
             
-            return None
+            task = self._deserialize_task(task_json)
+            logger.info(f"Retrieved task {task.task_id} for {bot_type}")
+            return task
         except Exception as e:
             logger.error(f"Failed to get next task: {e}")
             return None
     
+    def extend_lease(self, task_id: str, lease_seconds: float) -> bool:
+        """Push a leased task's deadline out; False if the lease was already lost"""
+        try:
+            return bool(self.redis_client.zadd(
+                self.processing_key, {task_id: time.time() + lease_seconds}, xx=True, ch=True
+            ))
+        except Exception as e:
+            logger.error(f"Failed to extend lease for {task_id}: {e}")
+            return False
+    
+    def _release(self, pipe, task_id: str) -> None:
+        pipe.zrem(self.processing_key, task_id)
+        pipe.hdel(self.inflight_key, task_id)
+    
+    def requeue_expired(self, max_retries: int) -> Dict[str, int]:
+        """Re-queue (or dead-letter) tasks whose lease deadline has passed"""
+        counts = {'requeued': 0, 'dead_lettered': 0}
+        try:
+            expired = self.redis_client.zrangebyscore(self.processing_key, '-inf', time.time())
+        except Exception as e:
+            logger.error(f"Failed to read expired leases: {e}")
+            return counts
+        
+        for task_id in expired:
+            outcome = self._reclaim(task_id, max_retries)
+            if outcome:
+                counts[outcome] += 1
+        
+        if counts['requeued'] or counts['dead_lettered']:
+            logger.warning(
+                f"Expired leases: {counts['requeued']} re-queued, {counts['dead_lettered']} dead-lettered"
+            )
+        return counts
+    
+    def _reclaim(self, task_id, max_retries: int) -> Optional[str]:
+        """Move one expired lease back to its queue; None if a worker acked or extended it first"""
+        with self.redis_client.pipeline() as pipe:
+            try:
+                pipe.watch(self.processing_key, self.inflight_key)
+                deadline = pipe.zscore(self.processing_key, task_id)
+                if deadline is None or deadline > time.time():
+                    return None
+                raw = pipe.hget(self.inflight_key, task_id)
+                
+                pipe.multi()
+                self._release(pipe, task_id)
+                outcome = None
+                if raw:
+                    entry = json.loads(raw)
+                    task = self._deserialize_task(entry['task'])
+                    pipe.hincrby(self.lease_expirations_key, task.bot_type, 1)
+                    if self._retries_exhausted(task, max_retries):
+                        pipe.lpush(self.dead_letter_queue, json.dumps({
+                            'task': json.loads(self._serialize_task(task)),
+                            'reason': 'lease expired',
+                            'worker_id': entry.get('worker_id'),
+                            'dead_lettered_at': datetime.now().isoformat()
+                        }))
+                        outcome = 'dead_lettered'
+                    else:
+                        task.retry_count += 1
+                        self._push_ready(pipe, task, self._serialize_task(task))
+                        outcome = 'requeued'
+                pipe.execute()
+                return outcome
+            except redis.WatchError:
+                return None
+    
+    def in_flight_counts(self) -> Dict[str, int]:
+        """Number of leased (in-progress) tasks per bot type"""
+        counts: Dict[str, int] = {}
+        for raw in self.redis_client.hvals(self.inflight_key):
+            bot_type = json.loads(json.loads(raw)['task'])['bot_type']
+            counts[bot_type] = counts.get(bot_type, 0) + 1
+        return counts
+    
+    def queue_depths(self) -> Dict[str, int]:
+        """Number of ready tasks per bot type"""
+        bot_types = sorted(
+            t.decode() if isinstance(t, bytes) else t
+            for t in self.redis_client.smembers(self.task_types)
+        )
+        pipe = self.redis_client.pipeline(transaction=False)
+        for bot_type in bot_types:
+            pipe.zcard(self.queue_key(bot_type))
+        return dict(zip(bot_types, pipe.execute()))
+    
+    def migrate_legacy_queue(self) -> int:
+        """Move tasks left in the old shared ``bot_tasks`` set onto per-type queues"""
+        moved = 0
+        try:
+            if self.redis_client.type(self.task_queue) not in (b'zset', 'zset'):
+                return 0
+            for task_json, score in self.redis_client.zrange(self.task_queue, 0, -1, withscores=True):
+                # Whoever removes the entry owns it, so concurrent workers don't duplicate it
+                if not self.redis_client.zrem(self.task_queue, task_json):
+                    continue
+                task = self._deserialize_task(task_json)
+                pipe = self.redis_client.pipeline()
+                self._push_ready(pipe, task, task_json, self._queue_score(task.priority, task.created_at.timestamp()))
+                pipe.execute()
+                moved += 1
+            if moved:
+                logger.info(f"Moved {moved} tasks from the shared queue to per-type queues")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy queue: {e}")
+        return moved
+    
     def complete_task(self, task_id: str, result: TaskResult) -> bool:
         """Mark a task as completed"""
         try:
@@ -147,15 +490,18 @@ class MessageQueue:
                 'completed_at': datetime.now().isoformat()
             }
             
-            self.redis_client.lpush(self.completed_queue, json.dumps(result_data))
+            pipe = self.redis_client.pipeline()
+            pipe.lpush(self.completed_queue, json.dumps(result_data))
+            self._release(pipe, task_id)
+            pipe.execute()
             logger.info(f"Marked task {task_id} as completed")
             return True
         except Exception as e:
             logger.error(f"Failed to complete task: {e}")
             return False
     
-    def fail_task(self, task_id: str, error_message: str) -> bool:
-        """Mark a task as failed"""
+    def fail_task(self, task_id: str, error_message: str, task: Optional[Task] = None) -> bool:
+        """Mark a task as failed; with ``task`` it is also kept in the dead-letter queue"""
         try:
             fail_data = {
                 'task_id': task_id,
@@ -163,7 +509,16 @@ class MessageQueue:
                 'failed_at': datetime.now().isoformat()
             }
             
-            self.redis_client.lpush(self.failed_queue, json.dumps(fail_data))
+            pipe = self.redis_client.pipeline()
+            pipe.lpush(self.failed_queue, json.dumps(fail_data))
+            if task is not None:
+                pipe.lpush(self.dead_letter_queue, json.dumps({
+                    'task': json.loads(self._serialize_task(task)),
+                    'reason': error_message,
+                    'dead_lettered_at': datetime.now().isoformat()
+                }))
+            self._release(pipe, task_id)
+            pipe.execute()
             logger.info(f"Marked task {task_id} as failed")
             return True
         except Exception as e:
@@ -282,7 +637,13 @@ class AirtableClient:
             return False
 
 class BotInterface(ABC):
-    """Abstract base class for all Brebot agents"""
+    """Abstract base class for all Brebot agents
+    
+    ``run`` starts ``config.concurrency`` workers that each dequeue and
+    process tasks. A plain ``process_task`` runs on worker threads, which
+    suits bots blocked on I/O (HTTP APIs, renders); an ``async def
+    process_task`` runs as that many coroutines on one event loop.
+    """
     
     def __init__(self, config: BotConfig):
         self.config = config
@@ -290,87 +651,297 @@ class BotInterface(ABC):
         self.airtable = AirtableClient(config.airtable_token, config.airtable_base_id)
         self.logger = logging.getLogger(f"bot.{config.bot_id}")
         self.running = False
+        self._last_reap = 0.0
+        self._reap_lock = threading.Lock()
+        self._workers: Dict[str, Dict[str, Any]] = {}
+        self._workers_lock = threading.Lock()
     
     @abstractmethod
     def process_task(self, task: Task) -> TaskResult:
-        """Process a task - must be implemented by each bot"""
+        """Process a task - must be implemented by each bot (may be ``async def``)"""
         pass
     
+    def heartbeat(self, task: Task) -> bool:
+        """Extend the lease on a task; call periodically from long-running process_task steps"""
+        if self.queue.extend_lease(task.task_id, self.config.lease_timeout):
+            return True
+        self.logger.warning(f"Lease on task {task.task_id} was lost; it may be redelivered")
+        return False
+    
+    def _reap_expired_leases(self) -> None:
+        with self._reap_lock:
+            now = time.time()
+            if now - self._last_reap < self.config.reap_interval:
+                return
+            self._last_reap = now
+        self.queue.requeue_expired(self.config.max_retries)
+    
+    def _update_worker(self, worker_id: str, **fields) -> None:
+        with self._workers_lock:
+            state = self._workers.setdefault(worker_id, {
+                'state': 'starting',
+                'task_id': None,
+                'task_started_at': None,
+                'processed': 0,
+                'failed': 0
+            })
+            state.update(fields)
+            state['last_seen'] = time.time()
+    
+    def _task_finished(self, worker_id: str, status: str) -> None:
+        with self._workers_lock:
+            state = self._workers[worker_id]
+            state['processed'] += 1
+            if status != 'completed':
+                state['failed'] += 1
+        self._update_worker(worker_id, state='idle', task_id=None, task_started_at=None)
+    
     def health_check(self) -> Dict[str, Any]:
-        """Health check for the bot"""
+        """Health check for the bot, including the state of each worker"""
+        now = time.time()
+        with self._workers_lock:
+            workers = {
+                worker_id: {
+                    **state,
+                    'busy_seconds': now - state['task_started_at'] if state['task_started_at'] else 0.0,
+                    'last_seen': datetime.fromtimestamp(state['last_seen']).isoformat()
+                }
+                for worker_id, state in self._workers.items()
+            }
+        # A worker that died, or has been busy past its lease, needs attention
+        unhealthy = [
+            worker_id for worker_id, state in workers.items()
+            if (self.running and state['state'] == 'stopped')
+            or state['busy_seconds'] > self.config.lease_timeout
+        ]
         return {
             'bot_id': self.config.bot_id,
             'bot_type': self.config.bot_type,
-            'status': 'healthy',
+            'status': 'degraded' if unhealthy else 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'uptime': time.time() - getattr(self, 'start_time', time.time())
+            'uptime': time.time() - getattr(self, 'start_time', time.time()),
+            'concurrency': self.config.concurrency,
+            'busy_workers': sum(1 for state in workers.values() if state['state'] == 'busy'),
+            'unhealthy_workers': unhealthy,
+            'workers': workers
         }
     
-    def run(self):
-        """Main bot execution loop"""
-        self.start_time = time.time()
-        self.running = True
-        self.logger.info(f"Starting bot {self.config.bot_id}")
+    def _next_poll_timeout(self) -> float:
+        """Block no longer than the next delayed task needs to wait (get_next_task treats 0 as forever)"""
+        timeout = float(self.config.poll_timeout)
+        due_in = self.queue.next_due_in()
+        if due_in is not None:
+            timeout = min(timeout, max(due_in, 0.05))
+        return timeout
+    
+    def _retry_or_fail(self, task: Task, error_message: str) -> str:
+        delay = self.queue.retry_task(
+            task,
+            error_message,
+            self.config.max_retries,
+            self.config.retry_delay,
+            self.config.retry_max_delay
+        )
+        return 'retry' if delay is not None else 'failed'
+    
+    def _record_result(self, task: Task, result: TaskResult, start_time: float) -> str:
+        """Record what process_task returned; returns the final status"""
+        result.processing_time = time.time() - start_time
+        if task.trace_id:
+            result.metadata.setdefault('trace_id', task.trace_id)
+        
+        if result.status == 'retry':
+            # Transient failure reported by the bot: back off and try again
+            result.status = self._retry_or_fail(task, result.error_message or 'retry requested')
+            self.airtable.log_bot_result(result)
+            return result.status
         
+        # Complete the task
+        self.queue.complete_task(task.task_id, result)
+        
+        # Log to Airtable
+        self.airtable.log_bot_result(result)
+        
+        # Update pipeline status if needed
+        if result.status == 'completed':
+            self.airtable.update_pipeline_status(
+                result.pipeline_id,
+                'in_progress',
+                self.config.bot_type,
+                result.output_data
+            )
+        
+        self.logger.info(f"Completed task {task.task_id} in {result.processing_time:.2f}s")
+        return result.status
+    
+    def _record_error(self, task: Task, error: Exception, start_time: float) -> str:
+        """Record a task whose process_task raised; returns the final status"""
+        self.logger.error(f"Error processing task {task.task_id}: {error}")
+        
+        # Create failure result
+        result = TaskResult(
+            task_id=task.task_id,
+            pipeline_id=task.pipeline_id,
+            bot_id=self.config.bot_id,
+            status=self._retry_or_fail(task, str(error)),
+            output_data={},
+            error_message=str(error),
+            processing_time=time.time() - start_time,
+            metadata={'trace_id': task.trace_id} if task.trace_id else None
+        )
+        
+        self.airtable.log_bot_result(result)
+        return result.status
+    
+    def _task_span(self, task: Task):
+        """Span around process_task, continuing the trace that enqueued the task"""
+        if tracing is None:
+            return contextlib.nullcontext()
+        return tracing.start_span(
+            f"bot.{self.config.bot_type}.process_task",
+            trace_id=task.trace_id,
+            parent_id=task.parent_span_id,
+            task_id=task.task_id,
+            bot_id=self.config.bot_id
+        )
+    
+    def _handle_task(self, task: Task) -> str:
+        """Process one leased task and record its outcome"""
+        self.logger.info(f"Processing task {task.task_id} (trace {task.trace_id or '-'})")
+        start_time = time.time()
+        try:
+            with self._task_span(task):
+                result = self.process_task(task)
+        except Exception as e:
+            return self._record_error(task, e, start_time)
+        return self._record_result(task, result, start_time)
+    
+    async def _handle_task_async(self, task: Task, executor: ThreadPoolExecutor) -> str:
+        """Async-bot variant of _handle_task; queue and Airtable calls stay off the loop"""
+        loop = asyncio.get_running_loop()
+        self.logger.info(f"Processing task {task.task_id} (trace {task.trace_id or '-'})")
+        start_time = time.time()
+        try:
+            with self._task_span(task):
+                result = await self.process_task(task)
+        except Exception as e:
+            return await loop.run_in_executor(executor, self._record_error, task, e, start_time)
+        return await loop.run_in_executor(executor, self._record_result, task, result, start_time)
+    
+    def _next_task(self, worker_id: str) -> Optional[Task]:
+        self._reap_expired_leases()
+        self.queue.promote_due_tasks()
+        
+        # Block until a task arrives (or the poll timeout lets us re-check self.running)
+        return self.queue.get_next_task(
+            self.config.bot_type,
+            timeout=self._next_poll_timeout(),
+            lease_seconds=self.config.lease_timeout,
+            worker_id=worker_id
+        )
+    
+    def _worker_loop(self, worker_id: str) -> None:
+        self._update_worker(worker_id, state='idle')
         while self.running:
             try:
-                # Get next task
-                task = self.queue.get_next_task(self.config.bot_type)
-                
+                task = self._next_task(worker_id)
                 if task:
-                    self.logger.info(f"Processing task {task.task_id}")
-                    start_time = time.time()
-                    
-                    try:
-                        # Process the task
-                        result = self.process_task(task)
-                        result.processing_time = time.time() - start_time
-                        
-                        # Complete the task
-                        self.queue.complete_task(task.task_id, result)
-                        
-                        # Log to Airtable
-                        self.airtable.log_bot_result(result)
-                        
-                        # Update pipeline status if needed
-                        if result.status == 'completed':
-                            self.airtable.update_pipeline_status(
-                                result.pipeline_id,
-                                'in_progress',
-                                self.config.bot_type,
-                                result.output_data
-                            )
-                        
-                        self.logger.info(f"Completed task {task.task_id} in {result.processing_time:.2f}s")
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error processing task {task.task_id}: {e}")
-                        
-                        # Create failure result
-                        result = TaskResult(
-                            task_id=task.task_id,
-                            pipeline_id=task.pipeline_id,
-                            bot_id=self.config.bot_id,
-                            status='failed',
-                            output_data={},
-                            error_message=str(e),
-                            processing_time=time.time() - start_time
-                        )
-                        
-                        self.queue.fail_task(task.task_id, str(e))
-                        self.airtable.log_bot_result(result)
-                
+                    self._update_worker(worker_id, state='busy', task_id=task.task_id, task_started_at=time.time())
+                    self._task_finished(worker_id, self._handle_task(task))
                 else:
-                    # No tasks available, wait a bit
-                    time.sleep(1)
-                    
-            except KeyboardInterrupt:
-                self.logger.info("Received shutdown signal")
-                self.running = False
-                break
+                    self._update_worker(worker_id, state='idle')
             except Exception as e:
-                self.logger.error(f"Unexpected error in bot loop: {e}")
+                self.logger.error(f"Unexpected error in worker {worker_id}: {e}")
+                self._update_worker(worker_id, state='idle', task_id=None, task_started_at=None)
                 time.sleep(5)  # Wait before retrying
+        self._update_worker(worker_id, state='stopped')
+    
+    async def _async_worker_loop(self, worker_id: str, executor: ThreadPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        self._update_worker(worker_id, state='idle')
+        while self.running:
+            try:
+                task = await loop.run_in_executor(executor, self._next_task, worker_id)
+                if task:
+                    self._update_worker(worker_id, state='busy', task_id=task.task_id, task_started_at=time.time())
+                    self._task_finished(worker_id, await self._handle_task_async(task, executor))
+                else:
+                    self._update_worker(worker_id, state='idle')
+            except Exception as e:
+                self.logger.error(f"Unexpected error in worker {worker_id}: {e}")
+                self._update_worker(worker_id, state='idle', task_id=None, task_started_at=None)
+                await asyncio.sleep(5)  # Wait before retrying
+        self._update_worker(worker_id, state='stopped')
+    
+    def _worker_ids(self) -> List[str]:
+        if self.config.concurrency <= 1:
+            return [self.config.bot_id]
+        return [f"{self.config.bot_id}-w{i}" for i in range(self.config.concurrency)]
+    
+    def _run_threads(self) -> None:
+        workers = [
+            threading.Thread(target=self._worker_loop, args=(worker_id,), name=worker_id, daemon=True)
+            for worker_id in self._worker_ids()
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            while self.running and any(worker.is_alive() for worker in workers):
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            self.logger.info("Received shutdown signal")
+            self.stop()
+        
+        # Drain: workers finish their current task, then see running == False
+        deadline = time.time() + self.config.shutdown_timeout
+        for worker in workers:
+            worker.join(max(deadline - time.time(), 0))
+        still_busy = [worker.name for worker in workers if worker.is_alive()]
+        if still_busy:
+            self.logger.warning(f"Shutdown timeout; leases of {still_busy} will expire and be re-queued")
+    
+    async def _run_async(self) -> None:
+        worker_ids = self._worker_ids()
+        # Blocking dequeues park one thread per worker; the rest serve result recording
+        with ThreadPoolExecutor(max_workers=len(worker_ids) * 2, thread_name_prefix=self.config.bot_id) as executor:
+            workers = [
+                asyncio.create_task(self._async_worker_loop(worker_id, executor))
+                for worker_id in worker_ids
+            ]
+            while self.running and not all(worker.done() for worker in workers):
+                await asyncio.sleep(0.5)
+            _, pending = await asyncio.wait(workers, timeout=self.config.shutdown_timeout)
+            for worker in pending:
+                worker.cancel()
+            if pending:
+                self.logger.warning(f"Shutdown timeout; {len(pending)} in-flight task(s) will be re-queued")
+    
+    def stop(self) -> None:
+        """Stop taking new tasks; run() returns once in-flight tasks drain"""
+        if self.running:
+            self.logger.info(f"Stopping bot {self.config.bot_id}; draining in-flight tasks")
+        self.running = False
+    
+    def run(self):
+        """Main bot execution loop"""
+        self.start_time = time.time()
+        self.running = True
+        self.logger.info(f"Starting bot {self.config.bot_id} with {self.config.concurrency} worker(s)")
+        self.queue.migrate_legacy_queue()
+        
+        if threading.current_thread() is threading.main_thread():
+            # Containers stop with SIGTERM; treat it like Ctrl-C and drain
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        
+        try:
+            if asyncio.iscoroutinefunction(self.process_task):
+                asyncio.run(self._run_async())
+            else:
+                self._run_threads()
+        except KeyboardInterrupt:
+            self.logger.info("Received shutdown signal")
+            self.running = False
         
         self.logger.info(f"Bot {self.config.bot_id} stopped")
 
@@ -383,5 +954,6 @@ def create_bot_config(bot_id: str, bot_type: str) -> BotConfig:
         bot_type=bot_type,
         queue_url=os.getenv('REDIS_URL', 'redis://localhost:6379'),
         airtable_token=os.getenv('AIRTABLE_TOKEN'),
-        airtable_base_id=os.getenv('AIRTABLE_BASE_ID')
+        airtable_base_id=os.getenv('AIRTABLE_BASE_ID'),
+        concurrency=int(os.getenv('BOT_CONCURRENCY', '1'))
     )
@@ -21,6 +21,8 @@ from .system_prompts import (
 from .storage import (
     get_chroma_client,
     get_redis_client,
+    get_async_redis_client,
+    close_async_redis_client,
     get_airtable_api,
     get_airtable_table,
     airtable_available,
@@ -37,6 +39,8 @@ __all__ = [
     "settings",
     "get_chroma_client",
     "get_redis_client",
+    "get_async_redis_client",
+    "close_async_redis_client",
     "get_airtable_api",
     "get_airtable_table",
     "airtable_available",
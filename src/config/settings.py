@@ -42,6 +42,45 @@ class Settings(BaseSettings):
     log_file: str = Field(default="logs/brebot.log", env="LOG_FILE")
     log_max_size: str = Field(default="10MB", env="LOG_MAX_SIZE")
     log_retention: int = Field(default=7, env="LOG_RETENTION")
+    log_format: str = Field(default="text", env="LOG_FORMAT")  # text or json (compact JSON lines)
+    log_async: bool = Field(default=True, env="LOG_ASYNC")
+    log_console_level: Optional[str] = Field(default=None, env="LOG_CONSOLE_LEVEL")
+    log_file_level: Optional[str] = Field(default=None, env="LOG_FILE_LEVEL")
+    log_diagnose: bool = Field(default=False, env="LOG_DIAGNOSE")
+    
+    # Activity Log Storage
+    activity_log_partition: str = Field(default="month", env="ACTIVITY_LOG_PARTITION")
+    activity_log_retention_days: Optional[int] = Field(default=90, env="ACTIVITY_LOG_RETENTION_DAYS")
+    activity_log_archive: bool = Field(default=True, env="ACTIVITY_LOG_ARCHIVE")
+    activity_log_min_level: str = Field(default="debug", env="ACTIVITY_LOG_MIN_LEVEL")
+    activity_log_sample_rates: str = Field(default="", env="ACTIVITY_LOG_SAMPLE_RATES")
+    
+    # Request Tracing (in-process, kept in a ring buffer served at /api/debug/traces)
+    tracing_enabled: bool = Field(default=True, env="TRACING_ENABLED")
+    trace_buffer_size: int = Field(default=500, env="TRACE_BUFFER_SIZE")
+    
+    # Outbound HTTP (one pooled client per integration platform)
+    http_pool_max_connections: int = Field(default=100, env="HTTP_POOL_MAX_CONNECTIONS")
+    http_pool_max_keepalive: int = Field(default=20, env="HTTP_POOL_MAX_KEEPALIVE")
+    http_keepalive_expiry: float = Field(default=30.0, env="HTTP_KEEPALIVE_EXPIRY")
+    http_client_timeout: float = Field(default=30.0, env="HTTP_CLIENT_TIMEOUT")
+    http_client_http2: bool = Field(default=True, env="HTTP_CLIENT_HTTP2")
+    integration_rate_limits: str = Field(default="airtable=5,etsy=10,printify=10", env="INTEGRATION_RATE_LIMITS")  # requests/s
+    integration_max_retries: int = Field(default=4, env="INTEGRATION_MAX_RETRIES")
+    integration_backoff_base: float = Field(default=0.5, env="INTEGRATION_BACKOFF_BASE")
+    integration_backoff_max: float = Field(default=30.0, env="INTEGRATION_BACKOFF_MAX")
+    circuit_failure_threshold: int = Field(default=5, env="CIRCUIT_FAILURE_THRESHOLD")
+    circuit_cooldown_seconds: float = Field(default=30.0, env="CIRCUIT_COOLDOWN_SECONDS")
+    circuit_half_open_max_calls: int = Field(default=1, env="CIRCUIT_HALF_OPEN_MAX_CALLS")
+    integration_health_ttl_seconds: float = Field(default=60.0, env="INTEGRATION_HEALTH_TTL_SECONDS")
+    integration_health_refresh_seconds: float = Field(default=30.0, env="INTEGRATION_HEALTH_REFRESH_SECONDS")  # 0 disables
+    integration_health_timeout_seconds: float = Field(default=5.0, env="INTEGRATION_HEALTH_TIMEOUT_SECONDS")  # per platform
+    integration_health_deadline_seconds: float = Field(default=8.0, env="INTEGRATION_HEALTH_DEADLINE_SECONDS")
+    
+    # Debug Endpoints (traces and the profiler are disabled unless an admin token is set)
+    debug_admin_token: Optional[str] = Field(default=None, env="DEBUG_ADMIN_TOKEN")
+    profiler_default_hz: int = Field(default=100, env="PROFILER_DEFAULT_HZ")
+    profiler_max_seconds: int = Field(default=60, env="PROFILER_MAX_SECONDS")
     
     # Docker Configuration
     docker_compose_file: str = Field(default="docker/docker-compose.yml", env="DOCKER_COMPOSE_FILE")
@@ -57,11 +96,25 @@ class Settings(BaseSettings):
     # Storage & Integrations
     chroma_url: str = Field(default="http://localhost:8001", env="CHROMA_URL")
     redis_url: Optional[str] = Field(default="redis://localhost:6379/0", env="REDIS_URL")
+    redis_max_connections: int = Field(default=50, env="REDIS_MAX_CONNECTIONS")  # async pool size
+    redis_pool_timeout: float = Field(default=5.0, env="REDIS_POOL_TIMEOUT")  # wait for a free pooled connection
+    redis_socket_timeout: float = Field(default=5.0, env="REDIS_SOCKET_TIMEOUT")
+    redis_health_check_interval: int = Field(default=30, env="REDIS_HEALTH_CHECK_INTERVAL")
     airtable_api_key: Optional[str] = Field(default=None, env="AIRTABLE_API_KEY")
     airtable_base_id: Optional[str] = Field(default=None, env="AIRTABLE_BASE_ID")
     airtable_tasks_table: str = Field(default="Tasks", env="AIRTABLE_TASKS_TABLE")
     airtable_system_events_table: str = Field(default="SystemEvents", env="AIRTABLE_SYSTEM_EVENTS_TABLE")
     airtable_ingestion_runs_table: str = Field(default="IngestionRuns", env="AIRTABLE_INGESTION_RUNS_TABLE")
+    airtable_mirror_enabled: bool = Field(default=False, env="AIRTABLE_MIRROR_ENABLED")
+    airtable_mirror_dir: str = Field(default="./data/airtable_mirror", env="AIRTABLE_MIRROR_DIR")
+    airtable_mirror_full_sync_hours: float = Field(default=24.0, env="AIRTABLE_MIRROR_FULL_SYNC_HOURS")
+    airtable_default_freshness: str = Field(default="live", env="AIRTABLE_DEFAULT_FRESHNESS")  # live | mirror | max age in seconds
+    airtable_batch_concurrency: int = Field(default=5, env="AIRTABLE_BATCH_CONCURRENCY")  # batch requests in flight
+    airtable_batch_retries: int = Field(default=2, env="AIRTABLE_BATCH_RETRIES")  # resends of failed sub-batches
+    airtable_schema_cache_path: str = Field(default="./data/airtable_schema.json", env="AIRTABLE_SCHEMA_CACHE_PATH")
+    airtable_schema_cache_ttl: float = Field(default=3600.0, env="AIRTABLE_SCHEMA_CACHE_TTL")
+    task_sync_queue_path: str = Field(default="./data/task_sync_queue.db", env="TASK_SYNC_QUEUE_PATH")
+    task_sync_flush_interval: float = Field(default=2.0, env="TASK_SYNC_FLUSH_INTERVAL")  # seconds between Airtable flushes
 
     # Security
     secret_key: Optional[str] = Field(default=None, env="SECRET_KEY")
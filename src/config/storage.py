@@ -18,8 +18,10 @@ from utils import brebot_logger
 
 try:
     import redis  # type: ignore
+    import redis.asyncio as aioredis  # type: ignore
 except ImportError:  # pragma: no cover - handled in requirements
     redis = None  # type: ignore
+    aioredis = None  # type: ignore
 
 try:
     from pyairtable import Api
@@ -31,6 +33,8 @@ except ImportError:  # pragma: no cover - handled in requirements
 __all__ = [
     "get_chroma_client",
     "get_redis_client",
+    "get_async_redis_client",
+    "close_async_redis_client",
     "get_airtable_api",
     "get_airtable_table",
     "airtable_available",
@@ -39,6 +43,7 @@ __all__ = [
 
 _chroma_client: Optional[chromadb.HttpClient] = None
 _redis_client: Optional["redis.Redis"] = None
+_async_redis_client: Optional["aioredis.Redis"] = None
 _airtable_api: Optional[Api] = None
 _airtable_tables: Dict[str, Table] = {}
 
@@ -117,6 +122,62 @@ def get_redis_client() -> Optional["redis.Redis"]:
     return _redis_client
 
 
+def get_async_redis_client() -> Optional["aioredis.Redis"]:
+    """Return a shared asyncio Redis client for code running on the event loop.
+
+    Connections come from a bounded, blocking pool: callers wait up to
+    ``redis_pool_timeout`` for a free connection instead of failing when a
+    burst exceeds ``redis_max_connections``. Reachability is checked once
+    through the sync client's ping, since the async client cannot be pinged
+    outside a running loop. Bot workers keep using ``get_redis_client``.
+    """
+    if aioredis is None or not settings.redis_url:
+        return None
+
+    global _async_redis_client
+    if _async_redis_client is not None:
+        return _async_redis_client
+
+    if get_redis_client() is None:
+        return None
+
+    try:
+        pool = aioredis.BlockingConnectionPool.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            socket_keepalive=True,
+            health_check_interval=settings.redis_health_check_interval,
+            retry_on_timeout=True,
+        )
+        _async_redis_client = aioredis.Redis(connection_pool=pool)
+        brebot_logger.log_crew_activity(
+            crew_name="Storage",
+            activity="redis_async_pool_created",
+            details={"url": settings.redis_url, "max_connections": settings.redis_max_connections},
+        )
+    except Exception as exc:  # pragma: no cover - invalid configuration
+        brebot_logger.log_error(exc, "storage.get_async_redis_client")
+        _async_redis_client = None
+
+    return _async_redis_client
+
+
+async def close_async_redis_client() -> None:
+    """Close the async client and its pool (called on app shutdown)."""
+    global _async_redis_client
+    client, _async_redis_client = _async_redis_client, None
+    if client is None:
+        return
+    try:
+        await client.aclose()
+    except Exception as exc:  # pragma: no cover - connection failures
+        brebot_logger.log_error(exc, "storage.close_async_redis_client")
+
+
 def airtable_available() -> bool:
     """Return True if Airtable credentials are present and client available."""
     return bool(Api and settings.airtable_api_key and settings.airtable_base_id)
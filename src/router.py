@@ -6,10 +6,16 @@ from src.models.actions import Action
 from src.services import taskService, noteService, memoryService, inboxService
 from src.services import meetingService, botService, creativeService, systemService
 from src.services import businessService, fileService, financeService, interactionService
+from src.utils import metrics
 
 
 async def route_action(action: Action):
     """Route Brebot actions to the correct service layer."""
+    with metrics.observe_seconds(metrics.ACTION_DISPATCH_SECONDS, action_type=action.root.type):
+        return await _dispatch_action(action)
+
+
+async def _dispatch_action(action: Action):
 
     # ----------------- Tasks -----------------
     if action.root.type == "task.create":
@@ -6,8 +6,15 @@ Tracks all interactions across platforms with detailed audit trails
 import asyncio
 import json
 import logging
+import math
+import random
+import shutil
+import threading
+import time
+import uuid
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Union
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, asdict
 from enum import Enum
 import sqlite3
@@ -15,7 +22,9 @@ import aiofiles
 import hashlib
 from pathlib import Path
 
+from config.settings import settings
 from utils.logger import brebot_logger
+from utils import tracing
 
 
 class ActivityType(Enum):
@@ -49,6 +58,7 @@ class Platform(Enum):
     BROWSER = "browser"
     EMAIL = "email"
     N8N = "n8n"
+    PRINTIFY = "printify"
     SYSTEM = "system"
 
 
@@ -69,29 +79,155 @@ class ActivityRecord:
     error_message: Optional[str] = None
     session_id: Optional[str] = None
     user_context: Optional[str] = None
+    operation: Optional[str] = None
+    duration_ms: Optional[float] = None
+
+
+@dataclass
+class ActivitySearchHit:
+    """Ranked full-text search result."""
+    record: ActivityRecord
+    score: float  # bm25 relevance, only comparable within one partition
+    snippet: str
+
+
+@dataclass
+class ActivityPartition:
+    """A self-contained activity database covering one time range."""
+    key: str
+    path: Path
+    start: Optional[datetime] = None  # None = unbounded (legacy database)
+    end: Optional[datetime] = None
+    fts_enabled: bool = False  # False when this file couldn't build its FTS5 index
+    
+    def overlaps(self, start_time: Optional[datetime], end_time: Optional[datetime]) -> bool:
+        """Return True if this partition can hold rows inside [start_time, end_time]."""
+        if start_time and self.end and self.end < start_time:
+            return False
+        if end_time and self.start and self.start > end_time:
+            return False
+        return True
+
+
+# Activities table; seq is an explicit rowid alias so the FTS index survives VACUUM
+ACTIVITIES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS activities (
+        seq INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        timestamp TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        activity_type TEXT NOT NULL,
+        agent_name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        details TEXT NOT NULL,
+        resource_path TEXT,
+        resource_id TEXT,
+        data_size INTEGER,
+        success BOOLEAN NOT NULL,
+        error_message TEXT,
+        session_id TEXT,
+        user_context TEXT,
+        operation TEXT,
+        duration_ms REAL
+    )
+"""
+
+# Columns mirrored into the full-text index; order matters for snippet()
+FTS_COLUMNS = ("description", "error_message", "details", "resource_path", "agent_name")
+
+# strftime patterns for partition keys, also used as partition file names
+PARTITION_FORMATS = {"month": "%Y-%m", "day": "%Y-%m-%d"}
+
+# Innermost open ActivitySpan, so shared request paths can attribute bytes to it
+_current_activity_span: ContextVar[Optional["ActivitySpan"]] = ContextVar("brebot_activity_span", default=None)
+
+# SQLite side files that must travel with a database when it is moved or dropped
+SQLITE_SIDE_SUFFIXES = ("", "-journal", "-wal", "-shm")
+
+# Severity of an activity, compared against the logger's minimum level
+ACTIVITY_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# High-volume lookups default to debug; everything else successful is info
+DEBUG_ACTIVITY_TYPES = {
+    ActivityType.READ.value,
+    ActivityType.BROWSE.value,
+    ActivityType.FILE_ACCESS.value,
+    ActivityType.EMAIL_READ.value,
+    ActivityType.API_CALL.value
+}
+
+# Suppressed-event counters are written to the rollup table after this many
+# events or seconds, and always before a summary is computed
+SUPPRESSED_FLUSH_EVENTS = 500
+SUPPRESSED_FLUSH_SECONDS = 30.0
 
 
 class ActivityLogger:
     """Comprehensive activity logging service."""
     
-    def __init__(self, db_path: str = "data/activity_logs.db", log_dir: str = "data/activity_logs"):
-        """Initialize activity logger."""
+    def __init__(
+        self,
+        db_path: str = "data/activity_logs.db",
+        log_dir: str = "data/activity_logs",
+        partition_by: str = "month",
+        retention_days: Optional[int] = None,
+        archive_expired: bool = True,
+        min_level: str = "debug",
+        sample_rates: Union[Dict[str, float], str, None] = None
+    ):
+        """
+        Initialize activity logger.
+        
+        Args:
+            db_path: Legacy single-file database; partitions live next to it
+            log_dir: Directory for per-activity JSON files and exports
+            partition_by: Partition granularity, "month" or "day"
+            retention_days: Age after which whole partitions expire (None keeps forever)
+            archive_expired: Move expired partitions to the archive instead of deleting them
+            min_level: Successful activities below this level are counted, not stored
+            sample_rates: Fraction of successful activities stored, keyed by
+                "platform/activity_type", "platform", "*/activity_type" or "*"
+        """
+        if partition_by not in PARTITION_FORMATS:
+            raise ValueError(f"partition_by must be one of {list(PARTITION_FORMATS)}")
+        
         self.db_path = Path(db_path)
         self.log_dir = Path(log_dir)
+        self.partition_dir = self.db_path.with_name(f"{self.db_path.stem}_partitions")
+        self.archive_dir = self.partition_dir / "archive"
+        self.partition_by = partition_by
+        self.retention_days = retention_days
+        self.archive_expired = archive_expired
         self.session_id = self._generate_session_id()
+        self._partitions: Dict[str, ActivityPartition] = {}
+        self._partition_lock = threading.Lock()
+        self.min_level = "debug"
+        self.sample_rates: Dict[str, float] = {}
+        self._suppressed: Dict[tuple, List[float]] = {}
+        self._suppressed_pending = 0
+        self._suppressed_flushed_at = time.monotonic()
+        self._suppressed_lock = threading.Lock()
+        self.configure_sampling(min_level=min_level, sample_rates=sample_rates)
         
         # Ensure directories exist
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize database
-        self._init_database()
+        # Discover existing partitions and drop anything already past retention
+        self._load_partitions()
+        self.apply_retention()
         
         brebot_logger.log_agent_action(
             agent_name="ActivityLogger",
             action="initialized",
             details={
                 "db_path": str(self.db_path),
+                "partition_dir": str(self.partition_dir),
+                "partition_by": self.partition_by,
+                "partitions": len(self._partitions),
+                "retention_days": self.retention_days,
+                "min_level": self.min_level,
+                "sample_rates": self.sample_rates,
                 "log_dir": str(self.log_dir),
                 "session_id": self.session_id
             }
@@ -102,35 +238,438 @@ class ActivityLogger:
         timestamp = datetime.now(timezone.utc).isoformat()
         return hashlib.md5(f"brebot_session_{timestamp}".encode()).hexdigest()[:12]
     
-    def _init_database(self):
-        """Initialize SQLite database for activity logs."""
-        with sqlite3.connect(self.db_path) as conn:
+    def _init_database(self, db_path: Path) -> bool:
+        """Initialize an SQLite activity database (one partition); returns whether it has FTS."""
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(ACTIVITIES_TABLE_SQL)
+            
+            # Span columns were added later; upgrade databases created before them
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(activities)")}
+            for column, column_type in (("operation", "TEXT"), ("duration_ms", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE activities ADD COLUMN {column} {column_type}")
+            if "seq" not in columns:
+                self._add_rowid_alias(conn)
+            
+            # Create indexes for common queries
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON activities(timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_platform ON activities(platform)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_agent ON activities(agent_name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_session ON activities(session_id)")
+            
+            # Per-minute counts of activities suppressed by level or sampling
             conn.execute("""
-                CREATE TABLE IF NOT EXISTS activities (
-                    id TEXT PRIMARY KEY,
-                    timestamp TEXT NOT NULL,
+                CREATE TABLE IF NOT EXISTS activity_rollups (
+                    bucket TEXT NOT NULL,
                     platform TEXT NOT NULL,
                     activity_type TEXT NOT NULL,
                     agent_name TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    details TEXT NOT NULL,
-                    resource_path TEXT,
-                    resource_id TEXT,
-                    data_size INTEGER,
-                    success BOOLEAN NOT NULL,
-                    error_message TEXT,
-                    session_id TEXT,
-                    user_context TEXT
+                    operation TEXT NOT NULL DEFAULT '',
+                    suppressed INTEGER NOT NULL DEFAULT 0,
+                    data_size INTEGER NOT NULL DEFAULT 0,
+                    duration_ms REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (bucket, platform, activity_type, agent_name, operation)
                 )
             """)
             
-            # Create indexes for common queries
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON activities(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_platform ON activities(platform)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_agent ON activities(agent_name)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_session ON activities(session_id)")
+            fts_enabled = self._init_fts(conn)
             
             conn.commit()
+        return fts_enabled
+    
+    # ------------------------------------------------------------------
+    # Partitions
+    # ------------------------------------------------------------------
+    def _partition_range(self, key: str) -> tuple:
+        """Return the [start, end) datetimes covered by a partition key."""
+        start = datetime.strptime(key, PARTITION_FORMATS[self.partition_by]).replace(tzinfo=timezone.utc)
+        if self.partition_by == "day":
+            return start, start + timedelta(days=1)
+        if start.month == 12:
+            return start, start.replace(year=start.year + 1, month=1)
+        return start, start.replace(month=start.month + 1)
+    
+    def _load_partitions(self):
+        """Register partition files on disk plus the legacy single-file database."""
+        for path in sorted(self.partition_dir.glob("*.db")):
+            try:
+                start, end = self._partition_range(path.stem)
+            except ValueError:
+                continue  # not a partition of the configured granularity
+            fts_enabled = self._init_database(path)
+            self._partitions[path.stem] = ActivityPartition(path.stem, path, start, end, fts_enabled)
+        
+        if self.db_path.exists():
+            fts_enabled = self._init_database(self.db_path)
+            with sqlite3.connect(self.db_path) as conn:
+                first, last = conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM activities").fetchone()
+            if first:
+                self._partitions["legacy"] = ActivityPartition(
+                    "legacy",
+                    self.db_path,
+                    self._parse_timestamp(first),
+                    self._parse_timestamp(last),
+                    fts_enabled
+                )
+    
+    def _is_expired(self, key: str) -> bool:
+        """Whether retention would expire the partition ``key`` as soon as it existed."""
+        if not self.retention_days:
+            return False
+        now = datetime.now(timezone.utc)
+        if key == now.strftime(PARTITION_FORMATS[self.partition_by]):
+            return False
+        return self._partition_range(key)[1] <= now - timedelta(days=self.retention_days)
+    
+    def _partition_for(self, timestamp: datetime) -> Optional[ActivityPartition]:
+        """
+        Return the partition a timestamp is written to, creating it on first use.
+        
+        Returns None for timestamps already past the retention window, so
+        late or back-dated writes never recreate an expired partition.
+        """
+        key = timestamp.astimezone(timezone.utc).strftime(PARTITION_FORMATS[self.partition_by])
+        partition = self._partitions.get(key)
+        if partition:
+            return partition
+        if self._is_expired(key):
+            return None
+        
+        with self._partition_lock:
+            partition = self._partitions.get(key)
+            if partition is None:
+                path = self.partition_dir / f"{key}.db"
+                fts_enabled = self._init_database(path)
+                start, end = self._partition_range(key)
+                partition = ActivityPartition(key, path, start, end, fts_enabled)
+                self._partitions[key] = partition
+                created = True
+            else:
+                created = False
+        
+        if created:
+            # Rolling into a new partition is the natural moment to expire old ones
+            self.apply_retention()
+        return partition
+    
+    def _partitions_for_range(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> List[ActivityPartition]:
+        """Partitions overlapping the requested range, newest first (legacy last)."""
+        partitions = [
+            partition for partition in list(self._partitions.values())
+            if partition.key != "legacy" and partition.overlaps(start_time, end_time)
+        ]
+        partitions.sort(key=lambda partition: partition.start, reverse=True)
+        
+        legacy = self._partitions.get("legacy")
+        if legacy and legacy.overlaps(start_time, end_time):
+            partitions.append(legacy)
+        return partitions
+    
+    def list_partitions(self) -> List[Dict[str, Any]]:
+        """Describe the live partitions (for diagnostics and the dashboard)."""
+        return [
+            {
+                "key": partition.key,
+                "path": str(partition.path),
+                "start": partition.start.isoformat() if partition.start else None,
+                "end": partition.end.isoformat() if partition.end else None,
+                "size_bytes": partition.path.stat().st_size if partition.path.exists() else 0
+            }
+            for partition in self._partitions_for_range()
+        ]
+    
+    def apply_retention(self) -> Dict[str, List[str]]:
+        """
+        Expire whole partitions (and per-activity log folders) past the retention window.
+        
+        Returns:
+            Dict with the keys of archived and dropped partitions
+        """
+        expired: Dict[str, List[str]] = {"archived": [], "dropped": []}
+        if not self.retention_days:
+            return expired
+        
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        current_key = datetime.now(timezone.utc).strftime(PARTITION_FORMATS[self.partition_by])
+        
+        with self._partition_lock:
+            for key, partition in list(self._partitions.items()):
+                if key == current_key or partition.end is None or partition.end > cutoff:
+                    continue
+                
+                self._partitions.pop(key)
+                for suffix in SQLITE_SIDE_SUFFIXES:
+                    source = Path(f"{partition.path}{suffix}")
+                    if not source.exists():
+                        continue
+                    if self.archive_expired:
+                        self.archive_dir.mkdir(parents=True, exist_ok=True)
+                        shutil.move(str(source), str(self.archive_dir / f"{key}.db{suffix}"))
+                    else:
+                        source.unlink()
+                expired["archived" if self.archive_expired else "dropped"].append(key)
+        
+        self._expire_log_files(cutoff)
+        
+        if expired["archived"] or expired["dropped"]:
+            brebot_logger.log_agent_action(
+                agent_name="ActivityLogger",
+                action="retention_applied",
+                details={"cutoff": cutoff.isoformat(), **expired}
+            )
+        return expired
+    
+    def _expire_log_files(self, cutoff: datetime):
+        """Remove or archive per-activity JSON folders (platform/YYYY-MM-DD) older than cutoff."""
+        cutoff_day = cutoff.strftime("%Y-%m-%d")
+        for day_dir in self.log_dir.glob("*/*"):
+            if not day_dir.is_dir() or day_dir.parent.name in ("exports", "archive"):
+                continue
+            try:
+                datetime.strptime(day_dir.name, "%Y-%m-%d")
+            except ValueError:
+                continue
+            if day_dir.name >= cutoff_day:
+                continue
+            if self.archive_expired:
+                target = self.log_dir / "archive" / day_dir.parent.name / day_dir.name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(day_dir), str(target))
+            else:
+                shutil.rmtree(day_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _parse_timestamp(value: str) -> datetime:
+        """Parse a stored ISO timestamp, assuming UTC when no offset was recorded."""
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    
+    @staticmethod
+    def _to_utc(value: Optional[datetime]) -> Optional[datetime]:
+        """Normalise filter datetimes; naive values are treated as local time."""
+        if value is None:
+            return None
+        return value.astimezone(timezone.utc)
+    
+    @staticmethod
+    def _add_rowid_alias(conn: sqlite3.Connection):
+        """
+        Rebuild a pre-``seq`` activities table with an explicit rowid alias.
+        
+        The FTS index maps terms to rowids; with only a TEXT primary key
+        those are implicit and VACUUM may renumber them, silently pointing
+        the index at the wrong rows. ``seq`` keeps the existing rowids.
+        """
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(activities)")]
+        column_list = ", ".join(columns)
+        for trigger in ("activities_fts_ai", "activities_fts_ad", "activities_fts_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS activities_fts")
+        conn.execute("ALTER TABLE activities RENAME TO activities_old")
+        conn.execute(ACTIVITIES_TABLE_SQL)
+        conn.execute(
+            f"INSERT INTO activities (seq, {column_list}) SELECT rowid, {column_list} FROM activities_old"
+        )
+        # Indexes, triggers and the FTS table are recreated by the caller
+        conn.execute("DROP TABLE activities_old")
+    
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 index over activities and keep it in sync via triggers."""
+        columns = ", ".join(FTS_COLUMNS)
+        new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+        old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+        
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activities_fts'"
+            ).fetchone()
+            
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts USING fts5(
+                    {columns},
+                    content='activities',
+                    content_rowid='seq',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5; search falls back to LIKE scans
+            brebot_logger.log_error(e, context="ActivityLogger._init_fts")
+            return False
+        
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS activities_fts_ai AFTER INSERT ON activities BEGIN
+                INSERT INTO activities_fts(rowid, {columns}) VALUES (new.seq, {new_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS activities_fts_ad AFTER DELETE ON activities BEGIN
+                INSERT INTO activities_fts(activities_fts, rowid, {columns}) VALUES ('delete', old.seq, {old_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS activities_fts_au AFTER UPDATE ON activities BEGIN
+                INSERT INTO activities_fts(activities_fts, rowid, {columns}) VALUES ('delete', old.seq, {old_values});
+                INSERT INTO activities_fts(rowid, {columns}) VALUES (new.seq, {new_values});
+            END
+        """)
+        
+        if not exists:
+            # Index rows written before the FTS table existed
+            conn.execute("INSERT INTO activities_fts(activities_fts) VALUES ('rebuild')")
+        
+        return True
+    
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> ActivityRecord:
+        """Convert a database row into an ActivityRecord."""
+        return ActivityRecord(
+            id=row['id'],
+            timestamp=row['timestamp'],
+            platform=row['platform'],
+            activity_type=row['activity_type'],
+            agent_name=row['agent_name'],
+            description=row['description'],
+            details=json.loads(row['details']) if row['details'] else {},
+            resource_path=row['resource_path'],
+            resource_id=row['resource_id'],
+            data_size=row['data_size'],
+            success=bool(row['success']),
+            error_message=row['error_message'],
+            session_id=row['session_id'],
+            user_context=row['user_context'],
+            operation=row['operation'],
+            duration_ms=row['duration_ms']
+        )
+    
+    @staticmethod
+    def _build_fts_query(query: str) -> str:
+        """Turn free text into a safe FTS5 query (implicit AND, trailing * for prefixes)."""
+        terms = []
+        for token in query.split():
+            prefix = token.endswith("*")
+            token = token.rstrip("*").replace('"', '""')
+            if not token:
+                continue
+            terms.append(f'"{token}"*' if prefix else f'"{token}"')
+        return " ".join(terms)
+    
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+    def configure_sampling(
+        self,
+        min_level: Optional[str] = None,
+        sample_rates: Union[Dict[str, float], str, None] = None
+    ):
+        """Change the minimum level and/or sample rates; takes effect immediately."""
+        if min_level is not None:
+            min_level = min_level.lower()
+            if min_level not in ACTIVITY_LEVELS:
+                raise ValueError(f"min_level must be one of {list(ACTIVITY_LEVELS)}")
+            self.min_level = min_level
+        
+        if sample_rates is not None:
+            self.sample_rates = self._parse_sample_rates(sample_rates)
+    
+    @staticmethod
+    def _parse_sample_rates(sample_rates: Union[Dict[str, float], str]) -> Dict[str, float]:
+        """Accept a dict or "airtable/create=0.1,dropbox=0.05" and clamp rates to [0, 1]."""
+        if isinstance(sample_rates, str):
+            pairs = [item.split("=", 1) for item in sample_rates.split(",") if item.strip()]
+            sample_rates = {key: value for key, value in pairs}
+        
+        rates = {}
+        for key, rate in sample_rates.items():
+            rates[key.strip().lower()] = min(1.0, max(0.0, float(rate)))
+        return rates
+    
+    @staticmethod
+    def _default_level(activity_type: str, success: bool) -> str:
+        """Level used when the caller does not pass one."""
+        if not success:
+            return "error"
+        return "debug" if activity_type in DEBUG_ACTIVITY_TYPES else "info"
+    
+    def _sample_rate(self, platform: str, activity_type: str) -> float:
+        """Most specific configured rate for a platform/activity type pair."""
+        for key in (f"{platform}/{activity_type}", platform, f"*/{activity_type}", "*"):
+            if key in self.sample_rates:
+                return self.sample_rates[key]
+        return 1.0
+    
+    def _should_store(self, platform: str, activity_type: str, level: str, success: bool) -> bool:
+        """Errors are always stored; successes pass the level check, then sampling."""
+        if not success:
+            return True
+        if ACTIVITY_LEVELS.get(level, ACTIVITY_LEVELS["info"]) < ACTIVITY_LEVELS[self.min_level]:
+            return False
+        rate = self._sample_rate(platform, activity_type)
+        return rate >= 1.0 or random.random() < rate
+    
+    def _count_suppressed(
+        self,
+        timestamp: datetime,
+        platform: str,
+        activity_type: str,
+        agent_name: str,
+        operation: Optional[str],
+        data_size: Optional[int],
+        duration_ms: Optional[float]
+    ) -> bool:
+        """Count a suppressed activity; returns True when the counters are due a flush."""
+        bucket = timestamp.astimezone(timezone.utc).replace(second=0, microsecond=0).isoformat()
+        key = (bucket, platform, activity_type, agent_name, operation or "")
+        with self._suppressed_lock:
+            counter = self._suppressed.setdefault(key, [0, 0, 0.0])
+            counter[0] += 1
+            counter[1] += data_size or 0
+            counter[2] += duration_ms or 0.0
+            self._suppressed_pending += 1
+            return (
+                self._suppressed_pending >= SUPPRESSED_FLUSH_EVENTS
+                or time.monotonic() - self._suppressed_flushed_at >= SUPPRESSED_FLUSH_SECONDS
+            )
+    
+    def flush_suppressed(self) -> int:
+        """Write pending suppressed-activity counters to the rollup tables."""
+        with self._suppressed_lock:
+            pending, self._suppressed = self._suppressed, {}
+            self._suppressed_pending = 0
+            self._suppressed_flushed_at = time.monotonic()
+        
+        if not pending:
+            return 0
+        
+        by_partition: Dict[Path, List[tuple]] = {}
+        for (bucket, platform, activity_type, agent_name, operation), (count, data_size, duration) in pending.items():
+            partition = self._partition_for(self._parse_timestamp(bucket))
+            if partition is None:
+                continue
+            by_partition.setdefault(partition.path, []).append(
+                (bucket, platform, activity_type, agent_name, operation, count, data_size, duration)
+            )
+        
+        for path, rows in by_partition.items():
+            with sqlite3.connect(path) as conn:
+                conn.executemany("""
+                    INSERT INTO activity_rollups (
+                        bucket, platform, activity_type, agent_name, operation,
+                        suppressed, data_size, duration_ms
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (bucket, platform, activity_type, agent_name, operation) DO UPDATE SET
+                        suppressed = suppressed + excluded.suppressed,
+                        data_size = data_size + excluded.data_size,
+                        duration_ms = duration_ms + excluded.duration_ms
+                """, rows)
+                conn.commit()
+        
+        return sum(counter[0] for counter in pending.values())
     
     async def log_activity(
         self,
@@ -144,22 +683,50 @@ class ActivityLogger:
         data_size: Optional[int] = None,
         success: bool = True,
         error_message: Optional[str] = None,
-        user_context: Optional[str] = None
-    ) -> str:
-        """Log an activity to database and file system."""
+        user_context: Optional[str] = None,
+        operation: Optional[str] = None,
+        duration_ms: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+        level: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Log an activity to database and file system.
+        
+        Returns the activity id, or None when the activity was suppressed by
+        the minimum level or sampling (it is still counted in rollups) or is
+        already older than the retention window.
+        """
+        
+        # Spans pass their start time; point-in-time events are stamped now
+        timestamp = timestamp or datetime.now(timezone.utc)
+        if self._is_expired(timestamp.astimezone(timezone.utc).strftime(PARTITION_FORMATS[self.partition_by])):
+            return None
+        platform_value = platform.value if isinstance(platform, Platform) else platform
+        activity_type_value = activity_type.value if isinstance(activity_type, ActivityType) else activity_type
         
-        # Generate unique activity ID
-        timestamp = datetime.now(timezone.utc)
-        activity_id = hashlib.md5(
-            f"{timestamp.isoformat()}_{platform}_{activity_type}_{agent_name}".encode()
-        ).hexdigest()
+        level = (level or self._default_level(activity_type_value, success)).lower()
+        if not self._should_store(platform_value, activity_type_value, level, success):
+            if self._count_suppressed(
+                timestamp, platform_value, activity_type_value, agent_name,
+                operation, data_size, duration_ms
+            ):
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, self.flush_suppressed)
+            return None
+        
+        activity_id = uuid.uuid4().hex
+        
+        # Link the record to the request trace it happened in
+        trace_ids = tracing.current_ids()
+        if trace_ids:
+            details = {**(details or {}), "trace_id": trace_ids[0], "span_id": trace_ids[1]}
         
         # Create activity record
         record = ActivityRecord(
             id=activity_id,
             timestamp=timestamp.isoformat(),
-            platform=platform.value if isinstance(platform, Platform) else platform,
-            activity_type=activity_type.value if isinstance(activity_type, ActivityType) else activity_type,
+            platform=platform_value,
+            activity_type=activity_type_value,
             agent_name=agent_name,
             description=description,
             details=details or {},
@@ -169,14 +736,17 @@ class ActivityLogger:
             success=success,
             error_message=error_message,
             session_id=self.session_id,
-            user_context=user_context
+            user_context=user_context,
+            operation=operation,
+            duration_ms=duration_ms
         )
         
-        # Store in database
-        await self._store_in_database(record)
-        
-        # Store detailed log file
-        await self._store_log_file(record)
+        with tracing.child_span("activity.store", activity_id=activity_id):
+            # Store in database
+            await self._store_in_database(record)
+            
+            # Store detailed log file
+            await self._store_log_file(record)
         
         # Log to BreBot logger as well
         brebot_logger.log_agent_action(
@@ -188,27 +758,45 @@ class ActivityLogger:
                 "description": description,
                 "success": success,
                 "resource_path": resource_path,
-                "data_size": data_size
+                "data_size": data_size,
+                "duration_ms": duration_ms
             }
         )
         
         return activity_id
     
+    def span(
+        self,
+        platform: Union[Platform, str],
+        activity_type: Union[ActivityType, str],
+        agent_name: str,
+        description: str,
+        operation: Optional[str] = None,
+        **fields
+    ) -> "ActivitySpan":
+        """Time an operation and record it as one activity when the block exits."""
+        return ActivitySpan(self, platform, activity_type, agent_name, description, operation, **fields)
+    
     async def _store_in_database(self, record: ActivityRecord):
-        """Store activity record in SQLite database."""
+        """Store activity record in the partition covering its timestamp."""
         def _insert_record():
-            with sqlite3.connect(self.db_path) as conn:
+            partition = self._partition_for(self._parse_timestamp(record.timestamp))
+            if partition is None:
+                return
+            with sqlite3.connect(partition.path) as conn:
                 conn.execute("""
                     INSERT INTO activities (
                         id, timestamp, platform, activity_type, agent_name,
                         description, details, resource_path, resource_id,
-                        data_size, success, error_message, session_id, user_context
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        data_size, success, error_message, session_id, user_context,
+                        operation, duration_ms
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     record.id, record.timestamp, record.platform, record.activity_type,
                     record.agent_name, record.description, json.dumps(record.details),
                     record.resource_path, record.resource_id, record.data_size,
-                    record.success, record.error_message, record.session_id, record.user_context
+                    record.success, record.error_message, record.session_id, record.user_context,
+                    record.operation, record.duration_ms
                 ))
                 conn.commit()
         
@@ -238,65 +826,145 @@ class ActivityLogger:
         limit: int = 100,
         offset: int = 0
     ) -> List[ActivityRecord]:
-        """Query activities with filters."""
+        """Query activities with filters, reading only partitions that overlap the range."""
+        start_time = self._to_utc(start_time)
+        end_time = self._to_utc(end_time)
         
         def _query_activities():
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = "SELECT * FROM activities WHERE 1=1"
-                params = []
-                
-                if platform:
-                    query += " AND platform = ?"
-                    params.append(platform)
-                
-                if agent_name:
-                    query += " AND agent_name = ?"
-                    params.append(agent_name)
-                
-                if activity_type:
-                    query += " AND activity_type = ?"
-                    params.append(activity_type)
-                
-                if start_time:
-                    query += " AND timestamp >= ?"
-                    params.append(start_time.isoformat())
-                
-                if end_time:
-                    query += " AND timestamp <= ?"
-                    params.append(end_time.isoformat())
-                
-                query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
-                
-                rows = conn.execute(query, params).fetchall()
-                
-                activities = []
-                for row in rows:
-                    activity = ActivityRecord(
-                        id=row['id'],
-                        timestamp=row['timestamp'],
-                        platform=row['platform'],
-                        activity_type=row['activity_type'],
-                        agent_name=row['agent_name'],
-                        description=row['description'],
-                        details=json.loads(row['details']) if row['details'] else {},
-                        resource_path=row['resource_path'],
-                        resource_id=row['resource_id'],
-                        data_size=row['data_size'],
-                        success=bool(row['success']),
-                        error_message=row['error_message'],
-                        session_id=row['session_id'],
-                        user_context=row['user_context']
-                    )
-                    activities.append(activity)
+            query = "SELECT * FROM activities WHERE 1=1"
+            params = []
+            
+            if platform:
+                query += " AND platform = ?"
+                params.append(platform)
+            
+            if agent_name:
+                query += " AND agent_name = ?"
+                params.append(agent_name)
+            
+            if activity_type:
+                query += " AND activity_type = ?"
+                params.append(activity_type)
+            
+            if start_time:
+                query += " AND timestamp >= ?"
+                params.append(start_time.isoformat())
+            
+            if end_time:
+                query += " AND timestamp <= ?"
+                params.append(end_time.isoformat())
+            
+            # Every partition contributes at most limit + offset rows; the merge pages them
+            wanted = limit + offset
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(wanted)
+            
+            rows = []
+            for partition in self._partitions_for_range(start_time, end_time):
+                with sqlite3.connect(partition.path) as conn:
+                    conn.row_factory = sqlite3.Row
+                    rows.extend(conn.execute(query, params).fetchall())
                 
-                return activities
+                # Partitions are visited newest first, so older ones cannot beat what we have
+                if len(rows) >= wanted:
+                    break
+            
+            rows.sort(key=lambda row: row['timestamp'], reverse=True)
+            return [self._row_to_record(row) for row in rows[offset:wanted]]
         
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _query_activities)
     
+    async def search_activities(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50
+    ) -> List[ActivitySearchHit]:
+        """
+        Full-text search over descriptions, errors and details.
+        
+        bm25 statistics are per partition file, so scores from different
+        partitions are not comparable: hits are ranked by relevance within
+        each partition and partitions are returned newest first.
+        
+        Args:
+            query: Free text; terms are ANDed, a trailing * matches prefixes
+            filters: Optional equality filters (platform, agent_name, activity_type,
+                session_id, success) plus start_time/end_time datetimes
+            limit: Maximum number of hits to return
+        """
+        filters = filters or {}
+        fts_query = self._build_fts_query(query)
+        if not fts_query:
+            return []
+        
+        start_time = self._to_utc(filters.get("start_time"))
+        end_time = self._to_utc(filters.get("end_time"))
+        
+        # Filters shared by the FTS and LIKE forms of the query
+        where = ""
+        filter_params: List[Any] = []
+        for column in ("platform", "agent_name", "activity_type", "session_id"):
+            if filters.get(column):
+                where += f" AND a.{column} = ?"
+                filter_params.append(filters[column])
+        
+        if filters.get("success") is not None:
+            where += " AND a.success = ?"
+            filter_params.append(bool(filters["success"]))
+        
+        if start_time:
+            where += " AND a.timestamp >= ?"
+            filter_params.append(start_time.isoformat())
+        
+        if end_time:
+            where += " AND a.timestamp <= ?"
+            filter_params.append(end_time.isoformat())
+        
+        def _partition_query(fts_enabled: bool) -> tuple:
+            if fts_enabled:
+                # bm25() is lower-is-better, so ascending order puts best hits first
+                sql = """
+                    SELECT a.*, bm25(activities_fts) AS score,
+                           snippet(activities_fts, -1, '[', ']', '...', 12) AS snippet
+                    FROM activities_fts
+                    JOIN activities a ON a.seq = activities_fts.rowid
+                    WHERE activities_fts MATCH ?
+                """ + where + " ORDER BY score, a.timestamp DESC LIMIT ?"
+                return sql, [fts_query, *filter_params, limit]
+            
+            like = f"%{query}%"
+            sql = """
+                SELECT a.*, 0.0 AS score, a.description AS snippet
+                FROM activities a
+                WHERE (a.description LIKE ? OR a.error_message LIKE ? OR a.details LIKE ?)
+            """ + where + " ORDER BY a.timestamp DESC LIMIT ?"
+            return sql, [like, like, like, *filter_params, limit]
+        
+        def _search():
+            hits = []
+            for partition in self._partitions_for_range(start_time, end_time):
+                # FTS availability is per file; one without it falls back to LIKE
+                sql, params = _partition_query(partition.fts_enabled)
+                with sqlite3.connect(partition.path) as conn:
+                    conn.row_factory = sqlite3.Row
+                    for row in conn.execute(sql, params).fetchall():
+                        hits.append(ActivitySearchHit(
+                            record=self._row_to_record(row),
+                            score=-float(row['score']),
+                            snippet=row['snippet'] or ""
+                        ))
+                
+                # Newer partitions come first and already hold enough hits
+                if len(hits) >= limit:
+                    break
+            
+            return hits[:limit]
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _search)
+    
     async def get_activity_summary(
         self,
         start_time: Optional[datetime] = None,
@@ -304,82 +972,225 @@ class ActivityLogger:
     ) -> Dict[str, Any]:
         """Get summary statistics of activities."""
         
+        start_time = self._to_utc(start_time)
+        end_time = self._to_utc(end_time)
+        
         def _get_summary():
-            with sqlite3.connect(self.db_path) as conn:
-                query = """
-                    SELECT 
-                        platform,
-                        activity_type,
-                        agent_name,
-                        COUNT(*) as count,
-                        SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                        SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed,
-                        SUM(COALESCE(data_size, 0)) as total_data_size
-                    FROM activities 
-                    WHERE 1=1
-                """
-                params = []
-                
-                if start_time:
-                    query += " AND timestamp >= ?"
-                    params.append(start_time.isoformat())
-                
-                if end_time:
-                    query += " AND timestamp <= ?"
-                    params.append(end_time.isoformat())
-                
-                query += " GROUP BY platform, activity_type, agent_name"
-                
-                rows = conn.execute(query, params).fetchall()
-                
-                summary = {
-                    "total_activities": 0,
-                    "platforms": {},
-                    "activity_types": {},
-                    "agents": {},
-                    "success_rate": 0,
-                    "total_data_processed": 0
-                }
+            query = """
+                SELECT 
+                    platform,
+                    activity_type,
+                    agent_name,
+                    COUNT(*) as count,
+                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
+                    SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed,
+                    SUM(COALESCE(data_size, 0)) as total_data_size
+                FROM activities 
+                WHERE 1=1
+            """
+            params = []
+            
+            if start_time:
+                query += " AND timestamp >= ?"
+                params.append(start_time.isoformat())
+            
+            if end_time:
+                query += " AND timestamp <= ?"
+                params.append(end_time.isoformat())
+            
+            query += " GROUP BY platform, activity_type, agent_name"
+            
+            # Suppressed activities were all successful; fold them in as such
+            rollup_query = """
+                SELECT platform, activity_type, agent_name,
+                       SUM(suppressed), SUM(suppressed), 0, SUM(data_size)
+                FROM activity_rollups
+                WHERE 1=1
+            """
+            rollup_params = []
+            
+            if start_time:
+                rollup_query += " AND bucket >= ?"
+                rollup_params.append(start_time.replace(second=0, microsecond=0).isoformat())
+            
+            if end_time:
+                rollup_query += " AND bucket <= ?"
+                rollup_params.append(end_time.isoformat())
+            
+            rollup_query += " GROUP BY platform, activity_type, agent_name"
+            
+            self.flush_suppressed()
+            
+            rows = []
+            suppressed_total = 0
+            for partition in self._partitions_for_range(start_time, end_time):
+                with sqlite3.connect(partition.path) as conn:
+                    rows.extend(conn.execute(query, params).fetchall())
+                    rollups = conn.execute(rollup_query, rollup_params).fetchall()
+                rows.extend(rollups)
+                suppressed_total += sum(row[3] for row in rollups)
+            
+            summary = {
+                "total_activities": 0,
+                "suppressed_activities": suppressed_total,
+                "platforms": {},
+                "activity_types": {},
+                "agents": {},
+                "success_rate": 0,
+                "total_data_processed": 0
+            }
+            
+            total_count = 0
+            total_successful = 0
+            
+            for row in rows:
+                platform, activity_type, agent_name, count, successful, failed, data_size = row
                 
-                total_count = 0
-                total_successful = 0
+                total_count += count
+                total_successful += successful
+                summary["total_data_processed"] += data_size or 0
                 
-                for row in rows:
-                    platform, activity_type, agent_name, count, successful, failed, data_size = row
-                    
-                    total_count += count
-                    total_successful += successful
-                    summary["total_data_processed"] += data_size or 0
-                    
-                    # Platform stats
-                    if platform not in summary["platforms"]:
-                        summary["platforms"][platform] = {"count": 0, "successful": 0, "failed": 0}
-                    summary["platforms"][platform]["count"] += count
-                    summary["platforms"][platform]["successful"] += successful
-                    summary["platforms"][platform]["failed"] += failed
-                    
-                    # Activity type stats
-                    if activity_type not in summary["activity_types"]:
-                        summary["activity_types"][activity_type] = {"count": 0, "successful": 0, "failed": 0}
-                    summary["activity_types"][activity_type]["count"] += count
-                    summary["activity_types"][activity_type]["successful"] += successful
-                    summary["activity_types"][activity_type]["failed"] += failed
-                    
-                    # Agent stats
-                    if agent_name not in summary["agents"]:
-                        summary["agents"][agent_name] = {"count": 0, "successful": 0, "failed": 0}
-                    summary["agents"][agent_name]["count"] += count
-                    summary["agents"][agent_name]["successful"] += successful
-                    summary["agents"][agent_name]["failed"] += failed
+                # Platform stats
+                if platform not in summary["platforms"]:
+                    summary["platforms"][platform] = {"count": 0, "successful": 0, "failed": 0}
+                summary["platforms"][platform]["count"] += count
+                summary["platforms"][platform]["successful"] += successful
+                summary["platforms"][platform]["failed"] += failed
                 
-                summary["total_activities"] = total_count
-                summary["success_rate"] = (total_successful / total_count * 100) if total_count > 0 else 0
+                # Activity type stats
+                if activity_type not in summary["activity_types"]:
+                    summary["activity_types"][activity_type] = {"count": 0, "successful": 0, "failed": 0}
+                summary["activity_types"][activity_type]["count"] += count
+                summary["activity_types"][activity_type]["successful"] += successful
+                summary["activity_types"][activity_type]["failed"] += failed
                 
-                return summary
+                # Agent stats
+                if agent_name not in summary["agents"]:
+                    summary["agents"][agent_name] = {"count": 0, "successful": 0, "failed": 0}
+                summary["agents"][agent_name]["count"] += count
+                summary["agents"][agent_name]["successful"] += successful
+                summary["agents"][agent_name]["failed"] += failed
+            
+            summary["total_activities"] = total_count
+            summary["success_rate"] = (total_successful / total_count * 100) if total_count > 0 else 0
+            
+            return summary
         
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _get_summary)
     
+    async def get_latency_stats(
+        self,
+        platform: Optional[str] = None,
+        operation: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Latency percentiles per platform/operation, computed from recorded spans.
+        
+        Percentiles come from the stored (sampled) spans; ``count`` and
+        ``total_bytes`` also include calls suppressed by sampling.
+        
+        Returns:
+            Dict keyed by "platform/operation" with count, sampled, suppressed,
+            errors, p50/p95/p99/max latency in milliseconds and total bytes
+        """
+        start_time = self._to_utc(start_time)
+        end_time = self._to_utc(end_time)
+        
+        def _get_latency():
+            query = """
+                SELECT platform, operation, duration_ms, success, data_size
+                FROM activities
+                WHERE duration_ms IS NOT NULL AND operation IS NOT NULL
+            """
+            params = []
+            
+            if platform:
+                query += " AND platform = ?"
+                params.append(platform)
+            
+            if operation:
+                query += " AND operation = ?"
+                params.append(operation)
+            
+            if start_time:
+                query += " AND timestamp >= ?"
+                params.append(start_time.isoformat())
+            
+            if end_time:
+                query += " AND timestamp <= ?"
+                params.append(end_time.isoformat())
+            
+            rollup_query = """
+                SELECT platform, operation, SUM(suppressed), SUM(data_size)
+                FROM activity_rollups
+                WHERE operation != ''
+            """
+            rollup_params = []
+            
+            if platform:
+                rollup_query += " AND platform = ?"
+                rollup_params.append(platform)
+            
+            if operation:
+                rollup_query += " AND operation = ?"
+                rollup_params.append(operation)
+            
+            if start_time:
+                rollup_query += " AND bucket >= ?"
+                rollup_params.append(start_time.replace(second=0, microsecond=0).isoformat())
+            
+            if end_time:
+                rollup_query += " AND bucket <= ?"
+                rollup_params.append(end_time.isoformat())
+            
+            rollup_query += " GROUP BY platform, operation"
+            
+            self.flush_suppressed()
+            
+            groups: Dict[str, Dict[str, Any]] = {}
+            
+            def _group(row_platform, row_operation):
+                return groups.setdefault(f"{row_platform}/{row_operation}", {
+                    "platform": row_platform,
+                    "operation": row_operation,
+                    "durations": [],
+                    "errors": 0,
+                    "suppressed": 0,
+                    "total_bytes": 0
+                })
+            
+            for partition in self._partitions_for_range(start_time, end_time):
+                with sqlite3.connect(partition.path) as conn:
+                    for row_platform, row_operation, duration, success, data_size in conn.execute(query, params):
+                        group = _group(row_platform, row_operation)
+                        group["durations"].append(duration)
+                        group["errors"] += 0 if success else 1
+                        group["total_bytes"] += data_size or 0
+                    for row_platform, row_operation, suppressed, data_size in conn.execute(rollup_query, rollup_params):
+                        group = _group(row_platform, row_operation)
+                        group["suppressed"] += suppressed
+                        group["total_bytes"] += data_size
+            
+            stats = {}
+            for key, group in groups.items():
+                durations = sorted(group.pop("durations"))
+                stats[key] = {
+                    **group,
+                    "count": len(durations) + group["suppressed"],
+                    "sampled": len(durations),
+                    "p50_ms": _percentile(durations, 50),
+                    "p95_ms": _percentile(durations, 95),
+                    "p99_ms": _percentile(durations, 99),
+                    "max_ms": durations[-1] if durations else None
+                }
+            return stats
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _get_latency)
+    
     async def export_activities(
         self,
         format_type: str = "json",
@@ -426,13 +1237,114 @@ class ActivityLogger:
         return str(export_path)
 
 
+def _percentile(sorted_values: List[float], percentile: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 2)
+
+
+class ActivitySpan:
+    """
+    A timed operation recorded as a single activity when it finishes.
+    
+    Use as ``async with`` block; the record carries the start time, duration,
+    outcome (success or the raised error) and any bytes transferred.
+    """
+    
+    def __init__(
+        self,
+        logger: Optional[ActivityLogger],
+        platform: Union[Platform, str],
+        activity_type: Union[ActivityType, str],
+        agent_name: str,
+        description: str,
+        operation: Optional[str] = None,
+        **fields
+    ):
+        self.logger = logger
+        self.platform = platform
+        self.activity_type = activity_type
+        self.agent_name = agent_name
+        self.description = description
+        self.operation = operation
+        self.details: Dict[str, Any] = dict(fields.pop("details", None) or {})
+        self.fields = fields
+        self.started_at: Optional[datetime] = None
+        self.duration_ms: Optional[float] = None
+        self.activity_id: Optional[str] = None
+        self._started = 0.0
+        self._token = None
+        self._trace = tracing.child_span(
+            f"{getattr(platform, 'value', platform)}.{operation or 'activity'}",
+            agent_name=agent_name,
+        )
+    
+    def update(self, description: Optional[str] = None, **fields):
+        """Attach outcome information (counts, ids, sizes) before the span closes."""
+        if description:
+            self.description = description
+        self.details.update(fields.pop("details", None) or {})
+        self.fields.update(fields)
+    
+    def add_bytes(self, count: int):
+        """Accumulate bytes transferred by the operation."""
+        self.fields["data_size"] = (self.fields.get("data_size") or 0) + count
+    
+    async def __aenter__(self) -> "ActivitySpan":
+        self._trace.__enter__()
+        self._token = _current_activity_span.set(self)
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        _current_activity_span.reset(self._token)
+        try:
+            await self._record(exc)
+        finally:
+            self._trace.__exit__(exc_type, exc, tb)
+        return False
+    
+    async def _record(self, exc: Optional[BaseException]):
+        if not self.logger:
+            return
+        try:
+            self.activity_id = await self.logger.log_activity(
+                platform=self.platform,
+                activity_type=self.activity_type,
+                agent_name=self.agent_name,
+                description=self.description,
+                details=self.details,
+                success=exc is None,
+                error_message=str(exc) if exc else None,
+                operation=self.operation,
+                duration_ms=self.duration_ms,
+                timestamp=self.started_at,
+                **self.fields
+            )
+        except Exception as e:
+            # Losing an audit record must never fail the operation it describes
+            brebot_logger.log_error(e, context="ActivitySpan._record", details={"operation": self.operation})
+
+
 # Global activity logger instance
 activity_logger: Optional[ActivityLogger] = None
 
 def initialize_activity_logger(db_path: str = "data/activity_logs.db", log_dir: str = "data/activity_logs") -> ActivityLogger:
     """Initialize the global activity logger instance."""
     global activity_logger
-    activity_logger = ActivityLogger(db_path, log_dir)
+    activity_logger = ActivityLogger(
+        db_path,
+        log_dir,
+        partition_by=settings.activity_log_partition,
+        retention_days=settings.activity_log_retention_days,
+        archive_expired=settings.activity_log_archive,
+        min_level=settings.activity_log_min_level,
+        sample_rates=settings.activity_log_sample_rates
+    )
     return activity_logger
 
 def get_activity_logger() -> Optional[ActivityLogger]:
@@ -456,4 +1368,23 @@ async def log_platform_activity(
             description=description,
             **kwargs
         )
-    return None
\ No newline at end of file
+    return None
+
+
+def record_bytes(count: int):
+    """Add transferred bytes to the innermost open activity span (no-op outside one)."""
+    span = _current_activity_span.get()
+    if span is not None:
+        span.add_bytes(count)
+
+
+def platform_span(
+    platform: Union[Platform, str],
+    activity_type: Union[ActivityType, str],
+    agent_name: str,
+    description: str,
+    operation: Optional[str] = None,
+    **fields
+) -> ActivitySpan:
+    """Convenience span against the global activity logger (a no-op if none is set)."""
+    return ActivitySpan(get_activity_logger(), platform, activity_type, agent_name, description, operation, **fields)
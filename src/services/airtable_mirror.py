@@ -0,0 +1,229 @@
+"""
+Local SQLite mirror of Airtable tables for BreBot
+Serves reads without API calls and keeps itself current with incremental syncs
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Modified-since filters start this far before the previous sync to absorb
+# clock skew between us and Airtable; re-fetched rows are idempotent upserts
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+class AirtableMirror:
+    """
+    SQLite mirror of Airtable records, one database file per base.
+
+    Methods are synchronous; AirtableService calls them in an executor.
+    """
+
+    def __init__(self, mirror_dir: str = "data/airtable_mirror", full_sync_hours: float = 24):
+        """
+        Initialize the mirror.
+
+        Args:
+            mirror_dir: Directory holding one SQLite file per base
+            full_sync_hours: Interval between full syncs, which also detect deletions
+        """
+        self.mirror_dir = Path(mirror_dir)
+        self.full_sync_interval = timedelta(hours=full_sync_hours)
+        self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        self._initialized: set = set()
+        self._lock = threading.Lock()
+
+    def _db_path(self, base_id: str) -> Path:
+        return self.mirror_dir / f"{base_id}.db"
+
+    @contextmanager
+    def _connect(self, base_id: str) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path(base_id))
+        try:
+            if base_id not in self._initialized:
+                with self._lock:
+                    conn.executescript("""
+                        PRAGMA journal_mode=WAL;
+                        CREATE TABLE IF NOT EXISTS records (
+                            table_id TEXT NOT NULL,
+                            record_id TEXT NOT NULL,
+                            fields TEXT NOT NULL,
+                            created_time TEXT,
+                            synced_at TEXT NOT NULL,
+                            PRIMARY KEY (table_id, record_id)
+                        );
+                        CREATE TABLE IF NOT EXISTS sync_state (
+                            table_id TEXT PRIMARY KEY,
+                            last_sync_started TEXT,
+                            last_synced_at TEXT,
+                            last_full_sync_at TEXT,
+                            record_count INTEGER DEFAULT 0
+                        );
+                    """)
+                    self._initialized.add(base_id)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Sync state
+    # ------------------------------------------------------------------
+
+    def get_sync_state(self, base_id: str, table_id: str) -> Optional[Dict[str, Any]]:
+        """Return sync bookkeeping for a table, or None if it was never mirrored."""
+        if not self._db_path(base_id).exists():
+            return None
+        with self._connect(base_id) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM sync_state WHERE table_id = ?", (table_id,)).fetchone()
+            return dict(row) if row else None
+
+    def is_mirrored(self, base_id: str, table_id: str) -> bool:
+        state = self.get_sync_state(base_id, table_id)
+        return bool(state and state.get("last_synced_at"))
+
+    def age_seconds(self, base_id: str, table_id: str) -> Optional[float]:
+        """Seconds since the table last finished syncing (None if never)."""
+        state = self.get_sync_state(base_id, table_id)
+        if not state or not state.get("last_synced_at"):
+            return None
+        synced = datetime.fromisoformat(state["last_synced_at"])
+        return (datetime.now(timezone.utc) - synced).total_seconds()
+
+    def needs_full_sync(self, base_id: str, table_id: str) -> bool:
+        state = self.get_sync_state(base_id, table_id)
+        if not state or not state.get("last_full_sync_at"):
+            return True
+        last_full = datetime.fromisoformat(state["last_full_sync_at"])
+        return datetime.now(timezone.utc) - last_full >= self.full_sync_interval
+
+    def modified_since_formula(self, base_id: str, table_id: str) -> Optional[str]:
+        """filterByFormula selecting rows changed since the previous sync started."""
+        state = self.get_sync_state(base_id, table_id)
+        if not state or not state.get("last_sync_started"):
+            return None
+        since = datetime.fromisoformat(state["last_sync_started"]) - SYNC_OVERLAP
+        stamp = since.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{stamp}'))"
+
+    def finish_sync(
+        self,
+        base_id: str,
+        table_id: str,
+        started_at: datetime,
+        full: bool,
+        seen_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Record a completed sync; a full sync also drops rows Airtable no longer has.
+
+        Returns the number of records removed.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        removed = 0
+        with self._connect(base_id) as conn:
+            if full and seen_ids is not None:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (record_id TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM seen")
+                conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((rid,) for rid in seen_ids))
+                removed = conn.execute(
+                    "DELETE FROM records WHERE table_id = ? AND record_id NOT IN (SELECT record_id FROM seen)",
+                    (table_id,)
+                ).rowcount
+            count = conn.execute("SELECT COUNT(*) FROM records WHERE table_id = ?", (table_id,)).fetchone()[0]
+            conn.execute("""
+                INSERT INTO sync_state (table_id, last_sync_started, last_synced_at, last_full_sync_at, record_count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(table_id) DO UPDATE SET
+                    last_sync_started = excluded.last_sync_started,
+                    last_synced_at = excluded.last_synced_at,
+                    last_full_sync_at = COALESCE(excluded.last_full_sync_at, sync_state.last_full_sync_at),
+                    record_count = excluded.record_count
+            """, (table_id, started_at.isoformat(), now, now if full else None, count))
+        return removed
+
+    # ------------------------------------------------------------------
+    # Record storage
+    # ------------------------------------------------------------------
+
+    def upsert_records(self, base_id: str, table_id: str, records: List[Dict[str, Any]]) -> int:
+        """Insert or replace raw Airtable record dicts ({id, fields, createdTime})."""
+        if not records:
+            return 0
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connect(base_id) as conn:
+            conn.executemany(
+                """
+                INSERT INTO records (table_id, record_id, fields, created_time, synced_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(table_id, record_id) DO UPDATE SET
+                    fields = excluded.fields,
+                    created_time = COALESCE(excluded.created_time, records.created_time),
+                    synced_at = excluded.synced_at
+                """,
+                [
+                    (
+                        table_id,
+                        record["id"],
+                        json.dumps(record.get("fields", {}), default=str),
+                        record.get("createdTime") or record.get("created_time"),
+                        now,
+                    )
+                    for record in records
+                ]
+            )
+        return len(records)
+
+    def delete_records(self, base_id: str, table_id: str, record_ids: List[str]) -> int:
+        if not record_ids:
+            return 0
+        with self._connect(base_id) as conn:
+            return conn.executemany(
+                "DELETE FROM records WHERE table_id = ? AND record_id = ?",
+                [(table_id, record_id) for record_id in record_ids]
+            ).rowcount
+
+    def read_records(
+        self,
+        base_id: str,
+        table_id: str,
+        limit: Optional[int] = None,
+        search_term: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        after: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Read mirrored records as {id, fields, createdTime} dicts, oldest first.
+
+        ``search_term`` matches case-insensitively against ``search_fields``
+        (or every field), like the FIND/LOWER formula used for live search.
+        ``after`` is the (createdTime, id) of the last record of the previous
+        page, for paging through a table without OFFSET scans.
+        """
+        query = "SELECT record_id, fields, created_time FROM records WHERE table_id = ?"
+        args: List[Any] = [table_id]
+        if after is not None:
+            query += " AND (COALESCE(created_time, ''), record_id) > (?, ?)"
+            args.extend([after[0] or "", after[1]])
+        query += " ORDER BY COALESCE(created_time, ''), record_id"
+        with self._connect(base_id) as conn:
+            rows = conn.execute(query, args)
+            needle = search_term.lower() if search_term else None
+            results = []
+            for record_id, fields_json, created_time in rows:
+                fields = json.loads(fields_json)
+                if needle is not None:
+                    values = [fields.get(name) for name in search_fields] if search_fields else list(fields.values())
+                    haystack = " ".join("" if value is None else str(value) for value in values).lower()
+                    if needle not in haystack:
+                        continue
+                results.append({"id": record_id, "fields": fields, "createdTime": created_time})
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
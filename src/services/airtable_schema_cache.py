@@ -0,0 +1,131 @@
+"""
+Airtable schema cache for BreBot
+Keeps base lists and table/field metadata with a TTL, persisted to disk across restarts
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import settings
+from utils.logger import brebot_logger
+
+
+BASES_KEY = "bases"
+
+
+def schema_key(base_id: str) -> str:
+    return f"schema:{base_id}"
+
+
+class AirtableSchemaCache:
+    """TTL cache of Airtable meta API responses, shared by every caller in the process."""
+
+    def __init__(self, path: Optional[str] = "data/airtable_schema.json", ttl_seconds: float = 3600):
+        """
+        Initialize the schema cache.
+
+        Args:
+            path: JSON file the cache is persisted to (None keeps it in memory only)
+            ttl_seconds: Age after which entries are refreshed from the meta API
+        """
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+            self._entries = {
+                key: (entry["fetched_at"], entry["value"])
+                for key, entry in stored.get("entries", {}).items()
+            }
+        except Exception as e:
+            # A corrupt cache file only costs a refetch
+            brebot_logger.log_error(e, context="AirtableSchemaCache._load")
+            self._entries = {}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        entries = {key: {"fetched_at": fetched_at, "value": value} for key, (fetched_at, value) in self._entries.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"entries": entries}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            brebot_logger.log_error(e, context="AirtableSchemaCache._save")
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Cached value for ``key`` if it is younger than the TTL (or any age with ``allow_stale``)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (allow_stale or time.time() - entry[0] < self.ttl_seconds):
+                if not allow_stale:
+                    self.hits += 1
+                return entry[1]
+            if not allow_stale:
+                self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._save()
+
+    def invalidate(self, base_id: Optional[str] = None) -> None:
+        """Drop one base's schema, or everything when ``base_id`` is None."""
+        with self._lock:
+            if base_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(schema_key(base_id), None)
+            self._save()
+        brebot_logger.log_agent_action(
+            agent_name="AirtableSchemaCache",
+            action="invalidated",
+            details={"base_id": base_id or "all"}
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return {
+                "entries": len(self._entries),
+                "fresh_entries": sum(1 for fetched_at, _ in self._entries.values() if now - fetched_at < self.ttl_seconds),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl_seconds,
+                "path": str(self.path) if self.path else None,
+            }
+
+
+# Global schema cache instance
+airtable_schema_cache: Optional[AirtableSchemaCache] = None
+
+def initialize_airtable_schema_cache(path: Optional[str] = None, ttl_seconds: Optional[float] = None) -> AirtableSchemaCache:
+    """Initialize the global schema cache from settings (or explicit values)."""
+    global airtable_schema_cache
+    airtable_schema_cache = AirtableSchemaCache(
+        path if path is not None else settings.airtable_schema_cache_path,
+        ttl_seconds if ttl_seconds is not None else settings.airtable_schema_cache_ttl
+    )
+    return airtable_schema_cache
+
+def get_airtable_schema_cache() -> AirtableSchemaCache:
+    """Get the global schema cache, creating it from settings on first use."""
+    if airtable_schema_cache is None:
+        return initialize_airtable_schema_cache()
+    return airtable_schema_cache
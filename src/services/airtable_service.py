@@ -6,13 +6,20 @@ Provides comprehensive database management capabilities with activity logging
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
-from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from datetime import datetime, timezone
 import httpx
 from pydantic import BaseModel
 
+from config.settings import settings
 from utils.logger import brebot_logger
-from services.activity_logger import log_platform_activity, Platform, ActivityType
+from utils import tracing
+from utils import http_clients
+from utils.circuit_breaker import CircuitOpenError
+from utils.rate_limiter import backoff_delay
+from services.activity_logger import platform_span, record_bytes, Platform, ActivityType
+from services.airtable_mirror import AirtableMirror
+from services.airtable_schema_cache import BASES_KEY, get_airtable_schema_cache, schema_key
 
 
 class AirtableRecord(BaseModel):
@@ -38,6 +45,23 @@ class AirtableBase(BaseModel):
     tables: List[AirtableTable] = []
 
 
+class AirtableAPIError(Exception):
+    """Airtable request failure; ``status_code`` is None for transport errors."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AirtableBatchError(Exception):
+    """Some sub-batches of a batch write still failed after retries."""
+    
+    def __init__(self, message: str, records: List[Dict[str, Any]], failed: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.records = records  # raw records from the sub-batches that succeeded
+        self.failed = failed  # {"records": [...payload records...], "error": str} per failed sub-batch
+
+
 class AirtableService:
     """Enhanced service for managing Airtable bases, tables, and records."""
     
@@ -55,25 +79,35 @@ class AirtableService:
             "Content-Type": "application/json"
         }
         
+        # Optional local copy of synced tables; reads choose it via ``freshness``
+        self.mirror: Optional[AirtableMirror] = None
+        if settings.airtable_mirror_enabled:
+            self.mirror = AirtableMirror(settings.airtable_mirror_dir, settings.airtable_mirror_full_sync_hours)
+        self._sync_locks: Dict[tuple, asyncio.Lock] = {}
+        
         brebot_logger.log_agent_action(
             agent_name="AirtableService",
             action="initialized",
-            details={"has_api_key": bool(api_key)}
+            details={"has_api_key": bool(api_key), "mirror_enabled": self.mirror is not None}
         )
     
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request to Airtable API."""
         url = f"{self.base_url}{endpoint}"
         
-        async with httpx.AsyncClient() as client:
+        async with tracing.child_span("airtable.request", method=method, endpoint=endpoint) as span:
             try:
-                response = await client.request(
-                    method=method,
-                    url=url,
+                response = await http_clients.request(
+                    "airtable",
+                    method,
+                    url,
+                    credential=self.api_key,
                     headers=self.headers,
-                    timeout=30.0,
                     **kwargs
                 )
+                if span is not None:
+                    span.set_attributes(status=response.status_code, bytes=len(response.content))
+                record_bytes(http_clients.payload_size(response))
                 response.raise_for_status()
                 return response.json()
                 
@@ -81,107 +115,397 @@ class AirtableService:
                 brebot_logger.log_error(
                     e, 
                     context=f"AirtableService._make_request",
-                    details={"method": method, "endpoint": endpoint, "status": getattr(e.response, 'status_code', None)}
+                    details={"method": method, "endpoint": endpoint, "status": getattr(getattr(e, 'response', None), 'status_code', None)}
                 )
-                raise Exception(f"Airtable API error: {e}")
+                raise AirtableAPIError(
+                    f"Airtable API error: {e}",
+                    status_code=getattr(getattr(e, 'response', None), 'status_code', None)
+                ) from e
+    
+    def _max_mirror_age(self, freshness: Optional[Union[str, float]]) -> Optional[float]:
+        """
+        Oldest mirror age (seconds) a read accepts, or None to read live.
+        
+        ``freshness`` is "live", "mirror" (any age) or a number of seconds;
+        None uses AIRTABLE_DEFAULT_FRESHNESS.
+        """
+        if self.mirror is None:
+            return None
+        if freshness is None:
+            freshness = settings.airtable_default_freshness
+        if isinstance(freshness, str):
+            value = freshness.strip().lower()
+            if value == "live":
+                return None
+            if value == "mirror":
+                return float("inf")
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"Invalid freshness {freshness!r}: expected 'live', 'mirror' or seconds")
+        return float(freshness)
+    
+    async def _mirror_call(self, func, *args, **kwargs):
+        """Run a blocking mirror operation in the default executor."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
     
-    async def list_bases(self, agent_name: str = "AirtableService") -> List[AirtableBase]:
-        """List all accessible Airtable bases."""
+    async def _read_from_mirror(
+        self,
+        base_id: str,
+        table_id: str,
+        freshness: Optional[Union[str, float]],
+        agent_name: str
+    ) -> bool:
+        """
+        Decide whether a read is served from the mirror, syncing it first if too stale.
+        
+        If the catch-up sync fails but an older copy exists, the stale copy is
+        served rather than failing the read.
+        """
+        max_age = self._max_mirror_age(freshness)
+        if max_age is None:
+            return False
+        
+        age = await self._mirror_call(self.mirror.age_seconds, base_id, table_id)
+        if age is not None and age <= max_age:
+            return True
+        
         try:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Listing accessible bases"
+            await self.sync_table(base_id, table_id, agent_name=agent_name)
+        except Exception as e:
+            if age is None:
+                raise
+            brebot_logger.log_error(
+                e,
+                context="AirtableService._read_from_mirror",
+                details={"base_id": base_id, "table_id": table_id, "mirror_age": round(age, 1)}
             )
+        return True
+    
+    async def _write_through(
+        self,
+        base_id: str,
+        table_id: str,
+        records: Optional[List[Dict[str, Any]]] = None,
+        deleted_ids: Optional[List[str]] = None
+    ) -> None:
+        """Apply a successful write to the mirror when the table is mirrored."""
+        if self.mirror is None:
+            return
+        try:
+            if not await self._mirror_call(self.mirror.is_mirrored, base_id, table_id):
+                return
+            if records:
+                await self._mirror_call(self.mirror.upsert_records, base_id, table_id, records)
+            if deleted_ids:
+                await self._mirror_call(self.mirror.delete_records, base_id, table_id, deleted_ids)
+        except Exception as e:
+            # The API write succeeded; the next sync repairs the mirror
+            brebot_logger.log_error(e, context="AirtableService._write_through")
+    
+    @staticmethod
+    def _to_records(rows: List[Dict[str, Any]]) -> List[AirtableRecord]:
+        return [
+            AirtableRecord(id=row['id'], fields=row['fields'], created_time=row.get('createdTime'))
+            for row in rows
+        ]
+    
+    async def _iter_pages(
+        self,
+        base_id: str,
+        table_id: str,
+        params: Dict[str, Any]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of raw records, following ``offset`` tokens.
+        
+        The next page is requested as soon as the current one arrives, so its
+        round trip overlaps with the caller processing the current page.
+        """
+        endpoint = f'/{base_id}/{table_id}'
+        pending = asyncio.ensure_future(self._make_request('GET', endpoint, params=params))
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                offset = data.get('offset')
+                if offset:
+                    pending = asyncio.ensure_future(
+                        self._make_request('GET', endpoint, params={**params, "offset": offset})
+                    )
+                yield data.get('records', [])
+        finally:
+            # Caller stopped early: drop the prefetch without leaving an unretrieved error
+            if pending is not None:
+                pending.cancel()
+                pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
+    async def iter_records(
+        self,
+        base_id: str,
+        table_id: str,
+        max_records: Optional[int] = None,
+        view: Optional[str] = None,
+        filter_formula: Optional[str] = None,
+        page_size: int = 100,
+        freshness: Optional[Union[str, float]] = None,
+        agent_name: str = "AirtableService"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over every record in a table as plain {id, fields, createdTime} dicts.
+        
+        Live reads prefetch the next page while the current one is consumed;
+        reads without a view or formula may come from the mirror (see
+        ``_max_mirror_age``). Only one page is held in memory at a time.
+        """
+        page_size = max(1, min(page_size, 100))  # Airtable's page size limit
+        
+        if not view and not filter_formula and await self._read_from_mirror(
+            base_id, table_id, freshness, agent_name
+        ):
+            after = None
+            remaining = max_records
+            while remaining is None or remaining > 0:
+                limit = page_size if remaining is None else min(page_size, remaining)
+                rows = await self._mirror_call(self.mirror.read_records, base_id, table_id, limit=limit, after=after)
+                for row in rows:
+                    yield row
+                if len(rows) < limit:
+                    return
+                if remaining is not None:
+                    remaining -= len(rows)
+                after = (rows[-1]['createdTime'], rows[-1]['id'])
+            return
+        
+        params: Dict[str, Any] = {"pageSize": page_size}
+        if max_records is not None:
+            params["maxRecords"] = max_records
+        if view:
+            params["view"] = view
+        if filter_formula:
+            params["filterByFormula"] = filter_formula
+        
+        pages = self._iter_pages(base_id, table_id, params)
+        try:
+            async for page in pages:
+                for record_data in page:
+                    yield record_data
+        finally:
+            await pages.aclose()
+    
+    async def sync_table(
+        self,
+        base_id: str,
+        table_id: str,
+        full: Optional[bool] = None,
+        agent_name: str = "AirtableService"
+    ) -> Dict[str, Any]:
+        """
+        Bring the local mirror of a table up to date.
+        
+        Incremental syncs fetch only records modified since the previous sync
+        (a LAST_MODIFIED_TIME() filter); full syncs re-read the table and drop
+        records deleted in Airtable. ``full=None`` runs a full sync for new
+        tables and once every AIRTABLE_MIRROR_FULL_SYNC_HOURS.
+        """
+        if self.mirror is None:
+            raise ValueError("Airtable mirror is disabled; set AIRTABLE_MIRROR_ENABLED=true")
+        
+        requested_at = datetime.now(timezone.utc)
+        lock = self._sync_locks.setdefault((base_id, table_id), asyncio.Lock())
+        async with lock:
+            state = await self._mirror_call(self.mirror.get_sync_state, base_id, table_id)
+            if not full and state and state.get("last_synced_at"):
+                # Another caller finished a sync while we waited for the lock
+                if datetime.fromisoformat(state["last_synced_at"]) >= requested_at:
+                    return {"base_id": base_id, "table_id": table_id, "skipped": True}
             
-            data = await self._make_request('GET', '/meta/bases')
-            bases = []
+            if full is None:
+                full = await self._mirror_call(self.mirror.needs_full_sync, base_id, table_id)
+            formula = None
+            if not full:
+                formula = await self._mirror_call(self.mirror.modified_since_formula, base_id, table_id)
+                full = formula is None
             
-            for base_data in data.get('bases', []):
-                base = AirtableBase(
-                    id=base_data['id'],
-                    name=base_data['name'],
-                    permission_level=base_data['permissionLevel']
-                )
-                bases.append(base)
+            try:
+                async with platform_span(
+                    platform=Platform.AIRTABLE,
+                    activity_type=ActivityType.READ,
+                    agent_name=agent_name,
+                    description=f"{'Full' if full else 'Incremental'} mirror sync of table: {table_id}",
+                    operation="sync_table",
+                    resource_id=f"{base_id}/{table_id}",
+                    details={"full": full}
+                ) as span:
+                    started_at = datetime.now(timezone.utc)
+                    fetched = 0
+                    seen_ids: List[str] = []
+                    params = {"pageSize": 100}
+                    if formula:
+                        params["filterByFormula"] = formula
+                    
+                    async for page in self._iter_pages(base_id, table_id, params):
+                        await self._mirror_call(self.mirror.upsert_records, base_id, table_id, page)
+                        fetched += len(page)
+                        if full:
+                            seen_ids.extend(record_data['id'] for record_data in page)
+
+                    removed = await self._mirror_call(
+                        self.mirror.finish_sync, base_id, table_id, started_at, full, seen_ids if full else None
+                    )
+                    result = {
+                        "base_id": base_id,
+                        "table_id": table_id,
+                        "full": full,
+                        "fetched": fetched,
+                        "removed": removed,
+                    }
+                    
+                    span.update(
+                        description=f"Mirror sync fetched {fetched} records, removed {removed} from table: {table_id}",
+                        details=result
+                    )
+                    
+                    return result
             
-            await log_platform_activity(
+            except Exception as e:
+                brebot_logger.log_error(e, context="AirtableService.sync_table")
+                raise
+
+    async def list_bases(self, agent_name: str = "AirtableService", refresh: bool = False) -> List[AirtableBase]:
+        """
+        List all accessible Airtable bases.
+        
+        Served from the shared schema cache while it is fresh; ``refresh``
+        forces a meta API call (and updates the cache).
+        """
+        cache = get_airtable_schema_cache()
+        cached = None if refresh else cache.get(BASES_KEY)
+        if cached is not None:
+            return [AirtableBase(**base_data) for base_data in cached]
+        
+        try:
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
-                description=f"Successfully listed {len(bases)} bases",
-                details={"bases_count": len(bases)}
-            )
-            
-            return bases
+                description="Listing accessible bases",
+                operation="list_bases"
+            ) as span:
+                data = await self._make_request('GET', '/meta/bases')
+                bases = []
+                
+                for base_data in data.get('bases', []):
+                    base = AirtableBase(
+                        id=base_data['id'],
+                        name=base_data['name'],
+                        permission_level=base_data['permissionLevel']
+                    )
+                    bases.append(base)
+                cache.set(BASES_KEY, [base.dict() for base in bases])
+
+                span.update(
+                    description=f"Listed {len(bases)} bases",
+                    details={"bases_count": len(bases)}
+                )
+                
+                return bases
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to list bases",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="AirtableService.list_bases")
+            stale = None if refresh else cache.get(BASES_KEY, allow_stale=True)
+            if stale is not None:
+                return [AirtableBase(**base_data) for base_data in stale]
             raise
     
-    async def get_base_schema(self, base_id: str, agent_name: str = "AirtableService") -> AirtableBase:
-        """Get base schema including tables and fields."""
+    async def get_base_schema(
+        self,
+        base_id: str,
+        agent_name: str = "AirtableService",
+        refresh: bool = False
+    ) -> AirtableBase:
+        """
+        Get base schema including tables and fields (ids, names, types).
+        
+        Cached like ``list_bases``; a stale copy is returned if the meta API fails.
+        """
+        cache = get_airtable_schema_cache()
+        cached = None if refresh else cache.get(schema_key(base_id))
+        if cached is not None:
+            return AirtableBase(**cached)
+        
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting schema for base: {base_id}",
+                operation="get_base_schema",
                 resource_id=base_id
-            )
-            
-            data = await self._make_request('GET', f'/meta/bases/{base_id}/tables')
-            
-            tables = []
-            for table_data in data.get('tables', []):
-                table = AirtableTable(
-                    id=table_data['id'],
-                    name=table_data['name'],
-                    primary_field_id=table_data.get('primaryFieldId'),
-                    fields=table_data.get('fields', [])
+            ) as span:
+                data = await self._make_request('GET', f'/meta/bases/{base_id}/tables')
+                
+                tables = []
+                for table_data in data.get('tables', []):
+                    table = AirtableTable(
+                        id=table_data['id'],
+                        name=table_data['name'],
+                        primary_field_id=table_data.get('primaryFieldId'),
+                        fields=table_data.get('fields', [])
+                    )
+                    tables.append(table)
+                
+                base = AirtableBase(
+                    id=base_id,
+                    name=data.get('name', base_id),
+                    permission_level="read",  # Default
+                    tables=tables
                 )
-                tables.append(table)
-            
-            base = AirtableBase(
-                id=base_id,
-                name=data.get('name', base_id),
-                permission_level="read",  # Default
-                tables=tables
-            )
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved schema with {len(tables)} tables",
-                resource_id=base_id,
-                details={"tables_count": len(tables)}
-            )
-            
-            return base
+                cache.set(schema_key(base_id), base.dict())
+
+                span.update(
+                    description=f"Retrieved schema with {len(tables)} tables",
+                    details={"tables_count": len(tables)}
+                )
+                
+                return base
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get base schema",
-                resource_id=base_id,
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="AirtableService.get_base_schema")
+            stale = None if refresh else cache.get(schema_key(base_id), allow_stale=True)
+            if stale is not None:
+                return AirtableBase(**stale)
             raise
     
+    async def get_table(self, base_id: str, table: str, agent_name: str = "AirtableService") -> Optional[AirtableTable]:
+        """Look up a table by id or name in the (cached) base schema."""
+        schema = await self.get_base_schema(base_id, agent_name=agent_name)
+        for candidate in schema.tables:
+            if table in (candidate.id, candidate.name):
+                return candidate
+        return None
+    
+    async def get_field(
+        self,
+        base_id: str,
+        table: str,
+        field: str,
+        agent_name: str = "AirtableService"
+    ) -> Optional[Dict[str, Any]]:
+        """Field metadata ({id, name, type, options}) by field id or name, from the cached schema."""
+        table_meta = await self.get_table(base_id, table, agent_name=agent_name)
+        if table_meta is None:
+            return None
+        for candidate in table_meta.fields:
+            if field in (candidate.get('id'), candidate.get('name')):
+                return candidate
+        return None
+    
+    def invalidate_schema(self, base_id: Optional[str] = None) -> None:
+        """Forget cached metadata for one base (or all bases) after a schema change."""
+        get_airtable_schema_cache().invalidate(base_id)
+    
     async def list_records(
         self, 
         base_id: str, 
@@ -189,57 +513,61 @@ class AirtableService:
         max_records: int = 100,
         view: Optional[str] = None,
         filter_formula: Optional[str] = None,
-        agent_name: str = "AirtableService"
+        agent_name: str = "AirtableService",
+        freshness: Optional[Union[str, float]] = None
     ) -> List[AirtableRecord]:
-        """List records from a table."""
+        """
+        List records from a table.
+        
+        Reads without a view or formula can be served from the local mirror;
+        see ``_max_mirror_age`` for ``freshness``.
+        """
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Listing records from table: {table_id}",
+                operation="list_records",
                 resource_id=f"{base_id}/{table_id}",
                 details={"max_records": max_records, "view": view, "filter": filter_formula}
-            )
-            
-            params = {"maxRecords": max_records}
-            if view:
-                params["view"] = view
-            if filter_formula:
-                params["filterByFormula"] = filter_formula
-            
-            data = await self._make_request('GET', f'/{base_id}/{table_id}', params=params)
-            
-            records = []
-            for record_data in data.get('records', []):
-                record = AirtableRecord(
-                    id=record_data['id'],
-                    fields=record_data.get('fields', {}),
-                    created_time=record_data.get('createdTime')
+            ) as span:
+                if not view and not filter_formula and await self._read_from_mirror(
+                    base_id, table_id, freshness, agent_name
+                ):
+                    rows = await self._mirror_call(self.mirror.read_records, base_id, table_id, limit=max_records)
+                    records = self._to_records(rows)
+                    span.update(
+                        description=f"Retrieved {len(records)} records from mirror of table: {table_id}",
+                        details={"records_count": len(records), "source": "mirror"}
+                    )
+                    return records
+                
+                records = []
+                async for record_data in self.iter_records(
+                    base_id,
+                    table_id,
+                    max_records=max_records,
+                    view=view,
+                    filter_formula=filter_formula,
+                    freshness="live",
+                    agent_name=agent_name
+                ):
+                    record = AirtableRecord(
+                        id=record_data['id'],
+                        fields=record_data.get('fields', {}),
+                        created_time=record_data.get('createdTime')
+                    )
+                    records.append(record)
+                
+                span.update(
+                    description=f"Retrieved {len(records)} records from table: {table_id}",
+                    details={"records_count": len(records)}
                 )
-                records.append(record)
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved {len(records)} records",
-                resource_id=f"{base_id}/{table_id}",
-                details={"records_count": len(records)}
-            )
-            
-            return records
+                
+                return records
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to list records",
-                resource_id=f"{base_id}/{table_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="AirtableService.list_records")
             raise
     
@@ -252,49 +580,37 @@ class AirtableService:
     ) -> AirtableRecord:
         """Create a new record in a table."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Creating record in table: {table_id}",
+                operation="create_record",
                 resource_id=f"{base_id}/{table_id}",
                 details={"fields": list(fields.keys())}
-            )
-            
-            payload = {
-                "fields": fields
-            }
-            
-            data = await self._make_request('POST', f'/{base_id}/{table_id}', json=payload)
-            
-            record = AirtableRecord(
-                id=data['id'],
-                fields=data.get('fields', {}),
-                created_time=data.get('createdTime')
-            )
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description=f"Successfully created record: {record.id}",
-                resource_id=f"{base_id}/{table_id}/{record.id}",
-                details={"record_id": record.id, "fields_created": list(fields.keys())}
-            )
-            
-            return record
+            ) as span:
+                payload = {
+                    "fields": fields
+                }
+                
+                data = await self._make_request('POST', f'/{base_id}/{table_id}', json=payload)
+                
+                record = AirtableRecord(
+                    id=data['id'],
+                    fields=data.get('fields', {}),
+                    created_time=data.get('createdTime')
+                )
+                await self._write_through(base_id, table_id, records=[data])
+                
+                span.update(
+                    description=f"Created record: {record.id}",
+                    resource_id=f"{base_id}/{table_id}/{record.id}",
+                    details={"record_id": record.id}
+                )
+                
+                return record
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description="Failed to create record",
-                resource_id=f"{base_id}/{table_id}",
-                success=False,
-                error_message=str(e),
-                details={"attempted_fields": list(fields.keys())}
-            )
             brebot_logger.log_error(e, context="AirtableService.create_record")
             raise
     
@@ -308,49 +624,31 @@ class AirtableService:
     ) -> AirtableRecord:
         """Update an existing record."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.UPDATE,
                 agent_name=agent_name,
                 description=f"Updating record: {record_id}",
+                operation="update_record",
                 resource_id=f"{base_id}/{table_id}/{record_id}",
                 details={"fields_updated": list(fields.keys())}
-            )
-            
-            payload = {
-                "fields": fields
-            }
-            
-            data = await self._make_request('PATCH', f'/{base_id}/{table_id}/{record_id}', json=payload)
-            
-            record = AirtableRecord(
-                id=data['id'],
-                fields=data.get('fields', {}),
-                created_time=data.get('createdTime')
-            )
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description=f"Successfully updated record",
-                resource_id=f"{base_id}/{table_id}/{record_id}",
-                details={"fields_updated": list(fields.keys())}
-            )
-            
-            return record
+            ):
+                payload = {
+                    "fields": fields
+                }
+                
+                data = await self._make_request('PATCH', f'/{base_id}/{table_id}/{record_id}', json=payload)
+                
+                record = AirtableRecord(
+                    id=data['id'],
+                    fields=data.get('fields', {}),
+                    created_time=data.get('createdTime')
+                )
+                await self._write_through(base_id, table_id, records=[data])
+                
+                return record
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description="Failed to update record",
-                resource_id=f"{base_id}/{table_id}/{record_id}",
-                success=False,
-                error_message=str(e),
-                details={"attempted_fields": list(fields.keys())}
-            )
             brebot_logger.log_error(e, context="AirtableService.update_record")
             raise
     
@@ -363,39 +661,107 @@ class AirtableService:
     ) -> bool:
         """Delete a record from a table."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.DELETE,
                 agent_name=agent_name,
                 description=f"Deleting record: {record_id}",
+                operation="delete_record",
                 resource_id=f"{base_id}/{table_id}/{record_id}"
-            )
-            
-            await self._make_request('DELETE', f'/{base_id}/{table_id}/{record_id}')
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description=f"Successfully deleted record",
-                resource_id=f"{base_id}/{table_id}/{record_id}"
-            )
-            
-            return True
+            ):
+                await self._make_request('DELETE', f'/{base_id}/{table_id}/{record_id}')
+                await self._write_through(base_id, table_id, deleted_ids=[record_id])
+                
+                return True
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description="Failed to delete record",
-                resource_id=f"{base_id}/{table_id}/{record_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="AirtableService.delete_record")
             raise
     
+    @staticmethod
+    def _batch_retryable(error: Exception, idempotent: bool) -> bool:
+        """
+        Whether a failed sub-batch may be resent.
+        
+        Rate limiting, refused connections and an open circuit mean nothing was
+        written, so any batch can be resent. Timeouts and 5xx errors might have
+        been applied, so only idempotent writes (updates, upserts) are resent.
+        """
+        if isinstance(error, CircuitOpenError):
+            return True
+        status = getattr(error, 'status_code', None)
+        cause = error.__cause__
+        if status == 429 or isinstance(cause, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        if not idempotent:
+            return False
+        return (status is not None and status >= 500) or (status is None and isinstance(cause, httpx.TransportError))
+    
+    async def _run_batches(
+        self,
+        method: str,
+        base_id: str,
+        table_id: str,
+        records: List[Dict[str, Any]],
+        idempotent: bool,
+        extra_payload: Optional[Dict[str, Any]] = None,
+        span=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Write records in sub-batches of 10, several requests in flight at once.
+        
+        Up to AIRTABLE_BATCH_CONCURRENCY requests overlap while the shared
+        rate limiter paces them. Sub-batches that fail with a retryable error
+        are resent (alone) up to AIRTABLE_BATCH_RETRIES times. Returns the
+        raw records Airtable sent back, in input order; raises
+        ``AirtableBatchError`` listing any sub-batches that still failed.
+        """
+        # Airtable allows max 10 records per request
+        batch_size = 10
+        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batches)
+        errors: Dict[int, Exception] = {}
+        semaphore = asyncio.Semaphore(max(1, settings.airtable_batch_concurrency))
+        endpoint = f'/{base_id}/{table_id}'
+        
+        async def send(index: int) -> None:
+            payload = dict(extra_payload or {})
+            payload["records"] = batches[index]
+            async with semaphore:
+                try:
+                    results[index] = await self._make_request(method, endpoint, json=payload)
+                    errors.pop(index, None)
+                except Exception as e:
+                    errors[index] = e
+            if span is not None:
+                span.update(details={"batches_done": sum(result is not None for result in results)})
+        
+        pending = list(range(len(batches)))
+        for attempt in range(settings.airtable_batch_retries + 1):
+            await asyncio.gather(*(send(index) for index in pending))
+            pending = [index for index, error in errors.items() if self._batch_retryable(error, idempotent)]
+            if not pending or attempt == settings.airtable_batch_retries:
+                break
+            delay = backoff_delay(attempt)
+            brebot_logger.log_agent_action(
+                agent_name="AirtableService",
+                action="batch_retry",
+                details={"table": endpoint, "failed_batches": len(pending), "attempt": attempt + 1, "delay": round(delay, 3)}
+            )
+            await asyncio.sleep(delay)
+        
+        written = [record for result in results if result is not None for record in result.get('records', [])]
+        await self._write_through(base_id, table_id, records=written)
+        
+        if errors:
+            failed = [{"records": batches[index], "error": str(errors[index])} for index in sorted(errors)]
+            raise AirtableBatchError(
+                f"{len(failed)} of {len(batches)} Airtable batches failed: {failed[0]['error']}",
+                records=written,
+                failed=failed
+            ) from errors[min(errors)]
+        return written
+    
     async def batch_create_records(
         self, 
         base_id: str, 
@@ -403,122 +769,195 @@ class AirtableService:
         records_data: List[Dict[str, Any]],
         agent_name: str = "AirtableService"
     ) -> List[AirtableRecord]:
-        """Create multiple records in a single batch operation."""
+        """Create multiple records in batches of 10, several requests in flight at once."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Batch creating {len(records_data)} records",
+                operation="batch_create_records",
                 resource_id=f"{base_id}/{table_id}",
                 details={"batch_size": len(records_data)}
-            )
-            
-            # Airtable allows max 10 records per batch
-            batch_size = 10
-            all_records = []
-            
-            for i in range(0, len(records_data), batch_size):
-                batch = records_data[i:i + batch_size]
-                payload = {
-                    "records": [{"fields": record_fields} for record_fields in batch]
-                }
+            ) as span:
+                created = await self._run_batches(
+                    'POST',
+                    base_id,
+                    table_id,
+                    [{"fields": record_fields} for record_fields in records_data],
+                    idempotent=False,
+                    span=span
+                )
+                all_records = self._to_records(created)
                 
-                data = await self._make_request('POST', f'/{base_id}/{table_id}', json=payload)
+                span.update(
+                    description=f"Batch created {len(all_records)} records",
+                    details={"records_created": len(all_records)}
+                )
                 
-                for record_data in data.get('records', []):
-                    record = AirtableRecord(
-                        id=record_data['id'],
-                        fields=record_data.get('fields', {}),
-                        created_time=record_data.get('createdTime')
-                    )
-                    all_records.append(record)
-            
-            await log_platform_activity(
+                return all_records
+        
+        except Exception as e:
+            brebot_logger.log_error(e, context="AirtableService.batch_create_records")
+            raise
+    
+    async def batch_update_records(
+        self,
+        base_id: str,
+        table_id: str,
+        records_data: List[Dict[str, Any]],
+        agent_name: str = "AirtableService"
+    ) -> List[AirtableRecord]:
+        """
+        Update many records; each item is {"id": ..., "fields": {...}}.
+        
+        Only the given fields change (PATCH semantics).
+        """
+        try:
+            async with platform_span(
                 platform=Platform.AIRTABLE,
-                activity_type=ActivityType.CREATE,
+                activity_type=ActivityType.UPDATE,
                 agent_name=agent_name,
-                description=f"Successfully batch created {len(all_records)} records",
+                description=f"Batch updating {len(records_data)} records",
+                operation="batch_update_records",
                 resource_id=f"{base_id}/{table_id}",
-                details={"records_created": len(all_records)}
-            )
-            
-            return all_records
-            
+                details={"batch_size": len(records_data)}
+            ) as span:
+                updated = await self._run_batches(
+                    'PATCH',
+                    base_id,
+                    table_id,
+                    [{"id": record['id'], "fields": record['fields']} for record in records_data],
+                    idempotent=True,
+                    span=span
+                )
+                all_records = self._to_records(updated)
+                
+                span.update(
+                    description=f"Batch updated {len(all_records)} records",
+                    details={"records_updated": len(all_records)}
+                )
+                
+                return all_records
+        
         except Exception as e:
-            await log_platform_activity(
+            brebot_logger.log_error(e, context="AirtableService.batch_update_records")
+            raise
+    
+    async def batch_upsert_records(
+        self,
+        base_id: str,
+        table_id: str,
+        records_data: List[Dict[str, Any]],
+        merge_on: List[str],
+        typecast: bool = False,
+        agent_name: str = "AirtableService"
+    ) -> List[AirtableRecord]:
+        """
+        Create or update records matched on ``merge_on`` fields (Airtable performUpsert).
+        
+        ``records_data`` holds field dicts; a record whose ``merge_on`` values
+        match an existing row updates it, otherwise a new row is created.
+        """
+        try:
+            async with platform_span(
                 platform=Platform.AIRTABLE,
-                activity_type=ActivityType.CREATE,
+                activity_type=ActivityType.UPDATE,
                 agent_name=agent_name,
-                description="Failed to batch create records",
+                description=f"Batch upserting {len(records_data)} records",
+                operation="batch_upsert_records",
                 resource_id=f"{base_id}/{table_id}",
-                success=False,
-                error_message=str(e),
-                details={"attempted_batch_size": len(records_data)}
-            )
-            brebot_logger.log_error(e, context="AirtableService.batch_create_records")
+                details={"batch_size": len(records_data), "merge_on": merge_on}
+            ) as span:
+                extra_payload: Dict[str, Any] = {"performUpsert": {"fieldsToMergeOn": merge_on}}
+                if typecast:
+                    extra_payload["typecast"] = True
+                
+                upserted = await self._run_batches(
+                    'PATCH',
+                    base_id,
+                    table_id,
+                    [{"fields": record_fields} for record_fields in records_data],
+                    idempotent=True,
+                    extra_payload=extra_payload,
+                    span=span
+                )
+                all_records = self._to_records(upserted)
+                
+                span.update(
+                    description=f"Batch upserted {len(all_records)} records",
+                    details={"records_upserted": len(all_records)}
+                )
+                
+                return all_records
+        
+        except Exception as e:
+            brebot_logger.log_error(e, context="AirtableService.batch_upsert_records")
             raise
-    
+
     async def search_records(
         self, 
         base_id: str, 
         table_id: str, 
         search_term: str,
         search_fields: Optional[List[str]] = None,
-        agent_name: str = "AirtableService"
+        agent_name: str = "AirtableService",
+        freshness: Optional[Union[str, float]] = None
     ) -> List[AirtableRecord]:
         """Search for records containing a specific term."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Searching records for: {search_term}",
+                operation="search_records",
                 resource_id=f"{base_id}/{table_id}",
                 details={"search_term": search_term, "search_fields": search_fields}
-            )
-            
-            # Build filter formula for search
-            if search_fields:
-                # Search in specific fields
-                field_conditions = []
-                for field in search_fields:
-                    field_conditions.append(f"FIND(LOWER('{search_term}'), LOWER(CONCATENATE({{{field}}}, '')))")
-                filter_formula = f"OR({', '.join(field_conditions)})"
-            else:
-                # Search in all text fields (simplified approach)
-                filter_formula = f"SEARCH(LOWER('{search_term}'), LOWER(CONCATENATE(RECORD_ID(), ' ')))"
-            
-            records = await self.list_records(
-                base_id=base_id,
-                table_id=table_id,
-                filter_formula=filter_formula,
-                max_records=100,
-                agent_name=agent_name
-            )
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Search found {len(records)} matching records",
-                resource_id=f"{base_id}/{table_id}",
-                details={"search_term": search_term, "results_count": len(records)}
-            )
-            
-            return records
+            ) as span:
+                if await self._read_from_mirror(base_id, table_id, freshness, agent_name):
+                    rows = await self._mirror_call(
+                        self.mirror.read_records,
+                        base_id,
+                        table_id,
+                        limit=100,
+                        search_term=search_term,
+                        search_fields=search_fields
+                    )
+                    records = self._to_records(rows)
+                    span.update(
+                        description=f"Search found {len(records)} matching records in mirror",
+                        details={"results_count": len(records), "source": "mirror"}
+                    )
+                    return records
+                
+                # Build filter formula for search
+                if search_fields:
+                    # Search in specific fields
+                    field_conditions = []
+                    for field in search_fields:
+                        field_conditions.append(f"FIND(LOWER('{search_term}'), LOWER(CONCATENATE({{{field}}}, '')))")
+                    filter_formula = f"OR({', '.join(field_conditions)})"
+                else:
+                    # Search in all text fields (simplified approach)
+                    filter_formula = f"SEARCH(LOWER('{search_term}'), LOWER(CONCATENATE(RECORD_ID(), ' ')))"
+                
+                records = await self.list_records(
+                    base_id=base_id,
+                    table_id=table_id,
+                    filter_formula=filter_formula,
+                    max_records=100,
+                    agent_name=agent_name
+                )
+                
+                span.update(
+                    description=f"Search found {len(records)} matching records",
+                    details={"results_count": len(records)}
+                )
+                
+                return records
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Search failed",
-                resource_id=f"{base_id}/{table_id}",
-                success=False,
-                error_message=str(e),
-                details={"search_term": search_term}
-            )
             brebot_logger.log_error(e, context="AirtableService.search_records")
             raise
     
@@ -527,104 +966,97 @@ class AirtableService:
         base_id: str, 
         table_id: str,
         format_type: str = "json",
-        agent_name: str = "AirtableService"
+        agent_name: str = "AirtableService",
+        freshness: Optional[Union[str, float]] = None
     ) -> str:
-        """Export all data from a table."""
+        """
+        Export all data from a table to exports/ as json, jsonl or csv.
+        
+        Records are streamed from ``iter_records`` to the file page by page,
+        so memory use does not grow with the table size.
+        """
         try:
-            await log_platform_activity(
+            if format_type not in ("json", "jsonl", "csv"):
+                raise ValueError(f"Unsupported export format: {format_type}")
+            
+            async with platform_span(
                 platform=Platform.AIRTABLE,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Exporting table data in {format_type} format",
+                operation="export_table_data",
                 resource_id=f"{base_id}/{table_id}",
                 details={"format": format_type}
-            )
-            
-            # Get all records (with pagination)
-            all_records = []
-            offset = None
-            
-            while True:
-                params = {"maxRecords": 100}
-                if offset:
-                    params["offset"] = offset
+            ) as span:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"airtable_export_{base_id}_{table_id}_{timestamp}.{format_type}"
+                filepath = f"exports/{filename}"
                 
-                data = await self._make_request('GET', f'/{base_id}/{table_id}', params=params)
+                # Ensure exports directory exists
+                import os
+                os.makedirs("exports", exist_ok=True)
                 
-                for record_data in data.get('records', []):
-                    record = AirtableRecord(
-                        id=record_data['id'],
-                        fields=record_data.get('fields', {}),
-                        created_time=record_data.get('createdTime')
-                    )
-                    all_records.append(record)
+                records = self.iter_records(base_id, table_id, freshness=freshness, agent_name=agent_name)
+                exported = 0
                 
-                offset = data.get('offset')
-                if not offset:
-                    break
-            
-            # Save to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"airtable_export_{base_id}_{table_id}_{timestamp}.{format_type}"
-            filepath = f"exports/{filename}"
-            
-            # Ensure exports directory exists
-            import os
-            os.makedirs("exports", exist_ok=True)
-            
-            if format_type == "json":
-                data_to_export = [record.dict() for record in all_records]
-                with open(filepath, 'w') as f:
-                    json.dump(data_to_export, f, indent=2, default=str)
-            elif format_type == "csv":
-                import csv
-                if all_records:
-                    # Get all unique field names
-                    all_fields = set()
-                    for record in all_records:
-                        all_fields.update(record.fields.keys())
-                    
-                    with open(filepath, 'w', newline='') as f:
-                        writer = csv.writer(f)
-                        # Write header
-                        writer.writerow(['id', 'created_time'] + list(all_fields))
+                if format_type in ("json", "jsonl"):
+                    with open(filepath, 'w') as f:
+                        if format_type == "json":
+                            f.write("[")
+                        async for record_data in records:
+                            row = json.dumps({
+                                "id": record_data['id'],
+                                "fields": record_data.get('fields', {}),
+                                "created_time": record_data.get('createdTime')
+                            }, default=str)
+                            if format_type == "json":
+                                f.write(("," if exported else "") + "\n  " + row)
+                            else:
+                                f.write(row + "\n")
+                            exported += 1
+                        if format_type == "json":
+                            f.write("\n]\n" if exported else "]\n")
+                elif format_type == "csv":
+                    import csv
+                    import tempfile
+                    # The header needs every field name, so rows are spooled to a
+                    # temporary file while the names are collected
+                    all_fields: Dict[str, None] = {}
+                    with tempfile.TemporaryFile('w+') as spool:
+                        async for record_data in records:
+                            all_fields.update(dict.fromkeys(record_data.get('fields', {})))
+                            spool.write(json.dumps(record_data, default=str) + "\n")
+                            exported += 1
+                        spool.seek(0)
                         
-                        # Write data
-                        for record in all_records:
-                            row = [record.id, record.created_time]
-                            for field in all_fields:
-                                value = record.fields.get(field, '')
-                                # Convert complex values to JSON strings
-                                if isinstance(value, (dict, list)):
-                                    value = json.dumps(value)
-                                row.append(value)
-                            writer.writerow(row)
-            
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully exported {len(all_records)} records to {filepath}",
-                resource_id=f"{base_id}/{table_id}",
-                details={"records_exported": len(all_records), "file_path": filepath}
-            )
-            
-            return filepath
-            
+                        with open(filepath, 'w', newline='') as f:
+                            writer = csv.writer(f)
+                            # Write header
+                            writer.writerow(['id', 'created_time'] + list(all_fields))
+                            
+                            # Write data
+                            for line in spool:
+                                record_data = json.loads(line)
+                                row = [record_data['id'], record_data.get('createdTime')]
+                                for field in all_fields:
+                                    value = record_data.get('fields', {}).get(field, '')
+                                    # Convert complex values to JSON strings
+                                    if isinstance(value, (dict, list)):
+                                        value = json.dumps(value)
+                                    row.append(value)
+                                writer.writerow(row)
+                
+                span.update(
+                    description=f"Exported {exported} records to {filepath}",
+                    details={"records_exported": exported, "file_path": filepath}
+                )
+                
+                return filepath
+        
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.AIRTABLE,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Export failed",
-                resource_id=f"{base_id}/{table_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="AirtableService.export_table_data")
             raise
 
-
 # Global Airtable service instance
 airtable_service: Optional[AirtableService] = None
 
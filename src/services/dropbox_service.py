@@ -12,11 +12,16 @@ import hashlib
 from pathlib import Path
 
 import dropbox
-from dropbox.exceptions import AuthError, ApiError
+from dropbox.exceptions import AuthError, ApiError, InternalServerError
+import requests
 from pydantic import BaseModel
 
 from utils.logger import brebot_logger
-from services.activity_logger import log_platform_activity, Platform, ActivityType
+from utils.circuit_breaker import get_circuit_breaker
+from services.activity_logger import platform_span, Platform, ActivityType
+
+# SDK errors that mean Dropbox itself is unreachable or failing (trip the breaker)
+DROPBOX_OUTAGE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, InternalServerError)
 
 
 class DropboxFile(BaseModel):
@@ -49,40 +54,48 @@ class DropboxService:
             details={"has_token": bool(access_token)}
         )
     
+    async def _run_sync(self, func, *args):
+        """Run a blocking SDK call in the thread pool behind the Dropbox circuit breaker."""
+        breaker = get_circuit_breaker("dropbox")
+        breaker.allow()
+        loop = asyncio.get_event_loop()
+        try:
+            result = await loop.run_in_executor(None, func, *args)
+        except DROPBOX_OUTAGE_ERRORS as e:
+            breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except Exception:
+            # API-level errors (missing path, conflicts) mean Dropbox answered
+            breaker.record_success()
+            raise
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+        breaker.record_success()
+        return result
+    
     async def list_files(self, path: str = "", recursive: bool = False, agent_name: str = "DropboxService") -> List[DropboxFile]:
         """List files and folders in Dropbox."""
         try:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Listing files in path: {path or '/'}"
-            )
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._list_files_sync, path, recursive)
-            
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
-                description=f"Successfully listed {len(result)} items",
-                details={"path": path, "count": len(result), "recursive": recursive}
-            )
-            
-            return result
+                description=f"Listing files in path: {path or '/'}",
+                operation="list_files",
+                details={"path": path, "recursive": recursive}
+            ) as span:
+                # Run in thread pool to avoid blocking
+                result = await self._run_sync(self._list_files_sync, path, recursive)
+                
+                span.update(
+                    description=f"Listed {len(result)} items",
+                    details={"count": len(result)}
+                )
+                
+                return result
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to list files",
-                success=False,
-                error_message=str(e),
-                details={"path": path}
-            )
             brebot_logger.log_error(e, context="DropboxService.list_files")
             raise
     
@@ -146,51 +159,37 @@ class DropboxService:
     async def download_file(self, dropbox_path: str, local_path: Optional[str] = None, agent_name: str = "DropboxService") -> str:
         """Download a file from Dropbox."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.DOWNLOAD,
                 agent_name=agent_name,
-                description=f"Starting download: {dropbox_path}",
+                description=f"Downloading: {dropbox_path}",
+                operation="download_file",
                 resource_path=dropbox_path
-            )
-            
-            # Ensure path starts with /
-            if not dropbox_path.startswith('/'):
-                dropbox_path = f'/{dropbox_path}'
-            
-            # Generate local path if not provided
-            if not local_path:
-                local_path = f"downloads/dropbox{dropbox_path}"
-            
-            # Ensure local directory exists
-            Path(local_path).parent.mkdir(parents=True, exist_ok=True)
-            
-            # Run download in thread pool
-            loop = asyncio.get_event_loop()
-            file_size = await loop.run_in_executor(None, self._download_file_sync, dropbox_path, local_path)
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.DOWNLOAD,
-                agent_name=agent_name,
-                description=f"Successfully downloaded file to {local_path}",
-                resource_path=dropbox_path,
-                data_size=file_size,
-                details={"local_path": local_path}
-            )
-            
-            return local_path
+            ) as span:
+                # Ensure path starts with /
+                if not dropbox_path.startswith('/'):
+                    dropbox_path = f'/{dropbox_path}'
+                
+                # Generate local path if not provided
+                if not local_path:
+                    local_path = f"downloads/dropbox{dropbox_path}"
+                
+                # Ensure local directory exists
+                Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+                
+                # Run download in thread pool
+                file_size = await self._run_sync(self._download_file_sync, dropbox_path, local_path)
+                
+                span.add_bytes(file_size)
+                span.update(
+                    description=f"Downloaded file to {local_path}",
+                    details={"local_path": local_path}
+                )
+                
+                return local_path
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.DOWNLOAD,
-                agent_name=agent_name,
-                description="Failed to download file",
-                resource_path=dropbox_path,
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="DropboxService.download_file")
             raise
     
@@ -210,58 +209,40 @@ class DropboxService:
     async def upload_file(self, local_path: str, dropbox_path: str, overwrite: bool = True, agent_name: str = "DropboxService") -> DropboxFile:
         """Upload a file to Dropbox."""
         try:
-            # Get file size for logging
-            file_size = Path(local_path).stat().st_size
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.UPLOAD,
-                agent_name=agent_name,
-                description=f"Starting upload: {local_path} -> {dropbox_path}",
-                resource_path=dropbox_path,
-                data_size=file_size
-            )
-            
-            # Ensure dropbox path starts with /
-            if not dropbox_path.startswith('/'):
-                dropbox_path = f'/{dropbox_path}'
-            
-            # Run upload in thread pool
-            loop = asyncio.get_event_loop()
-            metadata = await loop.run_in_executor(None, self._upload_file_sync, local_path, dropbox_path, overwrite)
-            
-            dropbox_file = DropboxFile(
-                path=metadata.path_display,
-                name=metadata.name,
-                size=metadata.size,
-                modified=metadata.client_modified.isoformat(),
-                is_folder=False,
-                content_hash=metadata.content_hash
-            )
-            
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.UPLOAD,
                 agent_name=agent_name,
-                description=f"Successfully uploaded file",
+                description=f"Uploading: {local_path} -> {dropbox_path}",
+                operation="upload_file",
                 resource_path=dropbox_path,
-                data_size=file_size,
                 details={"local_path": local_path, "overwrite": overwrite}
-            )
-            
-            return dropbox_file
+            ) as span:
+                # Get file size for logging
+                file_size = Path(local_path).stat().st_size
+                
+                # Ensure dropbox path starts with /
+                if not dropbox_path.startswith('/'):
+                    dropbox_path = f'/{dropbox_path}'
+                
+                # Run upload in thread pool
+                metadata = await self._run_sync(self._upload_file_sync, local_path, dropbox_path, overwrite)
+                
+                dropbox_file = DropboxFile(
+                    path=metadata.path_display,
+                    name=metadata.name,
+                    size=metadata.size,
+                    modified=metadata.client_modified.isoformat(),
+                    is_folder=False,
+                    content_hash=metadata.content_hash
+                )
+                
+                span.add_bytes(file_size)
+                span.update(description=f"Uploaded file to {dropbox_file.path}")
+                
+                return dropbox_file
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.UPLOAD,
-                agent_name=agent_name,
-                description="Failed to upload file",
-                resource_path=dropbox_path,
-                success=False,
-                error_message=str(e),
-                details={"local_path": local_path}
-            )
             brebot_logger.log_error(e, context="DropboxService.upload_file")
             raise
     
@@ -300,49 +281,31 @@ class DropboxService:
     async def create_folder(self, path: str, agent_name: str = "DropboxService") -> DropboxFile:
         """Create a new folder in Dropbox."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Creating folder: {path}",
+                operation="create_folder",
                 resource_path=path
-            )
-            
-            # Ensure path starts with /
-            if not path.startswith('/'):
-                path = f'/{path}'
-            
-            loop = asyncio.get_event_loop()
-            metadata = await loop.run_in_executor(None, self._create_folder_sync, path)
-            
-            folder = DropboxFile(
-                path=metadata.path_display,
-                name=metadata.name,
-                size=0,
-                modified="",
-                is_folder=True
-            )
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description=f"Successfully created folder",
-                resource_path=path
-            )
-            
-            return folder
+            ):
+                # Ensure path starts with /
+                if not path.startswith('/'):
+                    path = f'/{path}'
+                
+                metadata = await self._run_sync(self._create_folder_sync, path)
+                
+                folder = DropboxFile(
+                    path=metadata.path_display,
+                    name=metadata.name,
+                    size=0,
+                    modified="",
+                    is_folder=True
+                )
+                
+                return folder
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description="Failed to create folder",
-                resource_path=path,
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="DropboxService.create_folder")
             raise
     
@@ -356,41 +319,23 @@ class DropboxService:
     async def delete_file(self, path: str, agent_name: str = "DropboxService") -> bool:
         """Delete a file or folder from Dropbox."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.DELETE,
                 agent_name=agent_name,
                 description=f"Deleting: {path}",
+                operation="delete_file",
                 resource_path=path
-            )
-            
-            # Ensure path starts with /
-            if not path.startswith('/'):
-                path = f'/{path}'
-            
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._delete_file_sync, path)
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description=f"Successfully deleted",
-                resource_path=path
-            )
-            
-            return True
+            ):
+                # Ensure path starts with /
+                if not path.startswith('/'):
+                    path = f'/{path}'
+                
+                await self._run_sync(self._delete_file_sync, path)
+                
+                return True
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description="Failed to delete",
-                resource_path=path,
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="DropboxService.delete_file")
             raise
     
@@ -404,42 +349,25 @@ class DropboxService:
     async def create_shared_link(self, path: str, agent_name: str = "DropboxService") -> str:
         """Create a shared link for a file or folder."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Creating shared link for: {path}",
+                operation="create_shared_link",
                 resource_path=path
-            )
-            
-            # Ensure path starts with /
-            if not path.startswith('/'):
-                path = f'/{path}'
-            
-            loop = asyncio.get_event_loop()
-            link = await loop.run_in_executor(None, self._create_shared_link_sync, path)
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description=f"Successfully created shared link",
-                resource_path=path,
-                details={"shared_link": link}
-            )
-            
-            return link
+            ) as span:
+                # Ensure path starts with /
+                if not path.startswith('/'):
+                    path = f'/{path}'
+                
+                link = await self._run_sync(self._create_shared_link_sync, path)
+                
+                span.update(details={"shared_link": link})
+                
+                return link
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description="Failed to create shared link",
-                resource_path=path,
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="DropboxService.create_shared_link")
             raise
     
@@ -467,41 +395,28 @@ class DropboxService:
     async def search_files(self, query: str, path: str = "", agent_name: str = "DropboxService") -> List[DropboxFile]:
         """Search for files in Dropbox."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Searching for: {query}",
+                operation="search_files",
                 details={"query": query, "path": path}
-            )
-            
-            # Ensure path starts with /
-            if path and not path.startswith('/'):
-                path = f'/{path}'
-            
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(None, self._search_files_sync, query, path)
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Found {len(results)} files matching search",
-                details={"query": query, "results_count": len(results)}
-            )
-            
-            return results
+            ) as span:
+                # Ensure path starts with /
+                if path and not path.startswith('/'):
+                    path = f'/{path}'
+                
+                results = await self._run_sync(self._search_files_sync, query, path)
+                
+                span.update(
+                    description=f"Found {len(results)} files matching search",
+                    details={"results_count": len(results)}
+                )
+                
+                return results
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Search failed",
-                success=False,
-                error_message=str(e),
-                details={"query": query}
-            )
             brebot_logger.log_error(e, context="DropboxService.search_files")
             raise
     
@@ -544,35 +459,20 @@ class DropboxService:
     async def get_account_info(self, agent_name: str = "DropboxService") -> Dict[str, Any]:
         """Get Dropbox account information."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.DROPBOX,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
-                description="Getting account information"
-            )
-            
-            loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(None, self._get_account_info_sync)
-            
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Successfully retrieved account information",
-                details={"account_id": info.get("account_id")}
-            )
-            
-            return info
+                description="Getting account information",
+                operation="get_account_info"
+            ) as span:
+                info = await self._run_sync(self._get_account_info_sync)
+                
+                span.update(details={"account_id": info.get("account_id")})
+                
+                return info
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.DROPBOX,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get account information",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="DropboxService.get_account_info")
             raise
     
@@ -12,7 +12,9 @@ import httpx
 from pydantic import BaseModel
 
 from utils.logger import brebot_logger
-from services.activity_logger import log_platform_activity, Platform, ActivityType
+from utils import tracing
+from utils import http_clients
+from services.activity_logger import platform_span, record_bytes, Platform, ActivityType
 
 
 class EtsyListing(BaseModel):
@@ -134,15 +136,19 @@ class EtsyService:
         """Make HTTP request to Etsy API."""
         url = f"{self.base_url}{endpoint}"
         
-        async with httpx.AsyncClient() as client:
+        async with tracing.child_span("etsy.request", method=method, endpoint=endpoint) as span:
             try:
-                response = await client.request(
-                    method=method,
-                    url=url,
+                response = await http_clients.request(
+                    "etsy",
+                    method,
+                    url,
+                    credential=self.api_key,
                     headers=self.headers,
-                    timeout=30.0,
                     **kwargs
                 )
+                if span is not None:
+                    span.set_attributes(status=response.status_code, bytes=len(response.content))
+                record_bytes(http_clients.payload_size(response))
                 response.raise_for_status()
                 return response.json()
                 
@@ -161,39 +167,27 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting shop info for shop: {target_shop_id}",
+                operation="get_shop_info",
                 resource_id=str(target_shop_id)
-            )
-            
-            data = await self._make_request('GET', f'/application/shops/{target_shop_id}')
-            
-            shop = EtsyShop(**data)
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved shop info: {shop.shop_name}",
-                resource_id=str(target_shop_id),
-                details={"shop_name": shop.shop_name, "listing_count": shop.listing_active_count}
-            )
-            
-            return shop
+            ) as span:
+                data = await self._make_request('GET', f'/application/shops/{target_shop_id}')
+                
+                shop = EtsyShop(**data)
+                
+                span.update(
+                    description=f"Retrieved shop info: {shop.shop_name}",
+                    resource_id=str(target_shop_id),
+                    details={"shop_name": shop.shop_name, "listing_count": shop.listing_active_count}
+                )
+                
+                return shop
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get shop info",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="EtsyService.get_shop_info")
             raise
     
@@ -211,60 +205,48 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting listings for shop: {target_shop_id}",
+                operation="get_shop_listings",
                 resource_id=str(target_shop_id),
                 details={"state": state, "limit": limit, "offset": offset}
-            )
-            
-            params = {"state": state, "limit": limit, "offset": offset}
-            data = await self._make_request('GET', f'/application/shops/{target_shop_id}/listings', params=params)
-            
-            listings = []
-            for listing_data in data.get('results', []):
-                listing = EtsyListing(
-                    listing_id=listing_data['listing_id'],
-                    title=listing_data['title'],
-                    description=listing_data.get('description', ''),
-                    state=listing_data['state'],
-                    price=listing_data['price']['amount'],
-                    currency_code=listing_data['price']['currency_code'],
-                    quantity=listing_data['quantity'],
-                    tags=listing_data.get('tags', []),
-                    materials=listing_data.get('materials', []),
-                    category_id=listing_data.get('category_id'),
-                    taxonomy_id=listing_data.get('taxonomy_id'),
-                    created_timestamp=listing_data.get('created_timestamp'),
-                    updated_timestamp=listing_data.get('updated_timestamp'),
-                    views=listing_data.get('views'),
-                    num_favorers=listing_data.get('num_favorers')
+            ) as span:
+                params = {"state": state, "limit": limit, "offset": offset}
+                data = await self._make_request('GET', f'/application/shops/{target_shop_id}/listings', params=params)
+                
+                listings = []
+                for listing_data in data.get('results', []):
+                    listing = EtsyListing(
+                        listing_id=listing_data['listing_id'],
+                        title=listing_data['title'],
+                        description=listing_data.get('description', ''),
+                        state=listing_data['state'],
+                        price=listing_data['price']['amount'],
+                        currency_code=listing_data['price']['currency_code'],
+                        quantity=listing_data['quantity'],
+                        tags=listing_data.get('tags', []),
+                        materials=listing_data.get('materials', []),
+                        category_id=listing_data.get('category_id'),
+                        taxonomy_id=listing_data.get('taxonomy_id'),
+                        created_timestamp=listing_data.get('created_timestamp'),
+                        updated_timestamp=listing_data.get('updated_timestamp'),
+                        views=listing_data.get('views'),
+                        num_favorers=listing_data.get('num_favorers')
+                    )
+                    listings.append(listing)
+                
+                span.update(
+                    description=f"Retrieved {len(listings)} listings",
+                    resource_id=str(target_shop_id),
+                    details={"listings_count": len(listings), "state": state}
                 )
-                listings.append(listing)
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved {len(listings)} listings",
-                resource_id=str(target_shop_id),
-                details={"listings_count": len(listings), "state": state}
-            )
-            
-            return listings
+                
+                return listings
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get shop listings",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="EtsyService.get_shop_listings")
             raise
     
@@ -289,68 +271,55 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Creating listing: {title}",
+                operation="create_listing",
                 resource_id=str(target_shop_id),
                 details={"title": title, "price": price, "quantity": quantity}
-            )
-            
-            payload = {
-                "quantity": quantity,
-                "title": title,
-                "description": description,
-                "price": price,
-                "who_made": who_made,
-                "when_made": when_made,
-                "taxonomy_id": taxonomy_id,
-                "tags": tags[:13],  # Etsy allows max 13 tags
-                "materials": materials[:13],  # Etsy allows max 13 materials
-                "is_supply": is_supply,
-                "state": "draft"  # Create as draft first
-            }
-            
-            data = await self._make_request('POST', f'/application/shops/{target_shop_id}/listings', json=payload)
-            
-            listing = EtsyListing(
-                listing_id=data['listing_id'],
-                title=data['title'],
-                description=data.get('description', ''),
-                state=data['state'],
-                price=data['price']['amount'],
-                currency_code=data['price']['currency_code'],
-                quantity=data['quantity'],
-                tags=data.get('tags', []),
-                materials=data.get('materials', []),
-                taxonomy_id=data.get('taxonomy_id'),
-                created_timestamp=data.get('created_timestamp'),
-                updated_timestamp=data.get('updated_timestamp')
-            )
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description=f"Successfully created listing: {listing.listing_id}",
-                resource_id=f"{target_shop_id}/{listing.listing_id}",
-                details={"listing_id": listing.listing_id, "title": title}
-            )
-            
-            return listing
+            ) as span:
+                payload = {
+                    "quantity": quantity,
+                    "title": title,
+                    "description": description,
+                    "price": price,
+                    "who_made": who_made,
+                    "when_made": when_made,
+                    "taxonomy_id": taxonomy_id,
+                    "tags": tags[:13],  # Etsy allows max 13 tags
+                    "materials": materials[:13],  # Etsy allows max 13 materials
+                    "is_supply": is_supply,
+                    "state": "draft"  # Create as draft first
+                }
+                
+                data = await self._make_request('POST', f'/application/shops/{target_shop_id}/listings', json=payload)
+                
+                listing = EtsyListing(
+                    listing_id=data['listing_id'],
+                    title=data['title'],
+                    description=data.get('description', ''),
+                    state=data['state'],
+                    price=data['price']['amount'],
+                    currency_code=data['price']['currency_code'],
+                    quantity=data['quantity'],
+                    tags=data.get('tags', []),
+                    materials=data.get('materials', []),
+                    taxonomy_id=data.get('taxonomy_id'),
+                    created_timestamp=data.get('created_timestamp'),
+                    updated_timestamp=data.get('updated_timestamp')
+                )
+                
+                span.update(
+                    description=f"Created listing: {listing.listing_id}",
+                    resource_id=f"{target_shop_id}/{listing.listing_id}",
+                    details={"listing_id": listing.listing_id, "title": title}
+                )
+                
+                return listing
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description="Failed to create listing",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e),
-                details={"title": title}
-            )
             brebot_logger.log_error(e, context="EtsyService.create_listing")
             raise
     
@@ -367,56 +336,43 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.UPDATE,
                 agent_name=agent_name,
                 description=f"Updating listing: {listing_id}",
+                operation="update_listing",
                 resource_id=f"{target_shop_id}/{listing_id}",
                 details={"updates": list(updates.keys())}
-            )
-            
-            data = await self._make_request('PATCH', f'/application/shops/{target_shop_id}/listings/{listing_id}', json=updates)
-            
-            listing = EtsyListing(
-                listing_id=data['listing_id'],
-                title=data['title'],
-                description=data.get('description', ''),
-                state=data['state'],
-                price=data['price']['amount'],
-                currency_code=data['price']['currency_code'],
-                quantity=data['quantity'],
-                tags=data.get('tags', []),
-                materials=data.get('materials', []),
-                taxonomy_id=data.get('taxonomy_id'),
-                created_timestamp=data.get('created_timestamp'),
-                updated_timestamp=data.get('updated_timestamp'),
-                views=data.get('views'),
-                num_favorers=data.get('num_favorers')
-            )
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description=f"Successfully updated listing",
-                resource_id=f"{target_shop_id}/{listing_id}",
-                details={"updates": list(updates.keys())}
-            )
-            
-            return listing
+            ) as span:
+                data = await self._make_request('PATCH', f'/application/shops/{target_shop_id}/listings/{listing_id}', json=updates)
+                
+                listing = EtsyListing(
+                    listing_id=data['listing_id'],
+                    title=data['title'],
+                    description=data.get('description', ''),
+                    state=data['state'],
+                    price=data['price']['amount'],
+                    currency_code=data['price']['currency_code'],
+                    quantity=data['quantity'],
+                    tags=data.get('tags', []),
+                    materials=data.get('materials', []),
+                    taxonomy_id=data.get('taxonomy_id'),
+                    created_timestamp=data.get('created_timestamp'),
+                    updated_timestamp=data.get('updated_timestamp'),
+                    views=data.get('views'),
+                    num_favorers=data.get('num_favorers')
+                )
+                
+                span.update(
+                    description="Updated listing",
+                    resource_id=f"{target_shop_id}/{listing_id}",
+                    details={"updates": list(updates.keys())}
+                )
+                
+                return listing
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description="Failed to update listing",
-                resource_id=f"{target_shop_id}/{listing_id}",
-                success=False,
-                error_message=str(e),
-                details={"attempted_updates": list(updates.keys())}
-            )
             brebot_logger.log_error(e, context="EtsyService.update_listing")
             raise
     
@@ -432,36 +388,24 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.DELETE,
                 agent_name=agent_name,
                 description=f"Deleting listing: {listing_id}",
+                operation="delete_listing",
                 resource_id=f"{target_shop_id}/{listing_id}"
-            )
-            
-            await self._make_request('DELETE', f'/application/shops/{target_shop_id}/listings/{listing_id}')
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description=f"Successfully deleted listing",
-                resource_id=f"{target_shop_id}/{listing_id}"
-            )
-            
-            return True
+            ) as span:
+                await self._make_request('DELETE', f'/application/shops/{target_shop_id}/listings/{listing_id}')
+                
+                span.update(
+                    description="Deleted listing",
+                    resource_id=f"{target_shop_id}/{listing_id}"
+                )
+                
+                return True
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description="Failed to delete listing",
-                resource_id=f"{target_shop_id}/{listing_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="EtsyService.delete_listing")
             raise
     
@@ -478,41 +422,29 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting receipts for shop: {target_shop_id}",
+                operation="get_shop_receipts",
                 resource_id=str(target_shop_id),
                 details={"limit": limit, "offset": offset}
-            )
-            
-            params = {"limit": limit, "offset": offset}
-            data = await self._make_request('GET', f'/application/shops/{target_shop_id}/receipts', params=params)
-            
-            receipts = data.get('results', [])
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved {len(receipts)} receipts",
-                resource_id=str(target_shop_id),
-                details={"receipts_count": len(receipts)}
-            )
-            
-            return receipts
+            ) as span:
+                params = {"limit": limit, "offset": offset}
+                data = await self._make_request('GET', f'/application/shops/{target_shop_id}/receipts', params=params)
+                
+                receipts = data.get('results', [])
+                
+                span.update(
+                    description=f"Retrieved {len(receipts)} receipts",
+                    resource_id=str(target_shop_id),
+                    details={"receipts_count": len(receipts)}
+                )
+                
+                return receipts
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get shop receipts",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="EtsyService.get_shop_receipts")
             raise
     
@@ -526,65 +458,53 @@ class EtsyService:
     ) -> List[EtsyListing]:
         """Search for listings across Etsy."""
         try:
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Searching listings for: {keywords}",
+                operation="search_listings",
                 details={"keywords": keywords, "category": category, "limit": limit}
-            )
-            
-            params = {
-                "keywords": keywords,
-                "limit": limit,
-                "offset": offset
-            }
-            if category:
-                params["category"] = category
-            
-            data = await self._make_request('GET', '/application/listings/active', params=params)
-            
-            listings = []
-            for listing_data in data.get('results', []):
-                listing = EtsyListing(
-                    listing_id=listing_data['listing_id'],
-                    title=listing_data['title'],
-                    description=listing_data.get('description', ''),
-                    state=listing_data['state'],
-                    price=listing_data['price']['amount'],
-                    currency_code=listing_data['price']['currency_code'],
-                    quantity=listing_data['quantity'],
-                    tags=listing_data.get('tags', []),
-                    materials=listing_data.get('materials', []),
-                    category_id=listing_data.get('category_id'),
-                    taxonomy_id=listing_data.get('taxonomy_id'),
-                    created_timestamp=listing_data.get('created_timestamp'),
-                    updated_timestamp=listing_data.get('updated_timestamp'),
-                    views=listing_data.get('views'),
-                    num_favorers=listing_data.get('num_favorers')
+            ) as span:
+                params = {
+                    "keywords": keywords,
+                    "limit": limit,
+                    "offset": offset
+                }
+                if category:
+                    params["category"] = category
+                
+                data = await self._make_request('GET', '/application/listings/active', params=params)
+                
+                listings = []
+                for listing_data in data.get('results', []):
+                    listing = EtsyListing(
+                        listing_id=listing_data['listing_id'],
+                        title=listing_data['title'],
+                        description=listing_data.get('description', ''),
+                        state=listing_data['state'],
+                        price=listing_data['price']['amount'],
+                        currency_code=listing_data['price']['currency_code'],
+                        quantity=listing_data['quantity'],
+                        tags=listing_data.get('tags', []),
+                        materials=listing_data.get('materials', []),
+                        category_id=listing_data.get('category_id'),
+                        taxonomy_id=listing_data.get('taxonomy_id'),
+                        created_timestamp=listing_data.get('created_timestamp'),
+                        updated_timestamp=listing_data.get('updated_timestamp'),
+                        views=listing_data.get('views'),
+                        num_favorers=listing_data.get('num_favorers')
+                    )
+                    listings.append(listing)
+                
+                span.update(
+                    description=f"Search found {len(listings)} listings",
+                    details={"keywords": keywords, "results_count": len(listings)}
                 )
-                listings.append(listing)
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Search found {len(listings)} listings",
-                details={"keywords": keywords, "results_count": len(listings)}
-            )
-            
-            return listings
+                
+                return listings
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Search failed",
-                success=False,
-                error_message=str(e),
-                details={"keywords": keywords}
-            )
             brebot_logger.log_error(e, context="EtsyService.search_listings")
             raise
     
@@ -599,57 +519,45 @@ class EtsyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
+            async with platform_span(
                 platform=Platform.ETSY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting shop statistics for: {target_shop_id}",
+                operation="get_shop_stats",
                 resource_id=str(target_shop_id)
-            )
-            
-            # Get shop info and listings to compile stats
-            shop = await self.get_shop_info(target_shop_id, agent_name)
-            listings = await self.get_shop_listings(target_shop_id, "active", limit=100, agent_name=agent_name)
-            receipts = await self.get_shop_receipts(target_shop_id, limit=100, agent_name=agent_name)
-            
-            total_views = sum(listing.views or 0 for listing in listings)
-            total_favorers = sum(listing.num_favorers or 0 for listing in listings)
-            
-            stats = {
-                "shop_name": shop.shop_name,
-                "active_listings": len(listings),
-                "total_listings": shop.listing_active_count,
-                "total_sales": shop.transaction_sold_count,
-                "recent_orders": len(receipts),
-                "total_views": total_views,
-                "total_favorers": total_favorers,
-                "average_price": sum(float(listing.price) for listing in listings) / len(listings) if listings else 0,
-                "currency": shop.currency_code,
-                "is_vacation": shop.is_vacation,
-                "created_date": datetime.fromtimestamp(shop.creation_timestamp).isoformat() if shop.creation_timestamp else None
-            }
-            
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully compiled shop statistics",
-                resource_id=str(target_shop_id),
-                details=stats
-            )
-            
-            return stats
+            ) as span:
+                # Get shop info and listings to compile stats
+                shop = await self.get_shop_info(target_shop_id, agent_name)
+                listings = await self.get_shop_listings(target_shop_id, "active", limit=100, agent_name=agent_name)
+                receipts = await self.get_shop_receipts(target_shop_id, limit=100, agent_name=agent_name)
+                
+                total_views = sum(listing.views or 0 for listing in listings)
+                total_favorers = sum(listing.num_favorers or 0 for listing in listings)
+                
+                stats = {
+                    "shop_name": shop.shop_name,
+                    "active_listings": len(listings),
+                    "total_listings": shop.listing_active_count,
+                    "total_sales": shop.transaction_sold_count,
+                    "recent_orders": len(receipts),
+                    "total_views": total_views,
+                    "total_favorers": total_favorers,
+                    "average_price": sum(float(listing.price) for listing in listings) / len(listings) if listings else 0,
+                    "currency": shop.currency_code,
+                    "is_vacation": shop.is_vacation,
+                    "created_date": datetime.fromtimestamp(shop.creation_timestamp).isoformat() if shop.creation_timestamp else None
+                }
+                
+                span.update(
+                    description="Compiled shop statistics",
+                    resource_id=str(target_shop_id),
+                    details=stats
+                )
+                
+                return stats
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.ETSY,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get shop statistics",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="EtsyService.get_shop_stats")
             raise
 
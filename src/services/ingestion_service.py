@@ -18,6 +18,7 @@ from models.actions import MemoryAction
 from services.memory_service import memoryService
 from services.workspace_service import ensure_workspace
 from utils import brebot_logger
+from utils import metrics
 from config.storage import get_default_airtable_ingestion_table
 
 DEFAULT_KEYWORD_ROUTING: Dict[str, Dict[str, object]] = {
@@ -381,6 +382,11 @@ async def ingest_path(
 
     duration = datetime.utcnow().timestamp() - start_time
 
+    if not dry_run:
+        metrics.INGESTION_CHUNKS.inc(total_chunks)
+        if duration > 0:
+            metrics.INGESTION_CHUNKS_PER_SECOND.set(total_chunks / duration)
+
     return {
         "status": "success" if total_chunks else "empty",
         "files_processed": total_files,
@@ -7,12 +7,15 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Set, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+from config.settings import settings
 from utils.logger import brebot_logger
+from utils.circuit_breaker import circuit_snapshots
 from services.activity_logger import (
     initialize_activity_logger, 
     get_activity_logger, 
@@ -57,6 +60,11 @@ class IntegrationManager:
         """Initialize integration manager."""
         self.integrations: Dict[str, IntegrationConfig] = {}
         self.activity_logger = None
+        self._health_cache: Dict[str, Dict[str, Any]] = {}
+        self._health_checked_at = 0.0
+        self._health_lock = asyncio.Lock()
+        self._health_refresher: Optional[asyncio.Task] = None
+        self._health_refreshes: Set[asyncio.Task] = set()  # one-off re-checks from invalidate_health
         
         # Initialize activity logger
         self._initialize_activity_logging()
@@ -248,70 +256,187 @@ class IntegrationManager:
             }
         )
         
+        self.invalidate_health()
+        
         return initialized_services
     
     async def health_check_all(self) -> Dict[str, Dict[str, Any]]:
-        """Perform health checks on all integrations."""
-        health_results = {}
-        
-        for platform, config in self.integrations.items():
-            if not config.enabled:
-                health_results[platform] = {
-                    "status": IntegrationStatus.DISABLED.value,
-                    "message": "Integration disabled",
-                    "last_checked": datetime.now().isoformat()
-                }
-                continue
+        """
+        Perform live health checks on all integrations and refresh the cache.
+        
+        Platforms are checked concurrently, each bounded by the per-platform
+        timeout and all of them by the global deadline, so one dead platform
+        cannot hold up the rest. Concurrent callers share a single run.
+        """
+        requested_at = time.monotonic()
+        async with self._health_lock:
+            # Another caller finished a run while we waited for the lock
+            if self._health_cache and self._health_checked_at >= requested_at:
+                return dict(self._health_cache)
             
-            try:
-                await log_platform_activity(
-                    platform=Platform.SYSTEM,
-                    activity_type=ActivityType.READ,
-                    agent_name="IntegrationManager",
-                    description=f"Health checking {platform}",
-                    details={"platform": platform}
-                )
-                
-                health_result = await self._health_check_platform(platform, config)
-                health_results[platform] = health_result
-                
-                # Update config with health status
-                config.health_status = health_result["status"]
-                config.last_sync = datetime.now()
-                
-            except Exception as e:
-                health_results[platform] = {
-                    "status": IntegrationStatus.UNHEALTHY.value,
-                    "message": str(e),
-                    "last_checked": datetime.now().isoformat()
-                }
-                
-                config.health_status = "unhealthy"
-                config.error_message = str(e)
-                
-                await log_platform_activity(
-                    platform=Platform.SYSTEM,
-                    activity_type=ActivityType.READ,
-                    agent_name="IntegrationManager",
-                    description=f"Health check failed for {platform}",
-                    success=False,
-                    error_message=str(e),
-                    details={"platform": platform}
-                )
+            started = time.monotonic()
+            health_results = await self._run_health_checks()
+            self._health_cache = health_results
+            self._health_checked_at = time.monotonic()
         
         await log_platform_activity(
             platform=Platform.SYSTEM,
             activity_type=ActivityType.READ,
             agent_name="IntegrationManager",
             description="Completed health check for all integrations",
+            duration_ms=round((self._health_checked_at - started) * 1000, 3),
             details={
                 "platforms_checked": len(health_results),
                 "healthy_platforms": len([r for r in health_results.values() if r["status"] == "healthy"])
             }
         )
         
+        return dict(health_results)
+    
+    async def get_health(self, max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Cached health results for dashboard reads.
+        
+        While the background refresher runs, this never triggers live calls:
+        results older than the TTL are returned marked ``stale``. Without the
+        refresher (CLI use) an expired cache is refreshed inline.
+        """
+        max_age = settings.integration_health_ttl_seconds if max_age is None else max_age
+        if self._health_is_fresh(max_age):
+            return dict(self._health_cache)
+        
+        if self._health_cache and self._refresher_running():
+            age = round(time.monotonic() - self._health_checked_at, 1)
+            return {
+                platform: {**result, "stale": True, "age_seconds": age}
+                for platform, result in self._health_cache.items()
+            }
+        
+        return await self.health_check_all()
+    
+    def invalidate_health(self):
+        """Expire cached results after a configuration change; the refresher re-checks right away."""
+        self._health_checked_at = 0.0
+        if self._refresher_running():
+            # The loop only keeps weak references to tasks, so hold on to it until it finishes
+            task = asyncio.create_task(self.health_check_all())
+            self._health_refreshes.add(task)
+            task.add_done_callback(self._health_refresh_done)
+    
+    def _health_refresh_done(self, task: asyncio.Task):
+        self._health_refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            brebot_logger.log_error(task.exception(), context="IntegrationManager.invalidate_health")
+    
+    def _health_is_fresh(self, max_age: float) -> bool:
+        return bool(self._health_cache) and time.monotonic() - self._health_checked_at < max_age
+    
+    async def _run_health_checks(self) -> Dict[str, Dict[str, Any]]:
+        """Check every enabled platform concurrently under the global deadline."""
+        health_results: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[asyncio.Task, str] = {}
+        
+        for platform, config in self.integrations.items():
+            if not config.enabled:
+                health_results[platform] = {
+                    "status": IntegrationStatus.DISABLED.value,
+                    "message": "Integration disabled",
+                    "last_checked": datetime.now().isoformat()
+                }
+                continue
+            
+            task = asyncio.create_task(self._timed_health_check(platform, config))
+            tasks[task] = platform
+        
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=settings.integration_health_deadline_seconds)
+            for task in pending:
+                task.cancel()
+            
+            for task, platform in tasks.items():
+                config = self.integrations[platform]
+                if task in done and not task.cancelled() and task.exception() is None:
+                    result = task.result()
+                else:
+                    error = task.exception() if task in done and not task.cancelled() else None
+                    result = {
+                        "status": IntegrationStatus.UNHEALTHY.value,
+                        "message": str(error) if error else "Health check missed the overall deadline",
+                        "last_checked": datetime.now().isoformat()
+                    }
+                
+                health_results[platform] = result
+                config.health_status = result["status"]
+                if result["status"] == IntegrationStatus.HEALTHY.value:
+                    config.last_sync = datetime.now()
+                    config.error_message = None
+                else:
+                    config.error_message = result.get("message")
+                    await log_platform_activity(
+                        platform=Platform.SYSTEM,
+                        activity_type=ActivityType.READ,
+                        agent_name="IntegrationManager",
+                        description=f"Health check failed for {platform}",
+                        success=False,
+                        error_message=config.error_message,
+                        details={"platform": platform}
+                    )
+        
         return health_results
     
+    async def _timed_health_check(self, platform: str, config: IntegrationConfig) -> Dict[str, Any]:
+        """Run one platform check bounded by the per-platform timeout."""
+        timeout = settings.integration_health_timeout_seconds
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self._health_check_platform(platform, config), timeout=timeout)
+        except asyncio.TimeoutError:
+            result = {
+                "status": IntegrationStatus.UNHEALTHY.value,
+                "message": f"Health check timed out after {timeout:g}s",
+                "last_checked": datetime.now().isoformat()
+            }
+        result["duration_ms"] = round((time.monotonic() - started) * 1000, 3)
+        return result
+    
+    def start_health_refresher(self, interval: Optional[float] = None) -> Optional[asyncio.Task]:
+        """Keep the health cache warm from a background task on the running loop."""
+        interval = settings.integration_health_refresh_seconds if interval is None else interval
+        if interval <= 0 or self._refresher_running():
+            return self._health_refresher
+        
+        async def _refresh_loop():
+            while True:
+                try:
+                    await self.health_check_all()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    brebot_logger.log_error(e, context="IntegrationManager.health_refresher")
+                await asyncio.sleep(interval)
+        
+        self._health_refresher = asyncio.create_task(_refresh_loop())
+        brebot_logger.log_agent_action(
+            agent_name="IntegrationManager",
+            action="health_refresher_started",
+            details={"interval_seconds": interval}
+        )
+        return self._health_refresher
+    
+    async def stop_health_refresher(self):
+        """Cancel the background refresher and any pending re-checks (app shutdown)."""
+        task, self._health_refresher = self._health_refresher, None
+        for pending in [task, *self._health_refreshes]:
+            if pending and not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except asyncio.CancelledError:
+                    pass
+    
+    def _refresher_running(self) -> bool:
+        return self._health_refresher is not None and not self._health_refresher.done()
+    
     async def _health_check_platform(self, platform: str, config: IntegrationConfig) -> Dict[str, Any]:
         """Perform health check for a specific platform."""
         if platform == "dropbox":
@@ -340,7 +465,7 @@ class IntegrationManager:
             service = get_airtable_service()
             if service:
                 try:
-                    bases = await service.list_bases("IntegrationManager")
+                    bases = await service.list_bases("IntegrationManager", refresh=True)
                     return {
                         "status": IntegrationStatus.HEALTHY.value,
                         "message": f"Connected to {len(bases)} bases",
@@ -443,7 +568,7 @@ class IntegrationManager:
             description="Generating integration summary"
         )
         
-        health_results = await self.health_check_all()
+        health_results = await self.get_health()
         
         # Get activity statistics
         activity_logger = get_activity_logger()
@@ -453,6 +578,8 @@ class IntegrationManager:
             since = datetime.now() - timedelta(days=1)
             activity_summary = await activity_logger.get_activity_summary(start_time=since)
         
+        circuits = circuit_snapshots()
+        
         summary = {
             "total_integrations": len(self.integrations),
             "enabled_integrations": len([c for c in self.integrations.values() if c.enabled]),
@@ -463,11 +590,13 @@ class IntegrationManager:
                     "health": health_results.get(platform, {}).get("status", "unknown"),
                     "last_sync": config.last_sync.isoformat() if config.last_sync else None,
                     "has_api_key": bool(config.api_key),
-                    "error": config.error_message
+                    "error": config.error_message,
+                    "circuit": circuits.get(platform, {}).get("state", "closed")
                 }
                 for platform, config in self.integrations.items()
             },
             "health_details": health_results,
+            "circuits": circuits,
             "activity_summary": activity_summary,
             "generated_at": datetime.now().isoformat()
         }
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
@@ -10,9 +12,35 @@ from chromadb.api import Collection
 
 from config import get_chroma_client
 from utils import brebot_logger
+from utils import metrics
+from utils import tracing
 from models.actions import MemoryAction
 
 
+def _timed(operation: str):
+    """Record the latency of a MemoryService coroutine, labelled by the backend that served it.
+
+    The call is also traced as a ``memory.<operation>`` span when a trace is active.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self: "MemoryService", *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with tracing.child_span(f"memory.{operation}", backend=self.backend_name):
+                    return await func(self, *args, **kwargs)
+            finally:
+                metrics.MEMORY_OPERATION_SECONDS.labels(
+                    operation=operation,
+                    backend=self.backend_name,
+                ).observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
 class MemoryService:
     """Service for managing knowledge storage backed by ChromaDB with graceful fallback."""
 
@@ -57,6 +85,11 @@ class MemoryService:
     def _use_fallback(self) -> bool:
         return not self._initialise_backend()
 
+    @property
+    def backend_name(self) -> str:
+        return "chroma" if self.collection is not None else "memory"
+
+    @_timed("add")
     async def add(self, action: MemoryAction) -> Dict[str, Any]:
         """Add a new memory to the knowledge store."""
         if not action.summary:
@@ -105,6 +138,7 @@ class MemoryService:
             brebot_logger.log_error(exc, "MemoryService.add")
             return {"status": "error", "message": str(exc)}
 
+    @_timed("update")
     async def update(self, action: MemoryAction) -> Dict[str, Any]:
         """Update an existing memory."""
         if not action.id:
@@ -181,6 +215,7 @@ class MemoryService:
             brebot_logger.log_error(exc, "MemoryService.update")
             return {"status": "error", "message": str(exc)}
 
+    @_timed("delete")
     async def delete(self, memory_id: str) -> Dict[str, Any]:
         """Delete a memory from the collection."""
         if not memory_id:
@@ -210,6 +245,7 @@ class MemoryService:
             brebot_logger.log_error(exc, "MemoryService.delete")
             return {"status": "error", "message": str(exc)}
 
+    @_timed("search")
     async def search(
         self,
         query: str,
@@ -265,6 +301,7 @@ class MemoryService:
                 "memory_searched_fallback",
                 {"query": query, "results_count": len(results)},
             )
+            metrics.MEMORY_SEARCH_RESULTS.labels(backend="memory").observe(len(results[:k]))
             return {"status": "success", "results": results[:k], "storage": "memory"}
 
         try:
@@ -297,6 +334,7 @@ class MemoryService:
                 "memory_searched",
                 {"query": query, "results_count": len(formatted)},
             )
+            metrics.MEMORY_SEARCH_RESULTS.labels(backend="chroma").observe(len(formatted))
             return {"status": "success", "results": formatted}
         except Exception as exc:  # pragma: no cover - storage failure
             brebot_logger.log_error(exc, "MemoryService.search")
@@ -12,6 +12,8 @@ import httpx
 from pydantic import BaseModel
 
 from utils.logger import brebot_logger
+from utils import tracing
+from utils import http_clients
 
 
 class N8nWorkflow(BaseModel):
@@ -67,15 +69,18 @@ class N8nService:
         """Make HTTP request to n8n API."""
         url = f"{self.base_url}/api/v1{endpoint}"
         
-        async with httpx.AsyncClient() as client:
+        async with tracing.child_span("n8n.request", method=method, endpoint=endpoint) as span:
             try:
-                response = await client.request(
-                    method=method,
-                    url=url,
+                response = await http_clients.request(
+                    "n8n",
+                    method,
+                    url,
+                    credential=self.api_key,
                     headers=self.headers,
-                    timeout=30.0,
                     **kwargs
                 )
+                if span is not None:
+                    span.set_attributes(status=response.status_code, bytes=len(response.content))
                 response.raise_for_status()
                 return response.json()
                 
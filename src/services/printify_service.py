@@ -12,7 +12,9 @@ import httpx
 from pydantic import BaseModel
 
 from utils.logger import brebot_logger
-from services.activity_logger import log_platform_activity, Platform, ActivityType
+from utils import tracing
+from utils import http_clients
+from services.activity_logger import platform_span, record_bytes, Platform, ActivityType
 
 
 class PrintifyProduct(BaseModel):
@@ -89,15 +91,19 @@ class PrintifyService:
         """Make HTTP request to Printify API."""
         url = f"{self.base_url}{endpoint}"
         
-        async with httpx.AsyncClient() as client:
+        async with tracing.child_span("printify.request", method=method, endpoint=endpoint) as span:
             try:
-                response = await client.request(
-                    method=method,
-                    url=url,
+                response = await http_clients.request(
+                    "printify",
+                    method,
+                    url,
+                    credential=self.api_token,
                     headers=self.headers,
-                    timeout=30.0,
                     **kwargs
                 )
+                if span is not None:
+                    span.set_attributes(status=response.status_code, bytes=len(response.content))
+                record_bytes(http_clients.payload_size(response))
                 response.raise_for_status()
                 return response.json()
                 
@@ -112,44 +118,33 @@ class PrintifyService:
     async def list_shops(self, agent_name: str = "PrintifyService") -> List[PrintifyShop]:
         """List all Printify shops."""
         try:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,  # Using SYSTEM as Printify not in enum yet
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
-                description="Listing Printify shops"
-            )
-            
-            data = await self._make_request('GET', '/shops.json')
-            
-            shops = []
-            for shop_data in data.get('data', []):
-                shop = PrintifyShop(
-                    id=shop_data['id'],
-                    title=shop_data['title'],
-                    sales_channel=shop_data['sales_channel'],
-                    created_at=shop_data['created_at']
+                description="Listing Printify shops",
+                operation="list_shops"
+            ) as span:
+                data = await self._make_request('GET', '/shops.json')
+                
+                shops = []
+                for shop_data in data.get('data', []):
+                    shop = PrintifyShop(
+                        id=shop_data['id'],
+                        title=shop_data['title'],
+                        sales_channel=shop_data['sales_channel'],
+                        created_at=shop_data['created_at']
+                    )
+                    shops.append(shop)
+                
+                span.update(
+                    description=f"Listed {len(shops)} shops",
+                    details={"shops_count": len(shops)}
                 )
-                shops.append(shop)
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully listed {len(shops)} shops",
-                details={"shops_count": len(shops)}
-            )
-            
-            return shops
+                
+                return shops
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to list shops",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.list_shops")
             raise
     
@@ -166,58 +161,46 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Listing products for shop: {target_shop_id}",
+                operation="list_products",
                 resource_id=str(target_shop_id),
                 details={"limit": limit, "page": page}
-            )
-            
-            params = {"limit": limit, "page": page}
-            data = await self._make_request('GET', f'/shops/{target_shop_id}/products.json', params=params)
-            
-            products = []
-            for product_data in data.get('data', []):
-                product = PrintifyProduct(
-                    id=product_data['id'],
-                    title=product_data['title'],
-                    description=product_data['description'],
-                    tags=product_data.get('tags', []),
-                    images=product_data.get('images', []),
-                    created_at=product_data['created_at'],
-                    updated_at=product_data['updated_at'],
-                    visible=product_data.get('visible', True),
-                    is_locked=product_data.get('is_locked', False),
-                    blueprint_id=product_data.get('blueprint_id'),
-                    print_provider_id=product_data.get('print_provider_id'),
-                    variants=product_data.get('variants', []),
-                    print_areas=product_data.get('print_areas', [])
+            ) as span:
+                params = {"limit": limit, "page": page}
+                data = await self._make_request('GET', f'/shops/{target_shop_id}/products.json', params=params)
+                
+                products = []
+                for product_data in data.get('data', []):
+                    product = PrintifyProduct(
+                        id=product_data['id'],
+                        title=product_data['title'],
+                        description=product_data['description'],
+                        tags=product_data.get('tags', []),
+                        images=product_data.get('images', []),
+                        created_at=product_data['created_at'],
+                        updated_at=product_data['updated_at'],
+                        visible=product_data.get('visible', True),
+                        is_locked=product_data.get('is_locked', False),
+                        blueprint_id=product_data.get('blueprint_id'),
+                        print_provider_id=product_data.get('print_provider_id'),
+                        variants=product_data.get('variants', []),
+                        print_areas=product_data.get('print_areas', [])
+                    )
+                    products.append(product)
+                
+                span.update(
+                    description=f"Retrieved {len(products)} products",
+                    resource_id=str(target_shop_id),
+                    details={"products_count": len(products)}
                 )
-                products.append(product)
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved {len(products)} products",
-                resource_id=str(target_shop_id),
-                details={"products_count": len(products)}
-            )
-            
-            return products
+                
+                return products
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to list products",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.list_products")
             raise
     
@@ -233,53 +216,41 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting product: {product_id}",
+                operation="get_product",
                 resource_id=f"{target_shop_id}/{product_id}"
-            )
-            
-            data = await self._make_request('GET', f'/shops/{target_shop_id}/products/{product_id}.json')
-            
-            product = PrintifyProduct(
-                id=data['id'],
-                title=data['title'],
-                description=data['description'],
-                tags=data.get('tags', []),
-                images=data.get('images', []),
-                created_at=data['created_at'],
-                updated_at=data['updated_at'],
-                visible=data.get('visible', True),
-                is_locked=data.get('is_locked', False),
-                blueprint_id=data.get('blueprint_id'),
-                print_provider_id=data.get('print_provider_id'),
-                variants=data.get('variants', []),
-                print_areas=data.get('print_areas', [])
-            )
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved product: {product.title}",
-                resource_id=f"{target_shop_id}/{product_id}",
-                details={"title": product.title}
-            )
-            
-            return product
+            ) as span:
+                data = await self._make_request('GET', f'/shops/{target_shop_id}/products/{product_id}.json')
+                
+                product = PrintifyProduct(
+                    id=data['id'],
+                    title=data['title'],
+                    description=data['description'],
+                    tags=data.get('tags', []),
+                    images=data.get('images', []),
+                    created_at=data['created_at'],
+                    updated_at=data['updated_at'],
+                    visible=data.get('visible', True),
+                    is_locked=data.get('is_locked', False),
+                    blueprint_id=data.get('blueprint_id'),
+                    print_provider_id=data.get('print_provider_id'),
+                    variants=data.get('variants', []),
+                    print_areas=data.get('print_areas', [])
+                )
+                
+                span.update(
+                    description=f"Retrieved product: {product.title}",
+                    resource_id=f"{target_shop_id}/{product_id}",
+                    details={"title": product.title}
+                )
+                
+                return product
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get product",
-                resource_id=f"{target_shop_id}/{product_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.get_product")
             raise
     
@@ -301,67 +272,54 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Creating product: {title}",
+                operation="create_product",
                 resource_id=str(target_shop_id),
                 details={"title": title, "blueprint_id": blueprint_id, "print_provider_id": print_provider_id}
-            )
-            
-            payload = {
-                "title": title,
-                "description": description,
-                "blueprint_id": blueprint_id,
-                "print_provider_id": print_provider_id,
-                "variants": variants,
-                "print_areas": print_areas
-            }
-            
-            if tags:
-                payload["tags"] = tags
-            
-            data = await self._make_request('POST', f'/shops/{target_shop_id}/products.json', json=payload)
-            
-            product = PrintifyProduct(
-                id=data['id'],
-                title=data['title'],
-                description=data['description'],
-                tags=data.get('tags', []),
-                images=data.get('images', []),
-                created_at=data['created_at'],
-                updated_at=data['updated_at'],
-                visible=data.get('visible', True),
-                is_locked=data.get('is_locked', False),
-                blueprint_id=data.get('blueprint_id'),
-                print_provider_id=data.get('print_provider_id'),
-                variants=data.get('variants', []),
-                print_areas=data.get('print_areas', [])
-            )
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description=f"Successfully created product: {product.id}",
-                resource_id=f"{target_shop_id}/{product.id}",
-                details={"product_id": product.id, "title": title}
-            )
-            
-            return product
+            ) as span:
+                payload = {
+                    "title": title,
+                    "description": description,
+                    "blueprint_id": blueprint_id,
+                    "print_provider_id": print_provider_id,
+                    "variants": variants,
+                    "print_areas": print_areas
+                }
+                
+                if tags:
+                    payload["tags"] = tags
+                
+                data = await self._make_request('POST', f'/shops/{target_shop_id}/products.json', json=payload)
+                
+                product = PrintifyProduct(
+                    id=data['id'],
+                    title=data['title'],
+                    description=data['description'],
+                    tags=data.get('tags', []),
+                    images=data.get('images', []),
+                    created_at=data['created_at'],
+                    updated_at=data['updated_at'],
+                    visible=data.get('visible', True),
+                    is_locked=data.get('is_locked', False),
+                    blueprint_id=data.get('blueprint_id'),
+                    print_provider_id=data.get('print_provider_id'),
+                    variants=data.get('variants', []),
+                    print_areas=data.get('print_areas', [])
+                )
+                
+                span.update(
+                    description=f"Created product: {product.id}",
+                    resource_id=f"{target_shop_id}/{product.id}",
+                    details={"product_id": product.id, "title": title}
+                )
+                
+                return product
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description="Failed to create product",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e),
-                details={"title": title}
-            )
             brebot_logger.log_error(e, context="PrintifyService.create_product")
             raise
     
@@ -378,55 +336,42 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.UPDATE,
                 agent_name=agent_name,
                 description=f"Updating product: {product_id}",
+                operation="update_product",
                 resource_id=f"{target_shop_id}/{product_id}",
                 details={"updates": list(updates.keys())}
-            )
-            
-            data = await self._make_request('PUT', f'/shops/{target_shop_id}/products/{product_id}.json', json=updates)
-            
-            product = PrintifyProduct(
-                id=data['id'],
-                title=data['title'],
-                description=data['description'],
-                tags=data.get('tags', []),
-                images=data.get('images', []),
-                created_at=data['created_at'],
-                updated_at=data['updated_at'],
-                visible=data.get('visible', True),
-                is_locked=data.get('is_locked', False),
-                blueprint_id=data.get('blueprint_id'),
-                print_provider_id=data.get('print_provider_id'),
-                variants=data.get('variants', []),
-                print_areas=data.get('print_areas', [])
-            )
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description=f"Successfully updated product",
-                resource_id=f"{target_shop_id}/{product_id}",
-                details={"updates": list(updates.keys())}
-            )
-            
-            return product
+            ) as span:
+                data = await self._make_request('PUT', f'/shops/{target_shop_id}/products/{product_id}.json', json=updates)
+                
+                product = PrintifyProduct(
+                    id=data['id'],
+                    title=data['title'],
+                    description=data['description'],
+                    tags=data.get('tags', []),
+                    images=data.get('images', []),
+                    created_at=data['created_at'],
+                    updated_at=data['updated_at'],
+                    visible=data.get('visible', True),
+                    is_locked=data.get('is_locked', False),
+                    blueprint_id=data.get('blueprint_id'),
+                    print_provider_id=data.get('print_provider_id'),
+                    variants=data.get('variants', []),
+                    print_areas=data.get('print_areas', [])
+                )
+                
+                span.update(
+                    description="Updated product",
+                    resource_id=f"{target_shop_id}/{product_id}",
+                    details={"updates": list(updates.keys())}
+                )
+                
+                return product
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description="Failed to update product",
-                resource_id=f"{target_shop_id}/{product_id}",
-                success=False,
-                error_message=str(e),
-                details={"attempted_updates": list(updates.keys())}
-            )
             brebot_logger.log_error(e, context="PrintifyService.update_product")
             raise
     
@@ -442,36 +387,24 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.DELETE,
                 agent_name=agent_name,
                 description=f"Deleting product: {product_id}",
+                operation="delete_product",
                 resource_id=f"{target_shop_id}/{product_id}"
-            )
-            
-            await self._make_request('DELETE', f'/shops/{target_shop_id}/products/{product_id}.json')
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description=f"Successfully deleted product",
-                resource_id=f"{target_shop_id}/{product_id}"
-            )
-            
-            return True
+            ) as span:
+                await self._make_request('DELETE', f'/shops/{target_shop_id}/products/{product_id}.json')
+                
+                span.update(
+                    description="Deleted product",
+                    resource_id=f"{target_shop_id}/{product_id}"
+                )
+                
+                return True
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.DELETE,
-                agent_name=agent_name,
-                description="Failed to delete product",
-                resource_id=f"{target_shop_id}/{product_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.delete_product")
             raise
     
@@ -487,38 +420,26 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.UPDATE,
                 agent_name=agent_name,
                 description=f"Publishing product: {product_id}",
+                operation="publish_product",
                 resource_id=f"{target_shop_id}/{product_id}"
-            )
-            
-            payload = {"title": True, "description": True, "images": True, "variants": True, "tags": True}
-            data = await self._make_request('POST', f'/shops/{target_shop_id}/products/{product_id}/publish.json', json=payload)
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description=f"Successfully published product",
-                resource_id=f"{target_shop_id}/{product_id}",
-                details={"publish_result": data}
-            )
-            
-            return data
+            ) as span:
+                payload = {"title": True, "description": True, "images": True, "variants": True, "tags": True}
+                data = await self._make_request('POST', f'/shops/{target_shop_id}/products/{product_id}/publish.json', json=payload)
+                
+                span.update(
+                    description="Published product",
+                    resource_id=f"{target_shop_id}/{product_id}",
+                    details={"publish_result": data}
+                )
+                
+                return data
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.UPDATE,
-                agent_name=agent_name,
-                description="Failed to publish product",
-                resource_id=f"{target_shop_id}/{product_id}",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.publish_product")
             raise
     
@@ -535,57 +456,45 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Listing orders for shop: {target_shop_id}",
+                operation="list_orders",
                 resource_id=str(target_shop_id),
                 details={"limit": limit, "page": page}
-            )
-            
-            params = {"limit": limit, "page": page}
-            data = await self._make_request('GET', f'/shops/{target_shop_id}/orders.json', params=params)
-            
-            orders = []
-            for order_data in data.get('data', []):
-                order = PrintifyOrder(
-                    id=order_data['id'],
-                    reference_id=order_data.get('reference_id'),
-                    customer=order_data.get('customer', {}),
-                    address_to=order_data.get('address_to', {}),
-                    line_items=order_data.get('line_items', []),
-                    metadata=order_data.get('metadata', {}),
-                    total_price=order_data.get('total_price', 0),
-                    total_shipping=order_data.get('total_shipping', 0),
-                    total_tax=order_data.get('total_tax', 0),
-                    status=order_data.get('status', 'draft'),
-                    created_at=order_data['created_at'],
-                    updated_at=order_data['updated_at']
+            ) as span:
+                params = {"limit": limit, "page": page}
+                data = await self._make_request('GET', f'/shops/{target_shop_id}/orders.json', params=params)
+                
+                orders = []
+                for order_data in data.get('data', []):
+                    order = PrintifyOrder(
+                        id=order_data['id'],
+                        reference_id=order_data.get('reference_id'),
+                        customer=order_data.get('customer', {}),
+                        address_to=order_data.get('address_to', {}),
+                        line_items=order_data.get('line_items', []),
+                        metadata=order_data.get('metadata', {}),
+                        total_price=order_data.get('total_price', 0),
+                        total_shipping=order_data.get('total_shipping', 0),
+                        total_tax=order_data.get('total_tax', 0),
+                        status=order_data.get('status', 'draft'),
+                        created_at=order_data['created_at'],
+                        updated_at=order_data['updated_at']
+                    )
+                    orders.append(order)
+                
+                span.update(
+                    description=f"Retrieved {len(orders)} orders",
+                    resource_id=str(target_shop_id),
+                    details={"orders_count": len(orders)}
                 )
-                orders.append(order)
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved {len(orders)} orders",
-                resource_id=str(target_shop_id),
-                details={"orders_count": len(orders)}
-            )
-            
-            return orders
+                
+                return orders
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to list orders",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.list_orders")
             raise
     
@@ -603,134 +512,98 @@ class PrintifyService:
             if not target_shop_id:
                 raise ValueError("Shop ID is required")
             
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.CREATE,
                 agent_name=agent_name,
                 description=f"Creating order with {len(line_items)} items",
+                operation="create_order",
                 resource_id=str(target_shop_id),
                 details={"line_items_count": len(line_items), "reference_id": reference_id}
-            )
-            
-            payload = {
-                "line_items": line_items,
-                "address_to": address_to
-            }
-            
-            if reference_id:
-                payload["reference_id"] = reference_id
-            
-            data = await self._make_request('POST', f'/shops/{target_shop_id}/orders.json', json=payload)
-            
-            order = PrintifyOrder(
-                id=data['id'],
-                reference_id=data.get('reference_id'),
-                customer=data.get('customer', {}),
-                address_to=data.get('address_to', {}),
-                line_items=data.get('line_items', []),
-                metadata=data.get('metadata', {}),
-                total_price=data.get('total_price', 0),
-                total_shipping=data.get('total_shipping', 0),
-                total_tax=data.get('total_tax', 0),
-                status=data.get('status', 'draft'),
-                created_at=data['created_at'],
-                updated_at=data['updated_at']
-            )
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description=f"Successfully created order: {order.id}",
-                resource_id=f"{target_shop_id}/{order.id}",
-                details={"order_id": order.id, "total_price": order.total_price}
-            )
-            
-            return order
+            ) as span:
+                payload = {
+                    "line_items": line_items,
+                    "address_to": address_to
+                }
+                
+                if reference_id:
+                    payload["reference_id"] = reference_id
+                
+                data = await self._make_request('POST', f'/shops/{target_shop_id}/orders.json', json=payload)
+                
+                order = PrintifyOrder(
+                    id=data['id'],
+                    reference_id=data.get('reference_id'),
+                    customer=data.get('customer', {}),
+                    address_to=data.get('address_to', {}),
+                    line_items=data.get('line_items', []),
+                    metadata=data.get('metadata', {}),
+                    total_price=data.get('total_price', 0),
+                    total_shipping=data.get('total_shipping', 0),
+                    total_tax=data.get('total_tax', 0),
+                    status=data.get('status', 'draft'),
+                    created_at=data['created_at'],
+                    updated_at=data['updated_at']
+                )
+                
+                span.update(
+                    description=f"Created order: {order.id}",
+                    resource_id=f"{target_shop_id}/{order.id}",
+                    details={"order_id": order.id, "total_price": order.total_price}
+                )
+                
+                return order
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.CREATE,
-                agent_name=agent_name,
-                description="Failed to create order",
-                resource_id=str(target_shop_id),
-                success=False,
-                error_message=str(e),
-                details={"line_items_count": len(line_items)}
-            )
             brebot_logger.log_error(e, context="PrintifyService.create_order")
             raise
     
     async def get_blueprints(self, agent_name: str = "PrintifyService") -> List[Dict[str, Any]]:
         """Get available product blueprints."""
         try:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Getting available blueprints"
-            )
-            
-            data = await self._make_request('GET', '/catalog/blueprints.json')
-            blueprints = data.get('data', [])
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
-                description=f"Successfully retrieved {len(blueprints)} blueprints",
-                details={"blueprints_count": len(blueprints)}
-            )
-            
-            return blueprints
+                description="Getting available blueprints",
+                operation="get_blueprints"
+            ) as span:
+                data = await self._make_request('GET', '/catalog/blueprints.json')
+                blueprints = data.get('data', [])
+                
+                span.update(
+                    description=f"Retrieved {len(blueprints)} blueprints",
+                    details={"blueprints_count": len(blueprints)}
+                )
+                
+                return blueprints
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get blueprints",
-                success=False,
-                error_message=str(e)
-            )
             brebot_logger.log_error(e, context="PrintifyService.get_blueprints")
             raise
     
     async def get_print_providers(self, blueprint_id: int, agent_name: str = "PrintifyService") -> List[Dict[str, Any]]:
         """Get print providers for a specific blueprint."""
         try:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
+            async with platform_span(
+                platform=Platform.PRINTIFY,
                 activity_type=ActivityType.READ,
                 agent_name=agent_name,
                 description=f"Getting print providers for blueprint: {blueprint_id}",
+                operation="get_print_providers",
                 details={"blueprint_id": blueprint_id}
-            )
-            
-            data = await self._make_request('GET', f'/catalog/blueprints/{blueprint_id}/print_providers.json')
-            providers = data.get('data', [])
-            
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description=f"Successfully retrieved {len(providers)} print providers",
-                details={"blueprint_id": blueprint_id, "providers_count": len(providers)}
-            )
-            
-            return providers
+            ) as span:
+                data = await self._make_request('GET', f'/catalog/blueprints/{blueprint_id}/print_providers.json')
+                providers = data.get('data', [])
+                
+                span.update(
+                    description=f"Retrieved {len(providers)} print providers",
+                    details={"blueprint_id": blueprint_id, "providers_count": len(providers)}
+                )
+                
+                return providers
             
         except Exception as e:
-            await log_platform_activity(
-                platform=Platform.SYSTEM,
-                activity_type=ActivityType.READ,
-                agent_name=agent_name,
-                description="Failed to get print providers",
-                success=False,
-                error_message=str(e),
-                details={"blueprint_id": blueprint_id}
-            )
             brebot_logger.log_error(e, context="PrintifyService.get_print_providers")
             raise
 
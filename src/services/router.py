@@ -2,10 +2,16 @@ from models.actions import Action
 from services import taskService, noteService, memoryService, inboxService
 from services import meetingService, botService, creativeService, systemService
 from services import businessService, fileService, financeService, interactionService
+from utils import metrics
 
 
 async def route_action(action: Action):
     """Route Brebot actions to the correct service layer."""
+    with metrics.observe_seconds(metrics.ACTION_DISPATCH_SECONDS, action_type=action.type):
+        return await _dispatch_action(action)
+
+
+async def _dispatch_action(action: Action):
 
     # ----------------- Tasks -----------------
     if action.type == "task.create":
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from config import get_redis_client, get_default_airtable_events_table
+from config import get_async_redis_client, get_default_airtable_events_table
 from models.actions import SystemAction
 from utils import brebot_logger
 
@@ -15,15 +15,26 @@ from utils import brebot_logger
 class SystemService:
     """Service for system operations backed by Redis and Airtable."""
 
-    REDIS_CONNECTION_PREFIX = "brebot:connection:"
-    REDIS_INGESTION_PREFIX = "brebot:ingestion:"
-    REDIS_ALERT_LIST = "brebot:alerts"
+    # Pre-index layout: one string key per service, a LIST of alerts and a SET of event ids
+    LEGACY_CONNECTION_PREFIX = "brebot:connection:"
+    LEGACY_INGESTION_PREFIX = "brebot:ingestion:"
+    LEGACY_ALERT_LIST = "brebot:alerts"
+    LEGACY_CALENDAR_INDEX = "brebot:calendar:index"
+
+    REDIS_CONNECTION_STATUS = "brebot:system:connections"  # HASH service -> status
+    REDIS_INGESTION_STATUS = "brebot:system:ingestion"  # HASH service -> enabled/disabled
+    REDIS_ALERTS = "brebot:system:alerts"  # HASH alert id -> JSON
+    REDIS_ALERTS_PENDING = "brebot:system:alerts:pending"  # ZSET alert id by created time
     REDIS_CALENDAR_PREFIX = "brebot:calendar:"
-    REDIS_CALENDAR_INDEX = "brebot:calendar:index"
+    REDIS_CALENDAR_BY_TIME = "brebot:system:calendar:by_time"  # ZSET event id by event time
+    REDIS_CALENDAR_UNTIMED = "brebot:system:calendar:untimed"  # ZSET free-text-time event id by created time
+    REDIS_SCHEMA_KEY = "brebot:system:schema"
+    REDIS_SCHEMA_VERSION = "2"
 
     def __init__(self):
-        self.redis = get_redis_client()
+        self.redis = get_async_redis_client()
         self.events_table = get_default_airtable_events_table()
+        self._schema_checked = False
         brebot_logger.log_agent_action("SystemService", "initialized")
 
     # ------------------------------------------------------------------
@@ -45,84 +56,204 @@ class SystemService:
         except Exception as exc:  # pragma: no cover - network failure
             brebot_logger.log_error(exc, "SystemService._log_event")
 
-    def _set_connection_status(self, service: str, status: str) -> None:
+    @staticmethod
+    def _score(value: Optional[str]) -> Optional[float]:
+        """Epoch seconds for an ISO date or datetime (naive values are UTC), or None."""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+    def _index_calendar_event(self, pipe: Any, event: Dict[str, Any]) -> None:
+        """Queue the index writes for an event on ``pipe``.
+
+        Only events with a parseable time go in the time index; free-text
+        times ("tomorrow noon") have no position on the timeline, so they are
+        kept apart, ordered by when they were added, and left out of ranges.
+        """
+        score = self._score(event.get("time"))
+        if score is not None:
+            pipe.zadd(self.REDIS_CALENDAR_BY_TIME, {event["id"]: score})
+            pipe.zrem(self.REDIS_CALENDAR_UNTIMED, event["id"])
+        else:
+            pipe.zadd(self.REDIS_CALENDAR_UNTIMED, {event["id"]: self._score(event.get("created_at")) or 0.0})
+            pipe.zrem(self.REDIS_CALENDAR_BY_TIME, event["id"])
+
+    async def _ensure_redis_schema(self) -> None:
+        """Move legacy keys into the hashes and sorted sets on first use."""
+        if self._schema_checked or not self.redis:
+            return
+        try:
+            await self._migrate_legacy_keys()
+            self._schema_checked = True
+        except Exception as exc:  # pragma: no cover - connection failures
+            brebot_logger.log_error(exc, "SystemService._migrate_legacy_keys")
+
+    async def _migrate_legacy_keys(self) -> None:
+        if await self.redis.get(self.REDIS_SCHEMA_KEY) == self.REDIS_SCHEMA_VERSION:
+            return
+
+        pipe = self.redis.pipeline()
+        for prefix, target in (
+            (self.LEGACY_CONNECTION_PREFIX, self.REDIS_CONNECTION_STATUS),
+            (self.LEGACY_INGESTION_PREFIX, self.REDIS_INGESTION_STATUS),
+        ):
+            # The ingestion prefix also matches non-status keys (e.g. the runs list)
+            async for key in self.redis.scan_iter(f"{prefix}*", _type="string"):
+                value = await self.redis.get(key)
+                if value is not None:
+                    pipe.hset(target, key[len(prefix):], value)
+                    pipe.delete(key)
+
+        if await self.redis.type(self.LEGACY_ALERT_LIST) == "list":
+            for raw in await self.redis.lrange(self.LEGACY_ALERT_LIST, 0, -1):
+                alert = json.loads(raw)
+                pipe.hset(self.REDIS_ALERTS, alert["id"], raw)
+                pipe.zadd(self.REDIS_ALERTS_PENDING, {alert["id"]: self._score(alert.get("created_at")) or 0.0})
+            pipe.delete(self.LEGACY_ALERT_LIST)
+
+        if await self.redis.type(self.LEGACY_CALENDAR_INDEX) == "set":
+            event_ids = list(await self.redis.smembers(self.LEGACY_CALENDAR_INDEX))
+            raws = await self.redis.mget([self._calendar_key(event_id) for event_id in event_ids]) if event_ids else []
+            for raw in raws:
+                if raw:
+                    self._index_calendar_event(pipe, json.loads(raw))
+            pipe.delete(self.LEGACY_CALENDAR_INDEX)
+
+        pipe.set(self.REDIS_SCHEMA_KEY, self.REDIS_SCHEMA_VERSION)
+        await pipe.execute()
+        brebot_logger.log_agent_action("SystemService", "redis_schema_migrated")
+
+    def _calendar_key(self, event_id: str) -> str:
+        return f"{self.REDIS_CALENDAR_PREFIX}{event_id}"
+
+    async def _set_connection_status(self, service: str, status: str) -> None:
         if not self.redis:
             return
-        self.redis.set(f"{self.REDIS_CONNECTION_PREFIX}{service}", status)
+        await self.redis.hset(self.REDIS_CONNECTION_STATUS, service, status)
 
-    def _get_connection_status(self, service: str) -> str:
+    async def _get_connection_status(self, service: str) -> str:
         if self.redis:
-            status = self.redis.get(f"{self.REDIS_CONNECTION_PREFIX}{service}")
+            status = await self.redis.hget(self.REDIS_CONNECTION_STATUS, service)
             if status:
                 return status
         return "unknown"
 
-    def _toggle_ingestion_state(self, service: str) -> str:
+    async def _toggle_ingestion_state(self, service: str) -> str:
         if not self.redis:
             return "unknown"
-        key = f"{self.REDIS_INGESTION_PREFIX}{service}"
-        current = self.redis.get(key)
+        current = await self.redis.hget(self.REDIS_INGESTION_STATUS, service)
         new_state = "enabled" if current != "enabled" else "disabled"
-        self.redis.set(key, new_state)
+        await self.redis.hset(self.REDIS_INGESTION_STATUS, service, new_state)
         return new_state
 
-    def _record_alert(self, alert: Dict[str, Any]) -> None:
-        if self.redis:
-            self.redis.lpush(self.REDIS_ALERT_LIST, json.dumps(alert))
+    async def _record_alert(self, alert: Dict[str, Any]) -> None:
+        if not self.redis:
+            return
+        async with self.redis.pipeline() as pipe:
+            pipe.hset(self.REDIS_ALERTS, alert["id"], json.dumps(alert))
+            pipe.zadd(self.REDIS_ALERTS_PENDING, {alert["id"]: self._score(alert["created_at"]) or 0.0})
+            await pipe.execute()
 
-    def _store_calendar_event(self, event: Dict[str, Any]) -> None:
+    async def _clear_alert(self, alert_id: str) -> bool:
+        if not self.redis:
+            return False
+        async with self.redis.pipeline() as pipe:
+            pipe.zrem(self.REDIS_ALERTS_PENDING, alert_id)
+            pipe.hdel(self.REDIS_ALERTS, alert_id)
+            removed, _ = await pipe.execute()
+        return bool(removed)
+
+    async def _store_calendar_event(self, event: Dict[str, Any]) -> None:
         if not self.redis:
             return
-        key = f"{self.REDIS_CALENDAR_PREFIX}{event['id']}"
-        self.redis.set(key, json.dumps(event))
-        self.redis.sadd(self.REDIS_CALENDAR_INDEX, event["id"])
+        async with self.redis.pipeline() as pipe:
+            pipe.set(self._calendar_key(event["id"]), json.dumps(event))
+            self._index_calendar_event(pipe, event)
+            await pipe.execute()
 
-    def _delete_calendar_event(self, event_id: str) -> None:
+    async def _delete_calendar_event(self, event_id: str) -> None:
         if not self.redis:
             return
-        key = f"{self.REDIS_CALENDAR_PREFIX}{event_id}"
-        self.redis.delete(key)
-        self.redis.srem(self.REDIS_CALENDAR_INDEX, event_id)
+        async with self.redis.pipeline() as pipe:
+            pipe.delete(self._calendar_key(event_id))
+            pipe.zrem(self.REDIS_CALENDAR_BY_TIME, event_id)
+            pipe.zrem(self.REDIS_CALENDAR_UNTIMED, event_id)
+            await pipe.execute()
 
-    def _list_calendar_events(self) -> List[Dict[str, Any]]:
+    async def _load_calendar_event(self, event_id: str) -> Optional[Dict[str, Any]]:
         if not self.redis:
+            return None
+        raw = await self.redis.get(self._calendar_key(event_id))
+        return json.loads(raw) if raw else None
+
+    async def _list_calendar_events(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Events in time order, optionally within [start, end] epoch seconds.
+
+        Without a range, events with a free-text time follow the timed ones.
+        """
+        if not self.redis:
+            return []
+        event_ids = await self.redis.zrangebyscore(
+            self.REDIS_CALENDAR_BY_TIME,
+            start if start is not None else "-inf",
+            end if end is not None else "+inf",
+            start=0 if limit is not None else None,
+            num=limit,
+        )
+        if start is None and end is None and (limit is None or len(event_ids) < limit):
+            event_ids += await self.redis.zrange(
+                self.REDIS_CALENDAR_UNTIMED, 0, -1 if limit is None else limit - len(event_ids) - 1
+            )
+        if not event_ids:
             return []
-        events: List[Dict[str, Any]] = []
-        for event_id in self.redis.smembers(self.REDIS_CALENDAR_INDEX):
-            raw = self.redis.get(f"{self.REDIS_CALENDAR_PREFIX}{event_id}")
-            if raw:
-                events.append(json.loads(raw))
-        return events
+        raws = await self.redis.mget([self._calendar_key(event_id) for event_id in event_ids])
+        return [json.loads(raw) for raw in raws if raw]
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     async def enable_connection(self, service: str) -> Dict[str, Any]:
+        await self._ensure_redis_schema()
         if not service:
             return {"status": "error", "message": "Service name is required"}
-        self._set_connection_status(service, "enabled")
+        await self._set_connection_status(service, "enabled")
         self._log_event("connection_toggle", {"service": service, "status": "enabled"})
         return {"status": "success", "message": f"Connection {service} enabled"}
 
     async def disable_connection(self, service: str) -> Dict[str, Any]:
+        await self._ensure_redis_schema()
         if not service:
             return {"status": "error", "message": "Service name is required"}
-        self._set_connection_status(service, "disabled")
+        await self._set_connection_status(service, "disabled")
         self._log_event("connection_toggle", {"service": service, "status": "disabled"})
         return {"status": "success", "message": f"Connection {service} disabled"}
 
     async def health_check(self, service: str) -> Dict[str, Any]:
-        status = self._get_connection_status(service)
+        await self._ensure_redis_schema()
+        status = await self._get_connection_status(service)
         return {"status": "success", "health": status}
 
     async def toggle_ingestion(self, service: str) -> Dict[str, Any]:
+        await self._ensure_redis_schema()
         if not service:
             return {"status": "error", "message": "Service name is required"}
-        state = self._toggle_ingestion_state(service)
+        state = await self._toggle_ingestion_state(service)
         self._log_event("connection_toggle", {"service": service, "ingestion": state})
         return {"status": "success", "message": f"Ingestion {state} for {service}"}
 
     async def add_calendar_event(self, action: SystemAction) -> Dict[str, Any]:
+        await self._ensure_redis_schema()
         event_id = action.id or f"calendar_{uuid4().hex}"
         event = {
             "id": event_id,
@@ -131,15 +262,15 @@ class SystemService:
             "time": action.query,
             "created_at": datetime.utcnow().isoformat(),
         }
-        self._store_calendar_event(event)
+        await self._store_calendar_event(event)
         self._log_event("calendar_update", {"action": "add", "event": event})
         return {"status": "success", "event_id": event_id}
 
     async def update_calendar_event(self, action: SystemAction) -> Dict[str, Any]:
         if not action.id:
             return {"status": "error", "message": "Event ID is required"}
-        events = {event["id"]: event for event in self._list_calendar_events()}
-        event = events.get(action.id)
+        await self._ensure_redis_schema()
+        event = await self._load_calendar_event(action.id)
         if not event:
             return {"status": "error", "message": "Event not found"}
 
@@ -148,22 +279,46 @@ class SystemService:
         if action.query is not None:
             event["time"] = action.query
         event["updated_at"] = datetime.utcnow().isoformat()
-        self._store_calendar_event(event)
+        await self._store_calendar_event(event)
         self._log_event("calendar_update", {"action": "update", "event": event})
         return {"status": "success", "message": "Event updated"}
 
     async def delete_calendar_event(self, event_id: str) -> Dict[str, Any]:
-        self._delete_calendar_event(event_id)
+        await self._ensure_redis_schema()
+        await self._delete_calendar_event(event_id)
         self._log_event("calendar_update", {"action": "delete", "event_id": event_id})
         return {"status": "success", "message": "Event deleted"}
 
-    async def check_calendar(self, query: Optional[str] = None) -> Dict[str, Any]:
-        events = self._list_calendar_events()
+    async def check_calendar(
+        self,
+        query: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Events in time order; ``start``/``end`` (ISO) bound the range, ``query`` matches the message.
+
+        Events whose time is free text are only returned when no range is given.
+        """
+        await self._ensure_redis_schema()
+        bounds = {}
+        for name, value in (("start", start), ("end", end)):
+            if value is not None:
+                bounds[name] = self._score(value)
+                if bounds[name] is None:
+                    return {"status": "error", "message": f"Invalid {name} time: {value}"}
+        # The text filter runs after the fetch, so the limit only applies to the range read
+        events = await self._list_calendar_events(
+            bounds.get("start"), bounds.get("end"), limit=None if query else limit
+        )
         if query:
             events = [event for event in events if query.lower() in (event.get("message") or "").lower()]
+            if limit is not None:
+                events = events[:limit]
         return {"status": "success", "events": events}
 
     async def create_alert(self, action: SystemAction) -> Dict[str, Any]:
+        await self._ensure_redis_schema()
         alert_id = action.id or f"alert_{uuid4().hex}"
         alert = {
             "id": alert_id,
@@ -172,11 +327,13 @@ class SystemService:
             "message": action.message,
             "created_at": datetime.utcnow().isoformat(),
         }
-        self._record_alert(alert)
+        await self._record_alert(alert)
         self._log_event("system_alert", {"action": "create", "alert": alert})
         return {"status": "success", "alert_id": alert_id}
 
     async def resolve_alert(self, alert_id: str) -> Dict[str, Any]:
+        await self._ensure_redis_schema()
+        await self._clear_alert(alert_id)
         self._log_event("system_alert", {"action": "resolve", "alert_id": alert_id})
         return {"status": "success", "message": "Alert resolved"}
 
@@ -187,18 +344,19 @@ class SystemService:
     async def diagnose(self, action: SystemAction) -> Dict[str, Any]:
         connections: Dict[str, str] = {}
         ingestions: Dict[str, str] = {}
+        alerts_pending = 0
         if self.redis:
-            for key in self.redis.scan_iter(f"{self.REDIS_CONNECTION_PREFIX}*"):
-                service = key.decode().split(self.REDIS_CONNECTION_PREFIX, 1)[1] if isinstance(key, bytes) else key.split(self.REDIS_CONNECTION_PREFIX, 1)[1]
-                connections[service] = self.redis.get(key)
-            for key in self.redis.scan_iter(f"{self.REDIS_INGESTION_PREFIX}*"):
-                service = key.decode().split(self.REDIS_INGESTION_PREFIX, 1)[1] if isinstance(key, bytes) else key.split(self.REDIS_INGESTION_PREFIX, 1)[1]
-                ingestions[service] = self.redis.get(key)
+            await self._ensure_redis_schema()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hgetall(self.REDIS_CONNECTION_STATUS)
+                pipe.hgetall(self.REDIS_INGESTION_STATUS)
+                pipe.zcard(self.REDIS_ALERTS_PENDING)
+                connections, ingestions, alerts_pending = await pipe.execute()
 
         diagnosis = {
             "connections": connections,
             "ingestion": ingestions,
-            "alerts_pending": self.redis.llen(self.REDIS_ALERT_LIST) if self.redis else 0,
+            "alerts_pending": alerts_pending,
         }
 
         return {"status": "success", "diagnosis": diagnosis}
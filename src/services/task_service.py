@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from config import (
-    get_redis_client,
+    settings,
+    get_async_redis_client,
     get_default_airtable_task_table,
     get_default_airtable_events_table,
 )
 from models.actions import TaskAction
+from services.task_sync_queue import TaskSyncQueue
 from utils import brebot_logger
 
 
@@ -20,13 +22,30 @@ class TaskService:
     """Service for managing tasks with Redis + Airtable persistence."""
 
     REDIS_TASK_PREFIX = "brebot:task:"
-    REDIS_TASK_INDEX = "brebot:task_index"
+    REDIS_TASK_INDEX = "brebot:task_index"  # legacy SET of ids from JSON-string storage
+    REDIS_INDEX_PREFIX = "brebot:tasks:"
+    REDIS_SCHEMA_KEY = "brebot:tasks:schema"
+    REDIS_SCHEMA_VERSION = "2"
+
+    # Task fields with a sorted-set index (scored by creation time) -> index name
+    INDEXED_FIELDS = {"status": "status", "project": "project", "assigned_bot": "bot"}
+    LIST_FILTERS = {"status", "project", "assigned_bot", "due_before", "due_after"}
 
     def __init__(self):
-        self.redis = get_redis_client()
+        self.redis = get_async_redis_client()
         self.tasks_table = get_default_airtable_task_table()
         self.events_table = get_default_airtable_events_table()
         self._fallback_tasks: Dict[str, Dict[str, Any]] = {}
+        # Airtable writes happen in the background, off the request path
+        self.sync_queue: Optional[TaskSyncQueue] = None
+        if self.tasks_table or self.events_table:
+            self.sync_queue = TaskSyncQueue(
+                settings.task_sync_queue_path,
+                tasks_table=self.tasks_table,
+                events_table=self.events_table,
+                flush_interval=settings.task_sync_flush_interval,
+            )
+        self._schema_checked = False
         brebot_logger.log_agent_action("TaskService", "initialized")
 
     # ------------------------------------------------------------------
@@ -35,31 +54,190 @@ class TaskService:
     def _redis_key(self, task_id: str) -> str:
         return f"{self.REDIS_TASK_PREFIX}{task_id}"
 
-    def _load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+    def _index_key(self, name: str, value: Optional[str] = None) -> str:
+        suffix = f"{name}:{value}" if value is not None else name
+        return f"{self.REDIS_INDEX_PREFIX}{suffix}"
+
+    @staticmethod
+    def _timestamp(value: Optional[str]) -> Optional[float]:
+        """Epoch seconds for an ISO date or datetime (naive values are UTC), or None."""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+    def _index_entries(self, task: Dict[str, Any]) -> Dict[str, float]:
+        """Sorted-set keys a task belongs to, with its score in each."""
+        created = self._timestamp(task.get("created_at")) or 0.0
+        entries = {self._index_key("all"): created}
+        for field, name in self.INDEXED_FIELDS.items():
+            if task.get(field):
+                entries[self._index_key(name, task[field])] = created
+        due = self._timestamp(task.get("due_date"))
+        if due is not None:
+            entries[self._index_key("due")] = due
+        return entries
+
+    @staticmethod
+    def _encode_task(task: Dict[str, Any]) -> Dict[str, str]:
+        # Hash values are JSON so None, lists (comments) and numbers round-trip
+        return {field: json.dumps(value) for field, value in task.items()}
+
+    @staticmethod
+    def _decode_task(raw: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    def _write_task(self, pipe: Any, task: Dict[str, Any]) -> None:
+        task_id = task["id"]
+        pipe.hset(self._redis_key(task_id), mapping=self._encode_task(task))
+        for key, score in self._index_entries(task).items():
+            pipe.zadd(key, {task_id: score})
+
+    async def _ensure_redis_schema(self) -> None:
+        """Migrate legacy task keys on first use (the client is async, so not in __init__)."""
+        if self._schema_checked or not self.redis:
+            return
+        try:
+            await self._migrate_legacy_tasks()
+            self._schema_checked = True
+        except Exception as exc:  # pragma: no cover - connection failures
+            brebot_logger.log_error(exc, "TaskService._migrate_legacy_tasks")
+
+    async def _migrate_legacy_tasks(self) -> None:
+        """One-time conversion of JSON-string task keys to hashes plus indexes."""
+        if await self.redis.get(self.REDIS_SCHEMA_KEY) == self.REDIS_SCHEMA_VERSION:
+            return
+
+        task_ids: List[str] = []
+        if await self.redis.type(self.REDIS_TASK_INDEX) == "set":
+            task_ids = list(await self.redis.smembers(self.REDIS_TASK_INDEX))
+        migrated = 0
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            pipe = self.redis.pipeline(transaction=False)
+            for task_id in chunk:
+                pipe.type(self._redis_key(task_id))
+            key_types = await pipe.execute()
+
+            legacy = [task_id for task_id, key_type in zip(chunk, key_types) if key_type == "string"]
+            if not legacy:
+                continue
+            raws = await self.redis.mget([self._redis_key(task_id) for task_id in legacy])
+
+            pipe = self.redis.pipeline()
+            for task_id, raw in zip(legacy, raws):
+                if not raw:
+                    continue
+                pipe.delete(self._redis_key(task_id))
+                self._write_task(pipe, json.loads(raw))
+                migrated += 1
+            await pipe.execute()
+
+        await self.redis.delete(self.REDIS_TASK_INDEX)
+        await self.redis.set(self.REDIS_SCHEMA_KEY, self.REDIS_SCHEMA_VERSION)
+        brebot_logger.log_agent_action("TaskService", "redis_schema_migrated", {"tasks": migrated})
+
+    async def _load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         if self.redis:
-            raw = self.redis.get(self._redis_key(task_id))
-            if raw:
-                return json.loads(raw)
+            task = self._decode_task(await self.redis.hgetall(self._redis_key(task_id)))
+            if task:
+                return task
         return self._fallback_tasks.get(task_id)
 
-    def _store_task(self, task: Dict[str, Any]) -> None:
+    async def _store_task(self, task: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
         task_id = task["id"]
         if self.redis:
-            self.redis.set(self._redis_key(task_id), json.dumps(task))
-            self.redis.sadd(self.REDIS_TASK_INDEX, task_id)
+            pipe = self.redis.pipeline()
+            if previous:
+                # Leave indexes for values the task no longer has (e.g. old status)
+                for key in self._index_entries(previous).keys() - self._index_entries(task).keys():
+                    pipe.zrem(key, task_id)
+            self._write_task(pipe, task)
+            await pipe.execute()
         else:
             self._fallback_tasks[task_id] = task
 
-    def _remove_task(self, task_id: str) -> None:
+    async def _remove_task(self, task: Dict[str, Any]) -> None:
+        task_id = task["id"]
         if self.redis:
-            self.redis.delete(self._redis_key(task_id))
-            self.redis.srem(self.REDIS_TASK_INDEX, task_id)
+            pipe = self.redis.pipeline()
+            pipe.delete(self._redis_key(task_id))
+            for key in self._index_entries(task):
+                pipe.zrem(key, task_id)
+            await pipe.execute()
         self._fallback_tasks.pop(task_id, None)
 
-    def _list_task_ids(self) -> List[str]:
-        if self.redis:
-            return list(self.redis.smembers(self.REDIS_TASK_INDEX))
-        return list(self._fallback_tasks.keys())
+    async def _query_redis(
+        self, filters: Dict[str, Any], offset: int, limit: Optional[int]
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """One page of task ids from the indexes, then their hashes, in two round trips.
+
+        Returns the tasks, the match total and how many index entries the page
+        consumed; ids whose hash is gone are skipped but still count, so the
+        next page starts after them.
+        """
+        by_due = bool(filters.get("due_before") or filters.get("due_after"))
+        primary = self._index_key("due" if by_due else "all")
+        extra = [
+            self._index_key(name, filters[field])
+            for field, name in self.INDEXED_FIELDS.items()
+            if filters.get(field)
+        ]
+        low = self._timestamp(filters.get("due_after")) if filters.get("due_after") else "-inf"
+        high = self._timestamp(filters.get("due_before")) if filters.get("due_before") else "+inf"
+
+        source = primary
+        pipe = self.redis.pipeline()
+        if extra:
+            # Intersection keeps the primary index's score (weight 1) for ordering
+            source = self._index_key("query", uuid4().hex)
+            pipe.zinterstore(source, {primary: 1, **{key: 0 for key in extra}})
+        count = limit if limit is not None else -1
+        if by_due:
+            pipe.zrangebyscore(source, low, high, start=offset, num=count)
+        else:
+            pipe.zrevrangebyscore(source, high, low, start=offset, num=count)
+        pipe.zcount(source, low, high)
+        if extra:
+            pipe.delete(source)
+        results = await pipe.execute()
+        task_ids, total = (results[1], results[2]) if extra else (results[0], results[1])
+
+        pipe = self.redis.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(self._redis_key(task_id))
+        tasks = [task for task in map(self._decode_task, await pipe.execute()) if task]
+        return tasks, total, len(task_ids)
+
+    def _query_fallback(
+        self, filters: Dict[str, Any], offset: int, limit: Optional[int]
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        by_due = bool(filters.get("due_before") or filters.get("due_after"))
+        low = self._timestamp(filters.get("due_after")) if filters.get("due_after") else float("-inf")
+        high = self._timestamp(filters.get("due_before")) if filters.get("due_before") else float("inf")
+        matches = []
+        for task in self._fallback_tasks.values():
+            if any(filters.get(field) and task.get(field) != filters[field] for field in self.INDEXED_FIELDS):
+                continue
+            if by_due:
+                due = self._timestamp(task.get("due_date"))
+                if due is None or not low <= due <= high:
+                    continue
+            matches.append(task)
+        if by_due:
+            matches.sort(key=lambda task: self._timestamp(task.get("due_date")))
+        else:
+            matches.sort(key=lambda task: self._timestamp(task.get("created_at")) or 0.0, reverse=True)
+        end = None if limit is None else offset + limit
+        page = matches[offset:end]
+        return page, len(matches), len(page)
 
     def _normalise_status(self, status: Optional[str]) -> str:
         if not status:
@@ -73,8 +251,12 @@ class TaskService:
     def _normalise_project(self, project: Optional[str]) -> str:
         return project or "Unspecified"
 
+    def _ensure_sync_worker(self) -> None:
+        if self.sync_queue:
+            self.sync_queue.start()
+
     def _sync_task_to_airtable(self, task: Dict[str, Any]) -> None:
-        if not self.tasks_table:
+        if not self.sync_queue or not self.tasks_table:
             return
 
         fields = {
@@ -90,19 +272,15 @@ class TaskService:
         }
 
         try:
-            record = self.tasks_table.first(formula=f"{{Task ID}} = '{task['id']}'")
-            if record:
-                self.tasks_table.update(record["id"], fields)
-            else:
-                self.tasks_table.create(fields)
-        except Exception as exc:  # pragma: no cover - network failure
+            self.sync_queue.enqueue_task(task["id"], fields)
+        except Exception as exc:  # pragma: no cover - local disk failure
             brebot_logger.log_error(exc, "TaskService._sync_task_to_airtable")
 
     def _log_event(self, event_type: str, details: Dict[str, Any]) -> None:
-        if not self.events_table:
+        if not self.sync_queue or not self.events_table:
             return
         try:
-            self.events_table.create(
+            self.sync_queue.enqueue_event(
                 {
                     "Event ID": f"event_{uuid4().hex}",
                     "Type": event_type,
@@ -111,7 +289,7 @@ class TaskService:
                     "Timestamp": datetime.utcnow().isoformat(),
                 }
             )
-        except Exception as exc:  # pragma: no cover - network failure
+        except Exception as exc:  # pragma: no cover - local disk failure
             brebot_logger.log_error(exc, "TaskService._log_event")
 
     # ------------------------------------------------------------------
@@ -119,6 +297,8 @@ class TaskService:
     # ------------------------------------------------------------------
     async def create(self, action: TaskAction) -> Dict[str, Any]:
         """Create a new task."""
+        self._ensure_sync_worker()
+        await self._ensure_redis_schema()
         task_id = action.id or f"task_{uuid4().hex}"
         now = datetime.utcnow().isoformat()
 
@@ -137,7 +317,7 @@ class TaskService:
             "result": None,
         }
 
-        self._store_task(task)
+        await self._store_task(task)
         self._sync_task_to_airtable(task)
         self._log_event("task_update", {"action": "create", "task_id": task_id})
 
@@ -146,12 +326,15 @@ class TaskService:
 
     async def update(self, action: TaskAction) -> Dict[str, Any]:
         """Update an existing task."""
+        self._ensure_sync_worker()
+        await self._ensure_redis_schema()
         if not action.id:
             return {"status": "error", "message": "Task ID is required"}
 
-        task = self._load_task(action.id)
+        task = await self._load_task(action.id)
         if not task:
             return {"status": "error", "message": "Task not found"}
+        previous = dict(task)
 
         if action.title:
             task["title"] = action.title
@@ -176,7 +359,7 @@ class TaskService:
             )
         task["updated_at"] = datetime.utcnow().isoformat()
 
-        self._store_task(task)
+        await self._store_task(task, previous)
         self._sync_task_to_airtable(task)
         self._log_event("task_update", {"action": "update", "task_id": action.id})
 
@@ -185,27 +368,75 @@ class TaskService:
 
     async def delete(self, task_id: str) -> Dict[str, Any]:
         """Delete a task."""
-        task = self._load_task(task_id)
+        self._ensure_sync_worker()
+        await self._ensure_redis_schema()
+        task = await self._load_task(task_id)
         if not task:
             return {"status": "error", "message": "Task not found"}
+        stored = dict(task)
 
         task["status"] = "cancelled"
         task["result"] = task.get("result") or "Task cancelled"
         self._sync_task_to_airtable(task)
-        self._remove_task(task_id)
+        await self._remove_task(stored)
         self._log_event("task_update", {"action": "delete", "task_id": task_id})
 
         brebot_logger.log_agent_action("TaskService", "task_deleted", {"task_id": task_id})
         return {"status": "success", "message": "Task deleted"}
 
-    async def list(self) -> Dict[str, Any]:
-        """List all tasks currently tracked."""
-        tasks: List[Dict[str, Any]] = []
-        for task_id in self._list_task_ids():
-            task = self._load_task(task_id)
-            if task:
-                tasks.append(task)
-        return {"status": "success", "tasks": tasks}
+    async def list(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """List tracked tasks, newest first, optionally filtered and paginated.
+
+        ``filters`` may hold ``status``, ``project``, ``assigned_bot``,
+        ``due_before`` and ``due_after`` (ISO dates); a due-date filter orders
+        the result by due date instead. Pass the returned ``next_cursor`` to
+        fetch the following page; without ``limit`` every match is returned.
+        """
+        self._ensure_sync_worker()
+        await self._ensure_redis_schema()
+        filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        unknown = set(filters) - self.LIST_FILTERS
+        if unknown:
+            return {"status": "error", "message": f"Unsupported task filters: {', '.join(sorted(unknown))}"}
+        for key in ("due_before", "due_after"):
+            if key in filters and self._timestamp(filters[key]) is None:
+                return {"status": "error", "message": f"Invalid {key} date: {filters[key]}"}
+        if "status" in filters:
+            filters["status"] = self._normalise_status(filters["status"])
+
+        try:
+            offset = max(int(cursor), 0) if cursor else 0
+        except ValueError:
+            return {"status": "error", "message": f"Invalid cursor: {cursor}"}
+
+        if self.redis:
+            tasks, total, consumed = await self._query_redis(filters, offset, limit)
+        else:
+            tasks, total, consumed = self._query_fallback(filters, offset, limit)
+        next_offset = offset + consumed
+        return {
+            "status": "success",
+            "tasks": tasks,
+            "total": total,
+            "next_cursor": str(next_offset) if limit is not None and next_offset < total else None,
+        }
+
+    async def flush_airtable_sync(self) -> Dict[str, Any]:
+        """Write all queued Airtable changes now (e.g. before shutdown)."""
+        if not self.sync_queue:
+            return {"status": "success", "flushed": {"tasks": 0, "events": 0}}
+        flushed = await self.sync_queue.flush()
+        return {"status": "success", "flushed": flushed, "pending": self.sync_queue.pending()}
+
+    async def close(self) -> None:
+        """Stop the Airtable sync worker after a final flush (call on shutdown)."""
+        if self.sync_queue:
+            await self.sync_queue.stop()
 
 
 # Global instance
@@ -0,0 +1,295 @@
+"""Durable write-behind queue that syncs tasks and task events to Airtable."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from utils import brebot_logger
+from utils.rate_limiter import backoff_delay
+
+TASK_KEY_FIELD = "Task ID"
+# Airtable accepts at most 10 records per create request
+AIRTABLE_CHUNK_SIZE = 10
+
+
+class TaskSyncQueue:
+    """SQLite-backed outbox for Airtable task upserts and event rows.
+
+    Task mutations are coalesced per task id: only the latest field set is
+    kept, so a task edited ten times between flushes costs one write. A
+    background worker flushes due entries every ``flush_interval`` seconds
+    with 10-record batch calls. Task rows go through ``batch_upsert``: a
+    cached Airtable record id is sent when known, otherwise Airtable
+    matches on the "Task ID" field, so no lookup request is needed. Failed
+    entries stay queued with jittered backoff and survive restarts.
+
+    Flushes are serialized by a lock: the worker's executor thread, ``stop``
+    and the exit hook may all try to flush, and two flushers reading the
+    same event rows would create them in Airtable twice.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        tasks_table: Any = None,
+        events_table: Any = None,
+        flush_interval: float = 2.0,
+        batch_size: int = 100,
+    ):
+        self.db_path = Path(db_path)
+        self.tasks_table = tasks_table
+        self.events_table = events_table
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.coalesced = 0
+        self._worker: Optional[asyncio.Task] = None
+        self._flush_lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS task_sync (
+                    task_id TEXT PRIMARY KEY,
+                    fields TEXT NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 1,
+                    enqueued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT
+                );
+                CREATE TABLE IF NOT EXISTS event_sync (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fields TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT
+                );
+                CREATE TABLE IF NOT EXISTS record_ids (
+                    task_id TEXT PRIMARY KEY,
+                    record_id TEXT NOT NULL
+                );
+                """
+            )
+        # Short-lived callers (CLI tools, scripts under asyncio.run) never call
+        # stop(); send what they queued before the interpreter exits
+        atexit.register(self._flush_at_exit)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Enqueueing (called from the request path; local SQLite writes only)
+    # ------------------------------------------------------------------
+    def enqueue_task(self, task_id: str, fields: Dict[str, Any]) -> None:
+        if not self.tasks_table:
+            return
+        with self._connect() as conn:
+            exists = conn.execute("SELECT 1 FROM task_sync WHERE task_id = ?", (task_id,)).fetchone()
+            conn.execute(
+                """
+                INSERT INTO task_sync (task_id, fields, enqueued_at) VALUES (?, ?, ?)
+                ON CONFLICT(task_id) DO UPDATE SET
+                    fields = excluded.fields,
+                    version = task_sync.version + 1,
+                    enqueued_at = excluded.enqueued_at
+                """,
+                (task_id, json.dumps(fields), time.time()),
+            )
+        if exists:
+            self.coalesced += 1
+
+    def enqueue_event(self, fields: Dict[str, Any]) -> None:
+        if not self.events_table:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO event_sync (fields, enqueued_at) VALUES (?, ?)",
+                (json.dumps(fields), time.time()),
+            )
+
+    def pending(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            tasks = conn.execute("SELECT COUNT(*) FROM task_sync").fetchone()[0]
+            events = conn.execute("SELECT COUNT(*) FROM event_sync").fetchone()[0]
+        return {"tasks": tasks, "events": events, "coalesced": self.coalesced}
+
+    # ------------------------------------------------------------------
+    # Flushing (blocking; runs in an executor)
+    # ------------------------------------------------------------------
+    def _retry_at(self, attempts: int) -> float:
+        return time.time() + backoff_delay(attempts)
+
+    def _flush_tasks_sync(self) -> int:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT s.task_id, s.fields, s.version, s.attempts, r.record_id
+                FROM task_sync s LEFT JOIN record_ids r ON r.task_id = s.task_id
+                WHERE s.next_attempt_at <= ?
+                ORDER BY s.enqueued_at
+                LIMIT ?
+                """,
+                (time.time(), self.batch_size),
+            ).fetchall()
+        if not rows:
+            return 0
+
+        records = []
+        for task_id, fields, _, _, record_id in rows:
+            record: Dict[str, Any] = {"fields": json.loads(fields)}
+            if record_id:
+                record["id"] = record_id
+            records.append(record)
+
+        try:
+            result = self.tasks_table.batch_upsert(records, key_fields=[TASK_KEY_FIELD])
+        except Exception as exc:
+            brebot_logger.log_error(exc, "TaskSyncQueue._flush_tasks_sync")
+            with self._connect() as conn:
+                for task_id, _, _, attempts, record_id in rows:
+                    conn.execute(
+                        "UPDATE task_sync SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE task_id = ?",
+                        (attempts + 1, self._retry_at(attempts), str(exc)[:500], task_id),
+                    )
+                    if record_id:
+                        # The cached id may point at a deleted record; match on Task ID next time
+                        conn.execute("DELETE FROM record_ids WHERE task_id = ?", (task_id,))
+            return 0
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO record_ids (task_id, record_id) VALUES (?, ?)",
+                [
+                    (record["fields"][TASK_KEY_FIELD], record["id"])
+                    for record in result.get("records", [])
+                    if record.get("fields", {}).get(TASK_KEY_FIELD)
+                ],
+            )
+            # Rows re-queued while the upsert was in flight keep their newer version
+            conn.executemany(
+                "DELETE FROM task_sync WHERE task_id = ? AND version = ?",
+                [(task_id, version) for task_id, _, version, _, _ in rows],
+            )
+        return len(rows)
+
+    def _flush_events_sync(self) -> int:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, fields, attempts FROM event_sync WHERE next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (time.time(), self.batch_size),
+            ).fetchall()
+        if not rows:
+            return 0
+
+        # One request per chunk, deleting each chunk as soon as Airtable has it,
+        # so a failure part-way only re-queues rows that were never sent
+        sent = 0
+        for start in range(0, len(rows), AIRTABLE_CHUNK_SIZE):
+            chunk = rows[start:start + AIRTABLE_CHUNK_SIZE]
+            try:
+                self.events_table.batch_create([json.loads(fields) for _, fields, _ in chunk])
+            except Exception as exc:
+                brebot_logger.log_error(exc, "TaskSyncQueue._flush_events_sync")
+                with self._connect() as conn:
+                    conn.executemany(
+                        "UPDATE event_sync SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                        [
+                            (attempts + 1, self._retry_at(attempts), str(exc)[:500], row_id)
+                            for row_id, _, attempts in rows[start:]
+                        ],
+                    )
+                return sent
+
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM event_sync WHERE id = ?", [(row_id,) for row_id, _, _ in chunk])
+            sent += len(chunk)
+        return sent
+
+    def flush_sync(self) -> Dict[str, int]:
+        """Send everything that is due; returns the number of tasks and events written.
+
+        Blocks while another flush is running, so rows are never sent twice.
+        """
+        flushed = {"tasks": 0, "events": 0}
+        with self._flush_lock:
+            if self.tasks_table:
+                while True:
+                    count = self._flush_tasks_sync()
+                    flushed["tasks"] += count
+                    if count < self.batch_size:
+                        break
+            if self.events_table:
+                while True:
+                    count = self._flush_events_sync()
+                    flushed["events"] += count
+                    if count < self.batch_size:
+                        break
+        return flushed
+
+    async def flush(self) -> Dict[str, int]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.flush_sync)
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Start the flush loop on the running event loop (no-op if already running)."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._worker.get_loop() is loop:
+            return
+        self._worker = loop.create_task(self._run())
+        brebot_logger.log_agent_action(
+            "TaskSyncQueue",
+            "worker_started",
+            {"flush_interval": self.flush_interval, **self.pending()},
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                flushed = await self.flush()
+                if flushed["tasks"] or flushed["events"]:
+                    brebot_logger.log_agent_action("TaskSyncQueue", "flushed", flushed)
+            except Exception as exc:  # pragma: no cover - keep the worker alive
+                brebot_logger.log_error(exc, "TaskSyncQueue._run")
+            await asyncio.sleep(self.flush_interval)
+
+    async def stop(self) -> None:
+        """Stop the worker after a final flush; anything still failing stays queued.
+
+        Cancelling the worker doesn't stop a flush already running in the
+        executor; the final flush waits for it on the flush lock.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        await self.flush()
+
+    def _flush_at_exit(self) -> None:
+        try:
+            flushed = self.flush_sync()
+            if flushed["tasks"] or flushed["events"]:
+                brebot_logger.log_agent_action("TaskSyncQueue", "flushed_at_exit", flushed)
+        except Exception as exc:  # pragma: no cover - entries stay queued for the next run
+            brebot_logger.log_error(exc, "TaskSyncQueue._flush_at_exit")
@@ -0,0 +1,175 @@
+"""
+Per-platform circuit breakers for integration calls.
+
+While a platform is down every call would otherwise wait for the full
+timeout (and its retries). A breaker counts consecutive failures; at the
+threshold it opens and calls fail immediately with ``CircuitOpenError``.
+After the cool-down it goes half-open and lets a limited number of probe
+calls through: one success closes it again, one failure re-opens it.
+
+Only availability failures count (connection errors, timeouts, 5xx);
+client errors such as 404 or 429 mean the platform is up.
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+from utils import metrics
+from utils.logger import brebot_logger
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Gauge values for brebot_circuit_state
+STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a platform whose circuit is open."""
+
+    def __init__(self, platform: str, retry_in: float):
+        self.platform = platform
+        self.retry_in = retry_in
+        super().__init__(f"{platform} circuit open; retry in {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with closed/open/half-open states."""
+
+    def __init__(
+        self,
+        platform: str,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.platform = platform
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._last_error: Optional[str] = None
+        self._opened_count = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state is self._state:
+            return
+        previous, self._state = self._state, state
+        metrics.CIRCUIT_STATE.labels(platform=self.platform).set(STATE_GAUGE_VALUES[state])
+        brebot_logger.log_agent_action(
+            "CircuitBreaker",
+            "state_changed",
+            {"platform": self.platform, "from": previous.value, "to": state.value, "error": self._last_error},
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self._set_state(CircuitState.HALF_OPEN)
+                self._probes_in_flight = 0
+            return self._state
+
+    def allow(self) -> None:
+        """Admit a call or raise ``CircuitOpenError``; pair with one record_* call."""
+        state = self.state
+        with self._lock:
+            if state is CircuitState.OPEN:
+                self._rejected += 1
+                retry_in = self.cooldown_seconds - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.platform, max(0.0, retry_in))
+            if state is CircuitState.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.platform, 0.0)
+                self._probes_in_flight += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes_in_flight = 0
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            if error:
+                self._last_error = error
+            if self._state is CircuitState.OPEN:
+                # A call that was in flight when the breaker tripped; the
+                # cool-down keeps counting from the original trip
+                return
+            if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._opened_count += 1
+                self._probes_in_flight = 0
+                self._set_state(CircuitState.OPEN)
+
+    def record_abandoned(self) -> None:
+        """Release a half-open probe slot for a call that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            retry_in = None
+            if state is CircuitState.OPEN:
+                retry_in = round(max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at)), 1)
+            return {
+                "state": state.value,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "cooldown_seconds": self.cooldown_seconds,
+                "retry_in_seconds": retry_in,
+                "times_opened": self._opened_count,
+                "rejected_calls": self._rejected,
+                "last_error": self._last_error,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(platform: str) -> CircuitBreaker:
+    """The shared breaker for ``platform``, created from settings on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(platform)
+        if breaker is None:
+            breaker = _breakers[platform] = CircuitBreaker(
+                platform,
+                failure_threshold=settings.circuit_failure_threshold,
+                cooldown_seconds=settings.circuit_cooldown_seconds,
+                half_open_max_calls=settings.circuit_half_open_max_calls,
+            )
+        return breaker
+
+
+def circuit_snapshots() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.platform: breaker.snapshot() for breaker in breakers}
+
+
+__all__ = [
+    "CircuitState",
+    "CircuitOpenError",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "circuit_snapshots",
+]
@@ -0,0 +1,264 @@
+"""
+Shared, long-lived HTTP clients for the integration services.
+
+Creating an ``httpx.AsyncClient`` per call means a fresh TCP connection and
+TLS handshake for every API request. Instead each platform gets one client
+whose connection pool is reused across calls. HTTP/2 is negotiated when the
+``h2`` package is installed (for https endpoints; ALPN falls back to
+HTTP/1.1 where a server does not offer it).
+
+``request`` is the single entry point the services use: it checks the
+platform's circuit breaker, takes a slot from its rate limiter, sends on the
+pooled client and retries 429s, gateway errors and connection failures with
+jittered backoff. Identical GETs that overlap in time are coalesced into one
+upstream call whose response every caller receives.
+
+An ``AsyncClient`` is bound to the event loop it first ran on, so clients
+are keyed by platform and loop: CLI commands that call ``asyncio.run``
+repeatedly get a fresh pool per loop instead of a client tied to a closed
+loop.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from config.settings import settings
+from utils import metrics
+from utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from utils.logger import brebot_logger
+from utils.rate_limiter import backoff_delay, get_rate_limiter, parse_retry_after
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Gateway errors worth retrying when resending cannot duplicate a write
+RETRY_STATUSES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Reads that may share one in-flight upstream call
+COALESCED_METHODS = {"GET", "HEAD"}
+
+_inflight: Dict[Tuple[Any, ...], "asyncio.Task[httpx.Response]"] = {}
+
+_clients: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_lock = threading.Lock()
+
+
+def create_client(**overrides) -> httpx.AsyncClient:
+    """Build an AsyncClient with the configured pool limits, keepalive and timeout."""
+    options = {
+        "http2": settings.http_client_http2 and HTTP2_AVAILABLE,
+        "limits": httpx.Limits(
+            max_connections=settings.http_pool_max_connections,
+            max_keepalive_connections=settings.http_pool_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(settings.http_client_timeout),
+    }
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+def get_http_client(platform: str) -> httpx.AsyncClient:
+    """Return the pooled client for ``platform`` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    key = (platform, id(loop))
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        # Drop clients whose loop has gone away (id() values can be reused)
+        for stale_key, (stale_loop, _) in list(_clients.items()):
+            if stale_loop.is_closed():
+                del _clients[stale_key]
+
+        client = create_client()
+        _clients[key] = (loop, client)
+
+    brebot_logger.log_agent_action(
+        "HttpClients",
+        "client_created",
+        {
+            "platform": platform,
+            "http2": settings.http_client_http2 and HTTP2_AVAILABLE,
+            "max_connections": settings.http_pool_max_connections,
+        },
+    )
+    return client
+
+
+async def _send_once(
+    client: httpx.AsyncClient,
+    breaker: CircuitBreaker,
+    limiter,
+    method: str,
+    url: str,
+    **kwargs,
+) -> httpx.Response:
+    """One attempt: breaker admission, rate-limit slot, send, record the outcome."""
+    breaker.allow()
+    try:
+        if limiter is not None:
+            await limiter.acquire()
+        response = await client.request(method, url, **kwargs)
+    except httpx.TransportError as e:
+        breaker.record_failure(f"{type(e).__name__}: {e}")
+        raise
+    except BaseException:
+        breaker.record_abandoned()
+        raise
+    if response.status_code >= 500:
+        breaker.record_failure(f"HTTP {response.status_code}")
+    else:
+        breaker.record_success()
+    return response
+
+
+def _coalesce_key(platform: str, method: str, url: str, credential: Optional[str], kwargs: Dict[str, Any]):
+    """Identity of a read for single-flight purposes, or None if it must not be shared."""
+    if method.upper() not in COALESCED_METHODS or set(kwargs) - {"params", "headers"}:
+        return None
+    params = kwargs.get("params") or {}
+    params_items = tuple(sorted((str(k), str(v)) for k, v in dict(params).items()))
+    headers_items = tuple(sorted((kwargs.get("headers") or {}).items()))
+    # Credentials are fingerprinted rather than kept in the key
+    fingerprint = hashlib.sha256(repr((credential, headers_items)).encode()).hexdigest()[:16]
+    return (id(asyncio.get_running_loop()), platform, method.upper(), url, params_items, fingerprint)
+
+
+async def request(
+    platform: str,
+    method: str,
+    url: str,
+    credential: Optional[str] = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send an integration request; concurrent identical GETs share one call.
+
+    The shared call runs in its own task, so a caller that is cancelled does
+    not cancel it for the others. See ``_request_with_retries`` for the
+    rate-limit, retry and circuit-breaker policy.
+    """
+    key = _coalesce_key(platform, method, url, credential, kwargs)
+    if key is None:
+        return await _request_with_retries(platform, method, url, credential, **kwargs)
+
+    task = _inflight.get(key)
+    if task is not None and not task.done():
+        metrics.INTEGRATION_COALESCED.labels(platform=platform).inc()
+        return await asyncio.shield(task)
+
+    def _forget(done: asyncio.Task) -> None:
+        if _inflight.get(key) is done:
+            del _inflight[key]
+        if not done.cancelled():
+            done.exception()  # mark retrieved even if every caller was cancelled
+
+    task = asyncio.create_task(_request_with_retries(platform, method, url, credential, **kwargs))
+    _inflight[key] = task
+    task.add_done_callback(_forget)
+    return await asyncio.shield(task)
+
+
+async def _request_with_retries(
+    platform: str,
+    method: str,
+    url: str,
+    credential: Optional[str] = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a rate-limited request on the platform's pooled client, with retries.
+
+    429s are always retried (the server rejected the request), honouring
+    ``Retry-After`` and slowing the platform's limiter. Gateway errors and
+    timeouts are retried only for idempotent methods; connection failures are
+    retried for any method since nothing was sent. The final response is
+    returned as-is for the caller's ``raise_for_status``. Raises
+    ``CircuitOpenError`` without sending while the platform's circuit is open.
+    """
+    client = get_http_client(platform)
+    breaker = get_circuit_breaker(platform)
+    limiter = get_rate_limiter(platform, credential)
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempts = settings.integration_max_retries + 1
+
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            response = await _send_once(client, breaker, limiter, method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            if last_attempt:
+                raise
+            reason, delay = type(e).__name__, backoff_delay(attempt)
+        except httpx.TransportError as e:
+            if last_attempt or not idempotent:
+                raise
+            reason, delay = type(e).__name__, backoff_delay(attempt)
+        else:
+            status = response.status_code
+            if status == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if limiter is not None:
+                    # The limiter now holds every caller until Retry-After has passed
+                    limiter.penalize(retry_after)
+                    retry_after = None
+                if last_attempt:
+                    return response
+                reason, delay = "429", backoff_delay(attempt, retry_after)
+            elif status in RETRY_STATUSES and idempotent and not last_attempt:
+                reason, delay = str(status), backoff_delay(attempt)
+            else:
+                if limiter is not None and status < 500:
+                    limiter.reward()
+                return response
+
+        metrics.INTEGRATION_RETRIES.labels(platform=platform, reason=reason).inc()
+        brebot_logger.log_agent_action(
+            "HttpClients",
+            "request_retry",
+            {"platform": platform, "method": method, "reason": reason, "attempt": attempt + 1, "delay": round(delay, 3)},
+        )
+        await asyncio.sleep(delay)
+
+    raise RuntimeError("unreachable")  # pragma: no cover - loop always returns or raises
+
+
+def payload_size(response: httpx.Response) -> int:
+    """Bytes sent and received for a buffered request/response pair."""
+    try:
+        sent = len(response.request.content)
+    except (RuntimeError, httpx.RequestNotRead):
+        sent = 0  # streamed upload, or a response built without a request
+    return sent + len(response.content)
+
+
+async def close_http_clients() -> None:
+    """Close every client created on the running loop (called on app shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        owned = [(key, client) for key, (client_loop, client) in _clients.items() if client_loop is loop]
+        for key, _ in owned:
+            del _clients[key]
+
+    for (platform, _), client in owned:
+        try:
+            await client.aclose()
+        except Exception as e:
+            brebot_logger.log_error(e, context=f"http_clients.close.{platform}")
+
+
+__all__ = [
+    "HTTP2_AVAILABLE",
+    "create_client",
+    "get_http_client",
+    "request",
+    "payload_size",
+    "close_http_clients",
+]
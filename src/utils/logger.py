@@ -3,11 +3,15 @@ Logging configuration for Brebot.
 Provides structured logging with different levels and outputs.
 """
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Callable, List, Optional, Union
+from datetime import datetime, timedelta
 import json
 
 from loguru import logger
@@ -17,6 +21,165 @@ from rich.logging import RichHandler
 from config.settings import settings
 
 
+_SIZE_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def _parse_size(value: str) -> int:
+    """Convert a size such as "10MB" to bytes."""
+    value = value.strip().upper()
+    for unit, factor in _SIZE_UNITS.items():
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * factor)
+    return int(value)
+
+
+class QueuedLogSink(ABC):
+    """
+    Loguru sink that hands messages to a writer thread.
+    
+    The calling thread only enqueues the message; rendering and I/O happen on
+    the writer thread, which drains the queue in batches. When the queue is
+    full, messages are dropped and counted rather than blocking the caller.
+    """
+    
+    def __init__(self, max_queue: int = 10000):
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=f"brebot-{type(self).__name__}", daemon=True)
+        self._thread.start()
+    
+    def __call__(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+    
+    def _render(self, message) -> str:
+        return str(message)
+    
+    @abstractmethod
+    def _write(self, text: str):
+        """Write one rendered message; implemented by each sink."""
+        pass
+    
+    def _close(self):
+        pass
+    
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # Drain whatever queued up meanwhile and write it in one go
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            
+            chunk = []
+            for message in batch:
+                if message is None:
+                    continue
+                try:
+                    chunk.append(self._render(message))
+                except Exception as exc:  # never let one bad record stop the writer
+                    chunk.append(f"unrenderable log record: {exc}\n")
+            if self.dropped:
+                chunk.append(f"log queue full, dropped {self.dropped} messages\n")
+                self.dropped = 0
+            if chunk:
+                self._write("".join(chunk))
+        self._close()
+    
+    def stop(self, timeout: float = 5.0):
+        """Flush queued messages and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+class QueuedStreamSink(QueuedLogSink):
+    """Already-formatted messages written to a stream (stdout) off the calling thread."""
+    
+    def __init__(self, stream, max_queue: int = 10000):
+        self.stream = stream
+        super().__init__(max_queue)
+    
+    def _write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
+
+
+class QueuedFileSink(QueuedLogSink):
+    """
+    Size-rotated log file written off the calling thread.
+    
+    With ``serialize=True`` each record becomes one compact JSON line built on
+    the writer thread from the record's ``extra`` (a callable ``details`` is
+    only evaluated there); otherwise loguru's formatted text is written as is.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        serialize: bool = False,
+        max_bytes: int = 10 * 1024 ** 2,
+        retention_days: int = 7,
+        max_queue: int = 10000
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.serialize = serialize
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self._file = open(self.path, "a", encoding="utf-8")
+        super().__init__(max_queue)
+    
+    def _render(self, message) -> str:
+        if not self.serialize:
+            return str(message)
+        
+        record = message.record
+        entry = {
+            "ts": record["time"].isoformat(),
+            "level": record["level"].name,
+            "src": f"{record['name']}:{record['function']}:{record['line']}",
+            "msg": record["message"]
+        }
+        # BrebotLogger passes its structured data as ``extra=...``, which loguru
+        # nests one level down; flatten it so fields sit at the top level
+        extra = dict(record["extra"])
+        extra.update(extra.pop("extra", None) or {})
+        for key, value in extra.items():
+            if key == "timestamp":
+                continue  # duplicate of ts
+            entry[key] = value() if callable(value) else value
+        if record["exception"]:
+            entry["exception"] = repr(record["exception"].value)
+        return json.dumps(entry, default=str, ensure_ascii=False, separators=(",", ":")) + "\n"
+    
+    def _write(self, text: str):
+        self._file.write(text)
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        """Roll the file over and prune rollovers older than the retention period."""
+        self._file.close()
+        self.path.rename(self.path.with_name(f"{self.path.name}.{datetime.now():%Y%m%d_%H%M%S_%f}"))
+        self._file = open(self.path, "a", encoding="utf-8")
+        
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).timestamp()
+        for old in self.path.parent.glob(f"{self.path.name}.*"):
+            if old.stat().st_mtime < cutoff:
+                old.unlink(missing_ok=True)
+    
+    def _close(self):
+        self._file.close()
+
+
 class BrebotLogger:
     """Custom logger for Brebot with structured logging capabilities."""
     
@@ -31,12 +194,15 @@ class BrebotLogger:
         self.name = name
         self.log_level = log_level or settings.log_level
         self.console = Console()
+        self._queued_sinks: List[QueuedLogSink] = []
+        self._min_level_no = 0
         
         # Remove default loguru handler
         logger.remove()
         
         # Configure logging
         self._setup_logging()
+        atexit.register(self.shutdown)
     
     def _setup_logging(self):
         """Set up logging configuration."""
@@ -44,27 +210,71 @@ class BrebotLogger:
         log_file_path = Path(settings.log_file)
         log_file_path.parent.mkdir(parents=True, exist_ok=True)
         
+        console_level = (settings.log_console_level or self.log_level).upper()
+        file_level = (settings.log_file_level or self.log_level).upper()
+        console_format = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+        file_format = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+        
         # Console handler with Rich formatting
-        logger.add(
-            sys.stdout,
-            level=self.log_level,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            colorize=True,
-            backtrace=True,
-            diagnose=True
-        )
+        if settings.log_async:
+            self._queued_sinks.append(QueuedStreamSink(sys.stdout))
+            logger.add(
+                self._queued_sinks[-1],
+                level=console_level,
+                format=console_format,
+                colorize=True,
+                backtrace=True,
+                diagnose=settings.log_diagnose
+            )
+        else:
+            logger.add(
+                sys.stdout,
+                level=console_level,
+                format=console_format,
+                colorize=True,
+                backtrace=True,
+                diagnose=settings.log_diagnose
+            )
         
-        # File handler with JSON formatting
-        logger.add(
-            log_file_path,
-            level=self.log_level,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            rotation=settings.log_max_size,
-            retention=f"{settings.log_retention} days",
-            compression="zip",
-            backtrace=True,
-            diagnose=True
-        )
+        # Main log file: compact JSON lines, or the classic text format
+        if settings.log_format == "json":
+            self._queued_sinks.append(QueuedFileSink(
+                log_file_path.with_suffix(".jsonl"),
+                serialize=True,
+                max_bytes=_parse_size(settings.log_max_size),
+                retention_days=settings.log_retention
+            ))
+            logger.add(
+                self._queued_sinks[-1],
+                level=file_level,
+                format="{message}",
+                backtrace=True,
+                diagnose=settings.log_diagnose
+            )
+        elif settings.log_async:
+            self._queued_sinks.append(QueuedFileSink(
+                log_file_path,
+                max_bytes=_parse_size(settings.log_max_size),
+                retention_days=settings.log_retention
+            ))
+            logger.add(
+                self._queued_sinks[-1],
+                level=file_level,
+                format=file_format,
+                backtrace=True,
+                diagnose=settings.log_diagnose
+            )
+        else:
+            logger.add(
+                log_file_path,
+                level=file_level,
+                format=file_format,
+                rotation=settings.log_max_size,
+                retention=f"{settings.log_retention} days",
+                compression="zip",
+                backtrace=True,
+                diagnose=settings.log_diagnose
+            )
         
         # Error file handler
         error_log_path = log_file_path.parent / "brebot_errors.log"
@@ -76,23 +286,45 @@ class BrebotLogger:
             retention="30 days",
             compression="zip",
             backtrace=True,
-            diagnose=True
+            diagnose=settings.log_diagnose
+        )
+        
+        self._min_level_no = min(
+            logger.level(level).no for level in (console_level, file_level, "ERROR")
         )
     
-    def log_agent_action(self, agent_name: str, action: str, details: dict = None):
+    def is_enabled(self, level: str) -> bool:
+        """Whether any sink accepts ``level``; lets hot paths skip building log data."""
+        return logger.level(level).no >= self._min_level_no
+    
+    def shutdown(self):
+        """Drain queued log records (async mode) before the process exits."""
+        for sink in self._queued_sinks:
+            sink.stop()
+    
+    def log_agent_action(
+        self,
+        agent_name: str,
+        action: str,
+        details: Union[dict, Callable[[], dict], None] = None
+    ):
         """
         Log agent actions with structured format.
         
         Args:
             agent_name: Name of the agent performing the action
             action: Action being performed
-            details: Additional details about the action
+            details: Additional details about the action, or a callable
+                returning them (evaluated only if a sink formats the record)
         """
+        if not self.is_enabled("INFO"):
+            return
+        
         log_data = {
             "timestamp": datetime.now().isoformat(),
             "agent": agent_name,
             "action": action,
-            "details": details or {}
+            "details": details if callable(details) else details or {}
         }
         
         logger.info(f"🤖 Agent Action: {agent_name} - {action}", extra=log_data)
@@ -107,6 +339,10 @@ class BrebotLogger:
             output: Output from the tool
             success: Whether the tool execution was successful
         """
+        level = "INFO" if success else "ERROR"
+        if not self.is_enabled(level):
+            return
+        
         log_data = {
             "timestamp": datetime.now().isoformat(),
             "tool": tool_name,
@@ -115,7 +351,6 @@ class BrebotLogger:
             "success": success
         }
         
-        level = "INFO" if success else "ERROR"
         logger.log(level, f"🔧 Tool Usage: {tool_name}", extra=log_data)
     
     def log_crew_activity(self, crew_name: str, activity: str, details: dict = None):
@@ -127,6 +362,9 @@ class BrebotLogger:
             activity: Activity being performed
             details: Additional details
         """
+        if not self.is_enabled("INFO"):
+            return
+        
         log_data = {
             "timestamp": datetime.now().isoformat(),
             "crew": crew_name,
@@ -136,19 +374,21 @@ class BrebotLogger:
         
         logger.info(f"👥 Crew Activity: {crew_name} - {activity}", extra=log_data)
     
-    def log_error(self, error: Exception, context: str = None):
+    def log_error(self, error: Exception, context: str = None, details: dict = None):
         """
         Log errors with full context.
         
         Args:
             error: Exception that occurred
             context: Additional context about where the error occurred
+            details: Optional structured data about the failed operation
         """
         log_data = {
             "timestamp": datetime.now().isoformat(),
             "error_type": type(error).__name__,
             "error_message": str(error),
-            "context": context
+            "context": context,
+            "details": details or {}
         }
         
         logger.opt(exception=True).error(
@@ -165,6 +405,9 @@ class BrebotLogger:
             duration: Duration in seconds
             details: Additional performance details
         """
+        if not self.is_enabled("INFO"):
+            return
+        
         log_data = {
             "timestamp": datetime.now().isoformat(),
             "operation": operation,
@@ -246,4 +489,4 @@ def log_function_call(func):
 
 
 # Export the main logger
-__all__ = ["BrebotLogger", "brebot_logger", "get_logger", "log_function_call"]
+__all__ = ["BrebotLogger", "QueuedFileSink", "QueuedStreamSink", "brebot_logger", "get_logger", "log_function_call"]
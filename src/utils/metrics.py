@@ -0,0 +1,234 @@
+"""
+Prometheus metrics for Brebot.
+
+Metrics are defined once here and updated from the hot paths (web routes,
+action dispatch, memory, Ollama, ingestion, websockets). Histograms use a
+small fixed set of buckets so observing is a couple of comparisons and a
+lock, cheap enough to leave on in production. When ``prometheus_client`` is
+not installed every metric is a no-op and ``/metrics`` reports that.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set, Tuple
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Latency buckets (seconds) shared by request-scale histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Ollama generations are much slower than everything else
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Result-count buckets for searches
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is unavailable."""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+
+def _histogram(name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+def _gauge(name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Gauge(name, documentation, labelnames)
+
+
+# Web
+HTTP_REQUEST_SECONDS = _histogram(
+    "brebot_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+WEBSOCKET_CLIENTS = _gauge("brebot_websocket_clients", "Connected dashboard websocket clients")
+WEBSOCKET_BROADCAST_SECONDS = _histogram(
+    "brebot_websocket_broadcast_duration_seconds",
+    "Time to send one broadcast to every websocket client",
+)
+
+# Action routing
+ACTION_DISPATCH_SECONDS = _histogram(
+    "brebot_action_dispatch_duration_seconds",
+    "route_action dispatch time by action type",
+    ("action_type",),
+)
+
+# Memory
+MEMORY_OPERATION_SECONDS = _histogram(
+    "brebot_memory_operation_duration_seconds",
+    "MemoryService operation latency",
+    ("operation", "backend"),
+)
+MEMORY_SEARCH_RESULTS = _histogram(
+    "brebot_memory_search_results",
+    "Results returned per MemoryService search",
+    ("backend",),
+    buckets=COUNT_BUCKETS,
+)
+
+# Ollama
+OLLAMA_REQUEST_SECONDS = _histogram(
+    "brebot_ollama_request_duration_seconds",
+    "Ollama API call latency",
+    ("model", "endpoint", "outcome"),
+    buckets=LLM_BUCKETS,
+)
+OLLAMA_TOKENS = _counter(
+    "brebot_ollama_tokens_total",
+    "Tokens processed by Ollama",
+    ("model", "kind"),
+)
+
+# Ingestion
+INGESTION_CHUNKS = _counter("brebot_ingestion_chunks_total", "Chunks embedded by ingestion runs")
+INGESTION_CHUNKS_PER_SECOND = _gauge(
+    "brebot_ingestion_chunks_per_second",
+    "Throughput of the most recent ingestion run",
+)
+
+# Integrations
+RATE_LIMIT_WAIT_SECONDS = _histogram(
+    "brebot_integration_rate_limit_wait_seconds",
+    "Time integration calls queued for a rate-limit slot",
+    ("platform",),
+)
+RATE_LIMIT_RATE = _gauge(
+    "brebot_integration_rate_limit_rps",
+    "Current adaptive request rate per platform",
+    ("platform",),
+)
+INTEGRATION_RETRIES = _counter(
+    "brebot_integration_retries_total",
+    "Integration API calls retried",
+    ("platform", "reason"),
+)
+INTEGRATION_COALESCED = _counter(
+    "brebot_integration_coalesced_requests_total",
+    "Upstream integration calls saved by sharing an identical in-flight GET",
+    ("platform",),
+)
+CIRCUIT_STATE = _gauge(
+    "brebot_circuit_state",
+    "Integration circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ("platform",),
+)
+
+# Bot queue
+BOT_QUEUE_DEPTH = _gauge("brebot_bot_queue_depth", "Tasks waiting in the bot queue", ("bot_type",))
+BOT_TASKS_IN_FLIGHT = _gauge("brebot_bot_tasks_in_flight", "Bot tasks leased to a worker", ("bot_type",))
+BOT_LEASE_EXPIRATIONS = _gauge(
+    "brebot_bot_lease_expirations",
+    "Bot task leases that expired and were reclaimed (cumulative, read from Redis)",
+    ("bot_type",),
+)
+BOT_DEAD_LETTER_DEPTH = _gauge("brebot_bot_dead_letter_depth", "Bot tasks parked in the dead-letter queue")
+
+
+@contextmanager
+def observe_seconds(histogram, **labels) -> Iterator[None]:
+    """Time the enclosed block into ``histogram`` (labels applied if given)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric = histogram.labels(**labels) if labels else histogram
+        metric.observe(time.perf_counter() - started)
+
+
+def record_ollama_usage(model: str, response: Dict) -> None:
+    """Count prompt/completion tokens reported by an Ollama /api/generate or /api/chat reply."""
+    prompt_tokens = response.get("prompt_eval_count")
+    completion_tokens = response.get("eval_count")
+    if prompt_tokens:
+        OLLAMA_TOKENS.labels(model=model, kind="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        OLLAMA_TOKENS.labels(model=model, kind="completion").inc(completion_tokens)
+
+
+_seen_bot_types: Set[str] = set()
+
+
+def set_bot_queue_depths(depths: Dict[str, int]) -> None:
+    """Publish per-bot-type queue depth gathered at scrape time (drained types drop to 0)."""
+    _seen_bot_types.update(depths)
+    for bot_type in _seen_bot_types:
+        BOT_QUEUE_DEPTH.labels(bot_type=bot_type).set(depths.get(bot_type, 0))
+
+
+def set_bot_lease_stats(in_flight: Dict[str, int], lease_expirations: Dict[str, int], dead_letter: int) -> None:
+    """Publish leased-task counts, lease expirations and dead-letter depth gathered at scrape time."""
+    _seen_bot_types.update(in_flight)
+    _seen_bot_types.update(lease_expirations)
+    for bot_type in _seen_bot_types:
+        BOT_TASKS_IN_FLIGHT.labels(bot_type=bot_type).set(in_flight.get(bot_type, 0))
+        BOT_LEASE_EXPIRATIONS.labels(bot_type=bot_type).set(lease_expirations.get(bot_type, 0))
+    BOT_DEAD_LETTER_DEPTH.set(dead_letter)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Return the exposition payload and its content type."""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+__all__ = [
+    "PROMETHEUS_AVAILABLE",
+    "HTTP_REQUEST_SECONDS",
+    "WEBSOCKET_CLIENTS",
+    "WEBSOCKET_BROADCAST_SECONDS",
+    "ACTION_DISPATCH_SECONDS",
+    "MEMORY_OPERATION_SECONDS",
+    "MEMORY_SEARCH_RESULTS",
+    "OLLAMA_REQUEST_SECONDS",
+    "OLLAMA_TOKENS",
+    "INGESTION_CHUNKS",
+    "INGESTION_CHUNKS_PER_SECOND",
+    "RATE_LIMIT_WAIT_SECONDS",
+    "RATE_LIMIT_RATE",
+    "INTEGRATION_RETRIES",
+    "INTEGRATION_COALESCED",
+    "CIRCUIT_STATE",
+    "BOT_QUEUE_DEPTH",
+    "BOT_TASKS_IN_FLIGHT",
+    "BOT_LEASE_EXPIRATIONS",
+    "BOT_DEAD_LETTER_DEPTH",
+    "observe_seconds",
+    "record_ollama_usage",
+    "set_bot_queue_depths",
+    "set_bot_lease_stats",
+    "render_metrics",
+]
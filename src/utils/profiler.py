@@ -0,0 +1,197 @@
+"""
+Sampling profiler for a live Brebot process.
+
+A background thread wakes at a fixed rate, snapshots every thread's stack
+with ``sys._current_frames()`` and counts identical stacks. Coroutine stacks
+of the event loop's asyncio tasks are sampled alongside, because a busy
+loop thread only shows the frame that happens to be running, not which
+task is waiting on what. Nothing is instrumented ahead of time, so the
+process runs at full speed until a profile is requested.
+
+Output is in the collapsed-stack format read by flamegraph.pl and
+speedscope (``frame;frame;frame count``), plus a top-frames table.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Leaf frames that mean "blocked waiting", left out unless include_idle is set
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+    ("socket.py", "readinto"),
+}
+
+# Only one profile at a time; sampling is cheap but not free
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another is running."""
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack_labels(frame) -> Tuple[Tuple[str, ...], Tuple[str, str]]:
+    """Root-first frame labels and the (file, function) of the leaf."""
+    labels = []
+    leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels), leaf
+
+
+def _task_stack(task: "asyncio.Task") -> Optional[Tuple[str, ...]]:
+    """Outermost-first coroutine frames of a suspended (or running) task."""
+    labels = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return tuple(labels) if labels else None
+
+
+class StackSampler:
+    """Collects stack samples of all threads (and loop tasks) for a fixed duration."""
+
+    def __init__(
+        self,
+        interval: float,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        include_idle: bool = False,
+    ):
+        self.interval = interval
+        self.loop = loop
+        self.include_idle = include_idle
+        self.samples = 0
+        self.thread_stacks: Counter = Counter()
+        self.task_stacks: Counter = Counter()
+        self.thread_samples: Counter = Counter()
+
+    def sample_once(self, own_ident: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels, leaf = _stack_labels(frame)
+            if not self.include_idle and leaf in IDLE_FRAMES:
+                continue
+            thread_name = names.get(ident, f"thread-{ident}")
+            self.thread_samples[thread_name] += 1
+            self.thread_stacks[(f"thread:{thread_name}",) + labels] += 1
+
+        if self.loop is not None:
+            try:
+                tasks = asyncio.all_tasks(self.loop)
+            except RuntimeError:
+                tasks = set()
+            for task in tasks:
+                try:
+                    stack = _task_stack(task)
+                except Exception:
+                    # Frames can disappear under us while the loop runs
+                    continue
+                if stack:
+                    self.task_stacks[(f"task:{task.get_name()}",) + stack] += 1
+
+        self.samples += 1
+
+    def run(self, seconds: float) -> None:
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        next_tick = time.perf_counter()
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_tick:
+                time.sleep(next_tick - now)
+            self.sample_once(own_ident)
+            next_tick += self.interval
+
+    def collapsed(self, include_tasks: bool = True) -> str:
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.thread_stacks.most_common()]
+        if include_tasks:
+            lines.extend(f"{';'.join(stack)} {count}" for stack, count in self.task_stacks.most_common())
+        return "\n".join(lines)
+
+    def top_frames(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """Frames ranked by self samples (leaf), with inclusive samples alongside."""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.thread_stacks.items():
+            frames = stack[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+
+        thread_samples = sum(self.thread_samples.values()) or 1
+        ranked = sorted(total_counts, key=lambda frame: (self_counts[frame], total_counts[frame]), reverse=True)
+        return [
+            {
+                "frame": frame,
+                "self": self_counts[frame],
+                "total": total_counts[frame],
+                "self_pct": round(100 * self_counts[frame] / thread_samples, 2),
+                "total_pct": round(100 * total_counts[frame] / thread_samples, 2),
+            }
+            for frame in ranked[:limit]
+        ]
+
+    def task_summary(self, limit: int = 25) -> List[Dict[str, Any]]:
+        return [
+            {"task": stack[0][len("task:"):], "stack": list(stack[1:]), "samples": count}
+            for stack, count in self.task_stacks.most_common(limit)
+        ]
+
+
+async def profile(
+    seconds: float,
+    hz: float,
+    include_idle: bool = False,
+    top: int = 25,
+) -> Dict[str, Any]:
+    """Sample the running process for ``seconds`` without blocking the event loop."""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        sampler = StackSampler(1.0 / hz, loop=asyncio.get_running_loop(), include_idle=include_idle)
+        started = time.perf_counter()
+        await asyncio.to_thread(sampler.run, seconds)
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+
+    return {
+        "seconds": round(elapsed, 3),
+        "hz": hz,
+        "samples": sampler.samples,
+        "threads": dict(sampler.thread_samples.most_common()),
+        "top_frames": sampler.top_frames(top),
+        "task_stacks": sampler.task_summary(top),
+        "collapsed": sampler.collapsed(),
+    }
+
+
+__all__ = [
+    "ProfilerBusyError",
+    "StackSampler",
+    "profile",
+]
@@ -0,0 +1,163 @@
+"""
+Shared rate limiting and retry policy for integration API calls.
+
+Each (platform, credential) pair gets one ``RateLimiter``, a token bucket
+implemented as GCRA (a "theoretical arrival time" that advances by one
+interval per request), so taking a slot is a few arithmetic operations
+under a thread lock and callers simply sleep until their slot. There is no
+asyncio primitive in the limiter, so it works across event loops and from
+any number of concurrent coroutines.
+
+The bucket adapts: a 429 halves the rate and pauses the bucket for the
+server's ``Retry-After``; each success recovers a little of the configured
+rate. Bulk jobs therefore settle near the sustainable rate instead of
+bouncing off the limit.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from config.settings import settings
+from utils import metrics
+
+# A 429 never slows a bucket below this many requests per second
+MIN_RATE = 0.2
+
+# Multiplicative rate recovery per successful request
+RECOVERY_FACTOR = 0.05
+
+
+class RateLimiter:
+    """Adaptive GCRA token bucket for one platform credential."""
+
+    def __init__(self, platform: str, rate: float, burst: int = 1):
+        self.platform = platform
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._paused_until = 0.0
+        self._pause_shift = 0.0  # total pause time added by penalize(), in seconds
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> Tuple[float, float]:
+        """Claim the next slot; returns the wait for it and the pause shift at claim time."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            tat = max(self._tat, now, self._paused_until)
+            allowed_at = tat - (self.burst - 1) * interval
+            self._tat = tat + interval
+            return max(0.0, allowed_at - now), self._pause_shift
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the time spent queueing."""
+        waited = 0.0
+        # A pause already in force is part of the slot's wait, so one claim suffices
+        delay, shift = self._reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+            # A 429 seen by another caller while we slept pushed every claimed
+            # slot back; wait the extra time rather than claiming a new slot
+            delay, shift = self._pause_shift - shift, self._pause_shift
+        metrics.RATE_LIMIT_WAIT_SECONDS.labels(platform=self.platform).observe(waited)
+        return waited
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429: halve the rate and honour Retry-After."""
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            now = time.monotonic()
+            if retry_after and now + retry_after > self._paused_until:
+                extension = now + retry_after - max(self._paused_until, now)
+                self._paused_until = now + retry_after
+                # Slots already handed out move back by the new pause, keeping their spacing
+                self._pause_shift += extension
+                self._tat = max(self._tat, now) + extension
+        metrics.RATE_LIMIT_RATE.labels(platform=self.platform).set(self.rate)
+
+    def reward(self) -> None:
+        """Recover towards the configured rate after a successful call."""
+        if self.rate >= self.configured_rate:
+            return
+        with self._lock:
+            self.rate = min(self.configured_rate, self.rate * (1 + RECOVERY_FACTOR))
+        metrics.RATE_LIMIT_RATE.labels(platform=self.platform).set(self.rate)
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parse ``"airtable=5,etsy=10"`` into requests-per-second per platform."""
+    limits: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        platform, _, value = item.partition("=")
+        try:
+            rate = float(value)
+        except ValueError:
+            continue
+        if rate > 0:
+            limits[platform.strip().lower()] = rate
+    return limits
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(platform: str, credential: Optional[str] = None) -> Optional[RateLimiter]:
+    """Limiter for ``platform`` and credential, or None if the platform is unlimited."""
+    rate = parse_rate_limits(settings.integration_rate_limits).get(platform)
+    if rate is None:
+        return None
+    # Keyed by a fingerprint so raw API keys are not kept as dict keys
+    fingerprint = hashlib.sha256((credential or "").encode()).hexdigest()[:12]
+    key = (platform, fingerprint)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(platform, rate, burst=max(1, int(rate)))
+        return limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server asked for."""
+    ceiling = min(settings.integration_backoff_max, settings.integration_backoff_base * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.integration_backoff_max))
+    return delay
+
+
+__all__ = [
+    "RateLimiter",
+    "get_rate_limiter",
+    "parse_rate_limits",
+    "parse_retry_after",
+    "backoff_delay",
+]
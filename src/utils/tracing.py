@@ -0,0 +1,324 @@
+"""
+In-process request tracing for Brebot.
+
+A trace is started per HTTP request by the web middleware and carried to
+everything the request touches (background chat tasks, MemoryService,
+ActivityLogger, integration HTTP calls) through a ``ContextVar``, so no
+ids have to be threaded through call signatures. Finished spans are kept
+in a bounded in-memory ring of recent traces that ``/api/debug/traces``
+reads; no external collector is needed.
+
+Ids follow the W3C trace-context layout (32/16 hex chars) so an incoming
+``traceparent`` header continues an upstream trace and the ids can be
+handed to bot workers through the task queue.
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Most recent traces kept in memory
+DEFAULT_MAX_TRACES = 500
+
+# Spans kept per trace; a runaway loop cannot grow one trace without bound
+MAX_SPANS_PER_TRACE = 1000
+
+
+@dataclass
+class Span:
+    """One timed operation inside a trace."""
+
+    trace_id: str
+    span_id: str
+    name: str
+    parent_id: Optional[str] = None
+    start_time: str = ""
+    duration_ms: Optional[float] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    _started: float = field(default=0.0, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("_started")
+        return data
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("brebot_current_span", default=None)
+
+
+class TraceBuffer:
+    """Ring of the most recent traces, keyed by trace id in arrival order."""
+
+    def __init__(self, max_traces: int = DEFAULT_MAX_TRACES):
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        record = span.to_dict()
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            if len(spans) < MAX_SPANS_PER_TRACE:
+                spans.append(record)
+
+    def resize(self, max_traces: int) -> None:
+        with self._lock:
+            self.max_traces = max_traces
+            while len(self._traces) > max_traces:
+                self._traces.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+    def get_trace(self, trace_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            return sorted(spans, key=lambda item: item["start_time"]) if spans is not None else None
+
+    def list_traces(
+        self,
+        limit: int = 50,
+        min_duration_ms: Optional[float] = None,
+        name: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Summaries of recent traces, newest first, with their spans attached."""
+        with self._lock:
+            snapshot = [(trace_id, list(spans)) for trace_id, spans in reversed(self._traces.items())]
+
+        summaries = []
+        for trace_id, spans in snapshot:
+            root = _root_span(spans)
+            if name and name not in root["name"]:
+                continue
+            if min_duration_ms is not None and (root["duration_ms"] or 0) < min_duration_ms:
+                continue
+            summaries.append({
+                "trace_id": trace_id,
+                "name": root["name"],
+                "start_time": root["start_time"],
+                "duration_ms": root["duration_ms"],
+                "span_count": len(spans),
+                "error_count": sum(1 for span in spans if span["status"] == "error"),
+                "spans": sorted(spans, key=lambda item: item["start_time"]),
+            })
+            if len(summaries) >= limit:
+                break
+        return summaries
+
+
+def _root_span(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The span without a local parent, or the earliest one for continued/partial traces."""
+    local_ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span["parent_id"] not in local_ids]
+    return min(roots or spans, key=lambda item: item["start_time"])
+
+
+trace_buffer = TraceBuffer()
+_enabled = True
+
+
+def configure(enabled: bool = True, max_traces: int = DEFAULT_MAX_TRACES) -> None:
+    """Apply settings; called once by the web app at import time."""
+    global _enabled
+    _enabled = enabled
+    trace_buffer.resize(max_traces)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+class _SpanScope:
+    """Context manager (sync or async) that makes a span current for its block."""
+
+    __slots__ = ("name", "attributes", "trace_id", "parent_id", "require_parent", "span", "_token")
+
+    def __init__(
+        self,
+        name: str,
+        attributes: Dict[str, Any],
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        require_parent: bool = False,
+    ):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.require_parent = require_parent
+        self.span: Optional[Span] = None
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> Optional[Span]:
+        if not _enabled:
+            return None
+        parent = _current_span.get()
+        if parent is None and self.require_parent:
+            return None
+        if self.trace_id:
+            trace_id, parent_id = self.trace_id, self.parent_id
+        elif parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = _new_id(16), None
+        self.span = Span(
+            trace_id=trace_id,
+            span_id=_new_id(8),
+            name=self.name,
+            parent_id=parent_id,
+            start_time=datetime.now(timezone.utc).isoformat(),
+            attributes=dict(self.attributes),
+            _started=time.perf_counter(),
+        )
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self.span
+        if span is None:
+            return False
+        span.duration_ms = round((time.perf_counter() - span._started) * 1000, 3)
+        if exc is not None:
+            span.record_error(exc)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from a different context (e.g. a generator finalised elsewhere)
+            _current_span.set(None)
+        trace_buffer.add(span)
+        return False
+
+    async def __aenter__(self) -> Optional[Span]:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def start_span(
+    name: str,
+    trace_id: Optional[str] = None,
+    parent_id: Optional[str] = None,
+    **attributes,
+) -> _SpanScope:
+    """
+    Open a span as a child of the current one (or a new trace).
+
+    Works with ``with`` and ``async with``; yields the ``Span`` (or None when
+    tracing is disabled). Pass ``trace_id``/``parent_id`` to continue a trace
+    started elsewhere.
+    """
+    return _SpanScope(name, attributes, trace_id, parent_id)
+
+
+def child_span(name: str, **attributes) -> _SpanScope:
+    """Like ``start_span`` but only records when a trace is already active.
+
+    Used on shared hot paths (memory, activity logging, outbound HTTP) so
+    calls made outside any request (startup, CLI, timers) do not fill the
+    buffer with one-span traces.
+    """
+    return _SpanScope(name, attributes, require_parent=True)
+
+
+def traced(name: Optional[str] = None, **attributes) -> Callable:
+    """Decorator wrapping a sync or async function call in a span."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_ids() -> Optional[Tuple[str, str]]:
+    """(trace_id, span_id) of the active span, if any."""
+    span = _current_span.get()
+    return (span.trace_id, span.span_id) if span is not None else None
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Extract (trace_id, parent_span_id) from a W3C ``traceparent`` header."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+    except ValueError:
+        return None
+    if set(trace_id) == {"0"} or set(parent_id) == {"0"}:
+        return None
+    return trace_id, parent_id
+
+
+def format_traceparent(span: Optional[Span] = None) -> Optional[str]:
+    """``traceparent`` header value for ``span`` (default: the current span)."""
+    span = span or _current_span.get()
+    if span is None:
+        return None
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+__all__ = [
+    "Span",
+    "TraceBuffer",
+    "trace_buffer",
+    "configure",
+    "is_enabled",
+    "start_span",
+    "child_span",
+    "traced",
+    "current_span",
+    "current_ids",
+    "parse_traceparent",
+    "format_traceparent",
+]
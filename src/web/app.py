@@ -3,19 +3,23 @@ Enhanced Brebot Web Interface with Three-Panel Dashboard
 Integrates ChromaDB, Airtable, and Bot Management
 """
 
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, UploadFile, File
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, UploadFile, File, Header
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
+from dataclasses import asdict
 import logging
 import asyncio
 import json
 import uuid
 import os
 import subprocess
+import time
+import secrets
+from collections import Counter
 from pathlib import Path
 import httpx
 import chromadb
@@ -23,9 +27,15 @@ from chromadb.config import Settings
 
 # Shared utilities
 from utils import brebot_logger
+from utils import metrics
+from utils import tracing
+from utils import profiler
+from utils.http_clients import close_http_clients
+from utils.circuit_breaker import circuit_snapshots
 
 # Integration management
 from services.integration_manager import get_integration_manager, initialize_all_integrations
+from services.activity_logger import get_activity_logger
 
 # Import voice service (optional)
 import sys
@@ -56,10 +66,11 @@ except Exception as exc:  # pragma: no cover - optional dependency failures
 
 from services.connection_service import connection_service
 from services.memory_service import memoryService
+from services.task_service import taskService
 from services.bot_architect_service import botArchitectService, BotDesignSpec
 from models.connections import ConnectionEvent
 from config.system_prompts import get_chat_prompt
-from config import get_chroma_client, get_redis_client, airtable_available
+from config import get_chroma_client, get_redis_client, get_async_redis_client, close_async_redis_client, airtable_available
 from services.ingestion_service import ingest_path, log_ingestion_run
 from services.workspace_service import ensure_workspace
 from config import settings
@@ -71,6 +82,43 @@ app = FastAPI(
     version="2.0.0",
 )
 
+tracing.configure(enabled=settings.tracing_enabled, max_traces=settings.trace_buffer_size)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Observe request latency per route template (not per raw path, to bound cardinality).
+
+    Also opens the root trace span for the request; background tasks scheduled
+    by the handler inherit it, and the trace id is returned as ``X-Trace-Id``.
+    """
+    started = time.perf_counter()
+    status = 500
+    upstream = tracing.parse_traceparent(request.headers.get("traceparent"))
+    trace_id, parent_id = upstream or (None, None)
+    with tracing.start_span(
+        f"{request.method} {request.url.path}",
+        trace_id=trace_id,
+        parent_id=parent_id,
+        method=request.method,
+        path=request.url.path,
+    ) as span:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            if span is not None:
+                response.headers["X-Trace-Id"] = span.trace_id
+            return response
+        finally:
+            route_path = getattr(request.scope.get("route"), "path", "unmatched")
+            if span is not None:
+                span.name = f"{request.method} {route_path}"
+                span.set_attributes(route=route_path, status=status)
+            metrics.HTTP_REQUEST_SECONDS.labels(
+                method=request.method,
+                route=route_path,
+                status=str(status),
+            ).observe(time.perf_counter() - started)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
 
@@ -110,6 +158,11 @@ file_explorer_cache: Dict[str, Any] = {}
 ingestion_runs: List[Dict[str, Any]] = []  # legacy in-memory fallback
 
 INGESTION_REDIS_KEY = "brebot:ingestion:runs"
+BOT_TASK_QUEUE = "bot_tasks"  # per-type sorted sets "bot_tasks:<type>" (shared/bot-interface MessageQueue)
+BOT_TASK_TYPES = "bot_task_types"  # set of bot types that have a queue
+BOT_INFLIGHT = "bot_inflight"  # hash task_id -> leased payload
+BOT_LEASE_EXPIRATIONS = "bot_lease_expirations"  # hash bot_type -> count
+BOT_DEAD_LETTER_QUEUE = "bot_dead_letter"
 MAX_INGESTION_RUNS = 100
 
 VOICE_SERVICE_AVAILABLE = voice_service is not None
@@ -138,13 +191,15 @@ def get_redis_connection():
     return redis_client
 
 
-def persist_ingestion_run(entry: Dict[str, Any]) -> None:
+async def persist_ingestion_run(entry: Dict[str, Any]) -> None:
     """Persist a run record to Redis or fall back to in-memory storage."""
-    client = get_redis_connection()
+    client = get_async_redis_client()
     if client is not None:
         try:
-            client.lpush(INGESTION_REDIS_KEY, json.dumps(entry))
-            client.ltrim(INGESTION_REDIS_KEY, 0, MAX_INGESTION_RUNS - 1)
+            async with client.pipeline() as pipe:
+                pipe.lpush(INGESTION_REDIS_KEY, json.dumps(entry))
+                pipe.ltrim(INGESTION_REDIS_KEY, 0, MAX_INGESTION_RUNS - 1)
+                await pipe.execute()
             return
         except Exception as exc:  # pragma: no cover - redis failure
             brebot_logger.log_error(exc, "web.persist_ingestion_run")
@@ -153,12 +208,12 @@ def persist_ingestion_run(entry: Dict[str, Any]) -> None:
     del ingestion_runs[MAX_INGESTION_RUNS:]
 
 
-def load_recent_ingestion_runs(limit: int = 25) -> List[Dict[str, Any]]:
+async def load_recent_ingestion_runs(limit: int = 25) -> List[Dict[str, Any]]:
     """Retrieve recent ingestion runs from Redis or fallback storage."""
-    client = get_redis_connection()
+    client = get_async_redis_client()
     if client is not None:
         try:
-            raw_runs = client.lrange(INGESTION_REDIS_KEY, 0, limit - 1)
+            raw_runs = await client.lrange(INGESTION_REDIS_KEY, 0, limit - 1)
             runs: List[Dict[str, Any]] = []
             for raw in raw_runs:
                 try:
@@ -192,21 +247,26 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        metrics.WEBSOCKET_CLIENTS.set(len(self.active_connections))
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        metrics.WEBSOCKET_CLIENTS.set(len(self.active_connections))
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove dead connections
-                self.active_connections.remove(connection)
+        with metrics.observe_seconds(metrics.WEBSOCKET_BROADCAST_SECONDS), tracing.child_span(
+            "websocket.broadcast", clients=len(self.active_connections)
+        ):
+            for connection in list(self.active_connections):
+                try:
+                    await connection.send_text(message)
+                except:
+                    # Remove dead connections
+                    self.disconnect(connection)
 
 manager = ConnectionManager()
 
@@ -224,7 +284,7 @@ async def broadcast_task_update(task_id: str, task: TaskStatus) -> None:
 
 
 async def broadcast_ingestion_runs() -> None:
-    runs = load_recent_ingestion_runs()
+    runs = await load_recent_ingestion_runs()
     await manager.broadcast(json.dumps({"type": "ingestion_runs", "runs": runs}))
 
 # Pydantic Models
@@ -324,6 +384,20 @@ async def initialize_services():
 @app.on_event("startup")
 async def startup_event():
     await initialize_services()
+    # Dashboard reads of integration health are served from this cache
+    get_integration_manager().start_health_refresher()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await get_integration_manager().stop_health_refresher()
+    activity_logger = get_activity_logger()
+    if activity_logger:
+        # Persist counts of sampled-out activities still held in memory
+        activity_logger.flush_suppressed()
+    # Final Airtable flush of queued task changes, then stop the sync worker
+    await taskService.close()
+    await close_http_clients()
+    await close_async_redis_client()
 
 # Routes
 @app.get("/", response_class=HTMLResponse)
@@ -371,6 +445,120 @@ async def health_check():
         "voice_error": VOICE_SERVICE_ERROR,
     }
 
+def collect_bot_queue_depths() -> Dict[str, int]:
+    """Count queued bot tasks per bot type from the per-type task queues."""
+    client = get_redis_connection()
+    if client is None:
+        return {}
+    try:
+        bot_types = sorted(client.smembers(BOT_TASK_TYPES))
+        pipe = client.pipeline(transaction=False)
+        for bot_type in bot_types:
+            pipe.zcard(f"{BOT_TASK_QUEUE}:{bot_type}")
+        return dict(zip(bot_types, pipe.execute()))
+    except Exception as exc:  # pragma: no cover - redis failure
+        brebot_logger.log_error(exc, "web.collect_bot_queue_depths")
+        return {}
+
+def collect_bot_lease_stats() -> Tuple[Dict[str, int], Dict[str, int], int]:
+    """In-flight tasks per bot type, lease expirations per bot type and dead-letter depth."""
+    client = get_redis_connection()
+    if client is None:
+        return {}, {}, 0
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hvals(BOT_INFLIGHT)
+        pipe.hgetall(BOT_LEASE_EXPIRATIONS)
+        pipe.llen(BOT_DEAD_LETTER_QUEUE)
+        leased, expirations, dead_letter = pipe.execute()
+    except Exception as exc:  # pragma: no cover - redis failure
+        brebot_logger.log_error(exc, "web.collect_bot_lease_stats")
+        return {}, {}, 0
+
+    in_flight: Counter = Counter()
+    for raw in leased:
+        try:
+            in_flight[json.loads(json.loads(raw)["task"]).get("bot_type", "unknown")] += 1
+        except (TypeError, ValueError, KeyError, AttributeError):
+            in_flight["unknown"] += 1
+    return dict(in_flight), {bot_type: int(count) for bot_type, count in expirations.items()}, dead_letter
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus exposition endpoint."""
+    metrics.set_bot_queue_depths(await asyncio.to_thread(collect_bot_queue_depths))
+    metrics.set_bot_lease_stats(*await asyncio.to_thread(collect_bot_lease_stats))
+    payload, content_type = metrics.render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+def require_debug_admin(token: Optional[str]) -> None:
+    """Reject debug requests unless DEBUG_ADMIN_TOKEN is configured and matches."""
+    if not settings.debug_admin_token:
+        raise HTTPException(status_code=403, detail="Debug endpoints are disabled (set DEBUG_ADMIN_TOKEN)")
+    if not token or not secrets.compare_digest(token, settings.debug_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.get("/api/debug/traces")
+async def get_recent_traces(
+    limit: int = 50,
+    min_duration_ms: Optional[float] = None,
+    name: Optional[str] = None,
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """Recent request traces from the in-process ring buffer, newest first."""
+    require_debug_admin(x_admin_token)
+    traces = tracing.trace_buffer.list_traces(
+        limit=max(1, min(limit, 500)),
+        min_duration_ms=min_duration_ms,
+        name=name,
+    )
+    return {
+        "enabled": tracing.is_enabled(),
+        "buffer_size": tracing.trace_buffer.max_traces,
+        "traces": traces,
+    }
+
+@app.get("/api/debug/traces/{trace_id}")
+async def get_trace(trace_id: str, x_admin_token: Optional[str] = Header(default=None)):
+    """All recorded spans of one trace (ids are returned in the X-Trace-Id header)."""
+    require_debug_admin(x_admin_token)
+    spans = tracing.trace_buffer.get_trace(trace_id)
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return {"trace_id": trace_id, "spans": spans}
+
+@app.get("/api/debug/profile")
+async def profile_process(
+    seconds: float = 5.0,
+    hz: Optional[int] = None,
+    include_idle: bool = False,
+    top: int = 25,
+    format: str = "json",
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """Sample all thread and asyncio task stacks of this process for ``seconds``.
+
+    ``format=collapsed`` returns plain collapsed stacks for flamegraph.pl/speedscope.
+    """
+    require_debug_admin(x_admin_token)
+    seconds = max(0.1, min(seconds, settings.profiler_max_seconds))
+    hz = max(1, min(hz or settings.profiler_default_hz, 1000))
+    try:
+        result = await profiler.profile(seconds, hz, include_idle=include_idle, top=max(1, top))
+        brebot_logger.log_agent_action(
+            "WebApp",
+            "profile_captured",
+            {"seconds": result["seconds"], "hz": hz, "samples": result["samples"]},
+        )
+        if format == "collapsed":
+            return PlainTextResponse(result["collapsed"])
+        return result
+    except profiler.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        brebot_logger.log_error(e, context="web.profile_process")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/bots")
 async def get_bots():
     """Get all bot statuses"""
@@ -607,9 +795,9 @@ async def system_power_up():
         response["chroma"] = {"status": "error", "message": str(exc)}
 
     try:
-        redis_client = get_redis_client()
+        redis_client = get_async_redis_client()
         if redis_client:
-            redis_client.ping()
+            await redis_client.ping()
             response["redis"] = {"status": "ready"}
         else:
             response["redis"] = {"status": "unknown", "message": "Redis client not configured"}
@@ -658,7 +846,7 @@ async def run_ingestion(request: IngestionRequest):
 @app.get("/api/ingest/runs")
 async def get_ingestion_runs():
     """Return recent ingestion runs."""
-    return {"runs": load_recent_ingestion_runs()}
+    return {"runs": await load_recent_ingestion_runs()}
 
 @app.post("/api/chat")
 async def chat_with_brebot(message: ChatMessage, background_tasks: BackgroundTasks):
@@ -1029,7 +1217,7 @@ async def execute_ingestion_job(job_id: str, request: IngestionRequest) -> None:
             "chunks": result.get("chunks"),
             "dry_run": result.get("dry_run"),
         }
-        persist_ingestion_run(entry)
+        await persist_ingestion_run(entry)
 
         task.progress = 100
         task.status = "completed" if result.get("status") == "success" else "not_found"
@@ -1044,7 +1232,7 @@ async def execute_ingestion_job(job_id: str, request: IngestionRequest) -> None:
         task.message = f"Error: {exc}"
         task.completed_at = datetime.now()
         task.result = {"error": str(exc)}
-        persist_ingestion_run(
+        await persist_ingestion_run(
             {
                 "run_id": run_id,
                 "timestamp": datetime.utcnow().isoformat(),
@@ -1109,8 +1297,12 @@ def parse_chat_context(context: Optional[str]) -> tuple[Optional[str], Optional[
     return domain, project, unique_tags
 
 # Background task processors
+@tracing.traced("chat.process")
 async def process_chat_task(task_id: str, message: ChatMessage):
     """Process chat with RAG"""
+    span = tracing.current_span()
+    if span is not None:
+        span.set_attributes(task_id=task_id, use_rag=message.use_rag)
     task = TaskStatus(
         task_id=task_id,
         status="running",
@@ -1168,27 +1360,42 @@ async def process_chat_task(task_id: str, message: ChatMessage):
             full_prompt = f"{system_prompt}\n\nUser message: {message.message}{context_text}"
             
             # Call Ollama API
-            async with httpx.AsyncClient() as client:
-                ollama_response = await client.post(
-                    f"{settings.ollama_base_url}/api/generate",
-                    json={
-                        "model": settings.ollama_model,
-                        "prompt": full_prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.9,
-                            "max_tokens": 1000
-                        }
-                    },
-                    timeout=60.0
-                )
-                
-                if ollama_response.status_code == 200:
-                    ollama_data = ollama_response.json()
-                    response_text = ollama_data.get("response", "I'm having trouble generating a response right now.")
-                else:
-                    response_text = "I'm having trouble connecting to my AI brain right now. Let me try again!"
+            ollama_started = time.perf_counter()
+            ollama_outcome = "error"
+            ollama_span = tracing.child_span("ollama.generate", model=settings.ollama_model)
+            try:
+                async with ollama_span, httpx.AsyncClient() as client:
+                    ollama_response = await client.post(
+                        f"{settings.ollama_base_url}/api/generate",
+                        json={
+                            "model": settings.ollama_model,
+                            "prompt": full_prompt,
+                            "stream": False,
+                            "options": {
+                                "temperature": 0.7,
+                                "top_p": 0.9,
+                                "max_tokens": 1000
+                            }
+                        },
+                        timeout=60.0
+                    )
+                    
+                    if ollama_response.status_code == 200:
+                        ollama_outcome = "ok"
+                        ollama_data = ollama_response.json()
+                        metrics.record_ollama_usage(settings.ollama_model, ollama_data)
+                        response_text = ollama_data.get("response", "I'm having trouble generating a response right now.")
+                    else:
+                        ollama_outcome = str(ollama_response.status_code)
+                        response_text = "I'm having trouble connecting to my AI brain right now. Let me try again!"
+            finally:
+                if ollama_span.span is not None:
+                    ollama_span.span.set_attribute("outcome", ollama_outcome)
+                metrics.OLLAMA_REQUEST_SECONDS.labels(
+                    model=settings.ollama_model,
+                    endpoint="generate",
+                    outcome=ollama_outcome,
+                ).observe(time.perf_counter() - ollama_started)
                     
         except Exception as e:
             brebot_logger.log_error(e, "web.process_chat_task.ollama")
@@ -1392,6 +1599,7 @@ async def get_integrations():
         return {
             "integrations": summary["platforms"],
             "health_details": summary["health_details"],
+            "circuits": summary["circuits"],
             "summary": {
                 "total": summary["total_integrations"],
                 "enabled": summary["enabled_integrations"],
@@ -1467,14 +1675,15 @@ async def check_integration_health(platform: str):
     """Check health of a specific platform integration."""
     try:
         manager = get_integration_manager()
-        health_results = await manager.health_check_all()
+        health_results = await manager.get_health()
         
         if platform not in health_results:
             raise HTTPException(status_code=404, detail=f"Platform {platform} not found")
         
         return {
             "platform": platform,
-            "health": health_results[platform]
+            "health": health_results[platform],
+            "circuit": circuit_snapshots().get(platform)
         }
         
     except HTTPException:
@@ -1533,6 +1742,77 @@ async def export_integration_activity(
         brebot_logger.log_error(e, context="web.export_integration_activity")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/integrations/activity/search")
+async def search_integration_activity(
+    q: str,
+    platform: Optional[str] = None,
+    agent_name: Optional[str] = None,
+    activity_type: Optional[str] = None,
+    success: Optional[bool] = None,
+    hours: Optional[int] = None,
+    limit: int = 50
+):
+    """Full-text search over integration activity logs, newest partition first, best matches first within it."""
+    try:
+        activity_logger = get_activity_logger()
+        if not activity_logger:
+            raise HTTPException(status_code=503, detail="Activity logger not initialized")
+        
+        filters = {
+            "platform": platform,
+            "agent_name": agent_name,
+            "activity_type": activity_type,
+            "success": success,
+            "start_time": datetime.now(timezone.utc) - timedelta(hours=hours) if hours else None
+        }
+        hits = await activity_logger.search_activities(q, filters=filters, limit=min(limit, 500))
+        
+        return {
+            "query": q,
+            "results": [
+                {"score": hit.score, "snippet": hit.snippet, "activity": asdict(hit.record)}
+                for hit in hits
+            ],
+            "count": len(hits),
+            "generated_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        brebot_logger.log_error(e, context="web.search_integration_activity")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/integrations/activity/latency")
+async def get_integration_latency(
+    platform: Optional[str] = None,
+    operation: Optional[str] = None,
+    hours: int = 24
+):
+    """Latency percentiles, error counts and bytes per platform operation."""
+    try:
+        activity_logger = get_activity_logger()
+        if not activity_logger:
+            raise HTTPException(status_code=503, detail="Activity logger not initialized")
+        
+        stats = await activity_logger.get_latency_stats(
+            platform=platform,
+            operation=operation,
+            start_time=datetime.now(timezone.utc) - timedelta(hours=hours)
+        )
+        
+        return {
+            "operations": list(stats.values()),
+            "hours": hours,
+            "generated_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        brebot_logger.log_error(e, context="web.get_integration_latency")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/integrations/initialize")
 async def initialize_integrations():
     """Initialize all platform integrations."""